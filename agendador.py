@@ -0,0 +1,247 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+CHAVE_SESSAO = "agendador"
+
+
+class TokenCancelamento:
+    """
+    Token compartilhado por um grupo de tarefas.
+
+    Cancelar o token cancela, de uma vez, todas as tarefas agendadas com ele,
+    sem depender de flags verificadas "a tempo" por quem está rodando.
+    """
+
+    __slots__ = ("cancelado",)
+
+    def __init__(self):
+        self.cancelado = False
+
+    def cancelar(self):
+        self.cancelado = True
+
+
+class Tarefa:
+    """Tarefa registrada no agendador (única ou repetida)."""
+
+    __slots__ = ("prazo", "intervalo", "callback", "args", "token", "_cancelada")
+
+    def __init__(self, prazo, intervalo, callback, args, token=None):
+        self.prazo = prazo
+        self.intervalo = intervalo
+        self.callback = callback
+        self.args = args
+        self.token = token
+        self._cancelada = False
+
+    @property
+    def cancelada(self):
+        return self._cancelada or (self.token is not None and self.token.cancelado)
+
+    def cancelar(self):
+        self._cancelada = True
+
+
+class Agendador:
+    """
+    Laço de agendamento único e de vida longa.
+
+    Substitui as cadeias de threading.Timer: todas as tarefas (ticks de
+    progresso, relógio e reinícios atrasados) são executadas por uma mesma
+    thread, que dorme até o próximo prazo da fila.
+    """
+
+    def __init__(self, relogio=time.monotonic):
+        self.relogio = relogio
+        self._fila = []
+        self._sequencia = itertools.count()
+        self._condicao = threading.Condition()
+        self._thread = None
+        self._ativo = False
+        self._descartado = False
+
+        # Instrumentação
+        self.threads_criadas = 0
+        self.tarefas_executadas = 0
+
+    def iniciar(self):
+        """Inicia a thread do agendador (se ainda não estiver rodando)."""
+        with self._condicao:
+            if self._descartado:
+                raise RuntimeError("Agendador já descartado")
+            if self._ativo:
+                return
+            self._ativo = True
+            self._thread = threading.Thread(target=self._executar, name="agendador", daemon=True)
+            self.threads_criadas += 1
+        self._thread.start()
+
+    def parar(self):
+        """Para a thread do agendador, mantendo as tarefas pendentes."""
+        with self._condicao:
+            self._ativo = False
+            self._condicao.notify()
+            thread = self._thread
+            self._thread = None
+        if thread and thread is not threading.current_thread():
+            thread.join()
+
+    def descartar(self):
+        """Para o agendador e descarta todas as tarefas pendentes."""
+        self.parar()
+        with self._condicao:
+            for _, _, tarefa in self._fila:
+                tarefa.cancelar()
+            self._fila.clear()
+            self._descartado = True
+
+    def agendar(self, atraso, callback, *args, token=None):
+        """Executa callback uma vez após 'atraso' segundos."""
+        return self._inserir(Tarefa(self.relogio() + atraso, None, callback, args, token))
+
+    def agendar_repetido(self, intervalo, callback, *args, atraso=0, token=None):
+        """
+        Executa callback a cada 'intervalo' segundos.
+
+        Os prazos são calculados a partir do prazo anterior, e não do fim da
+        execução, para que o intervalo não acumule atraso. Se o callback
+        retornar um número, ele é usado como espera (em segundos) até a
+        próxima execução, permitindo agendar pelo próximo prazo relevante.
+        """
+        return self._inserir(Tarefa(self.relogio() + atraso, intervalo, callback, args, token))
+
+    def _inserir(self, tarefa):
+        with self._condicao:
+            heapq.heappush(self._fila, (tarefa.prazo, next(self._sequencia), tarefa))
+            self._condicao.notify()
+        return tarefa
+
+    def _executar(self):
+        while True:
+            with self._condicao:
+                tarefa = None
+                while self._ativo:
+                    while self._fila and self._fila[0][2].cancelada:
+                        heapq.heappop(self._fila)
+                    if not self._fila:
+                        self._condicao.wait()
+                        continue
+                    espera = self._fila[0][0] - self.relogio()
+                    if espera > 0:
+                        self._condicao.wait(espera)
+                        continue
+                    _, _, tarefa = heapq.heappop(self._fila)
+                    break
+                if tarefa is None:
+                    return
+
+            self._rodar(tarefa)
+
+    def executar_vencidas(self):
+        """
+        Executa na thread atual as tarefas cujo prazo já chegou e retorna
+        quantas rodaram.
+
+        Serve para simulações com o agendador parado e um RelogioVirtual:
+        avança-se o relógio e chama-se executar_vencidas(), sem dormir.
+        """
+        executadas = 0
+        while True:
+            with self._condicao:
+                while self._fila and self._fila[0][2].cancelada:
+                    heapq.heappop(self._fila)
+                if not self._fila or self._fila[0][0] > self.relogio():
+                    return executadas
+                _, _, tarefa = heapq.heappop(self._fila)
+            self._rodar(tarefa)
+            executadas += 1
+
+    def _rodar(self, tarefa):
+        # O token pode ter sido cancelado entre a retirada da fila e a execução
+        if tarefa.cancelada:
+            return
+
+        espera = None
+        try:
+            espera = tarefa.callback(*tarefa.args)
+        except Exception:
+            logging.exception("Erro em tarefa agendada")
+        self.tarefas_executadas += 1
+
+        if tarefa.intervalo is not None and not tarefa.cancelada:
+            if espera is not None:
+                tarefa.prazo = self.relogio() + espera
+            else:
+                tarefa.prazo = max(tarefa.prazo + tarefa.intervalo, self.relogio())
+            self._inserir(tarefa)
+
+
+def agendador_da_pagina(page):
+    """Retorna o agendador da página, criando-o e iniciando-o na primeira chamada."""
+    agendador = page.session.get(CHAVE_SESSAO)
+    if agendador is None:
+        agendador = Agendador()
+        agendador.iniciar()
+        page.session.set(CHAVE_SESSAO, agendador)
+    return agendador
+
+
+def descartar_agendador(page):
+    """Descarta o agendador da página (ao encerrar a sessão)."""
+    agendador = page.session.get(CHAVE_SESSAO)
+    if agendador is not None:
+        agendador.descartar()
+        page.session.remove(CHAVE_SESSAO)
+
+
+if __name__ == "__main__":
+    # Threads criadas e CPU por minuto de contagem: cadeia de threading.Timer x Agendador.
+    # Mesma carga da versão antiga (progresso a cada 50 ms e relógio a cada 1 s),
+    # medida por alguns segundos e extrapolada para um minuto. O Agendador cria
+    # uma única thread por página, qualquer que seja a duração da contagem.
+    DURACAO = 3.0
+
+    def medir(rotulo, rodar):
+        threads_antes = threading.active_count()
+        cpu = time.process_time()
+        criadas, ticks = rodar()
+        cpu = time.process_time() - cpu
+        por_minuto = 60 / DURACAO
+        print(f"{rotulo:>15}: {criadas} threads criadas em {DURACAO:.0f} s  "
+              f"{1000 * cpu * por_minuto:7.1f} ms de CPU/min  ({ticks} ticks, "
+              f"{threading.active_count() - threads_antes} threads vivas ao fim)")
+
+    def cadeia_timer():
+        contagem = {"criadas": 0, "ticks": 0}
+        parar = threading.Event()
+
+        def repetir(intervalo):
+            def tick():
+                if parar.is_set():
+                    return
+                contagem["ticks"] += 1
+                contagem["criadas"] += 1
+                threading.Timer(intervalo, tick).start()
+            tick()
+
+        repetir(0.05)
+        repetir(1.0)
+        time.sleep(DURACAO)
+        parar.set()
+        time.sleep(1.1)  # deixa o último Timer de cada cadeia terminar
+        return contagem["criadas"], contagem["ticks"]
+
+    def agendador_unico():
+        agendador = Agendador()
+        agendador.iniciar()
+        agendador.agendar_repetido(0.05, lambda: None)
+        agendador.agendar_repetido(1.0, lambda: None)
+        time.sleep(DURACAO)
+        agendador.descartar()
+        return agendador.threads_criadas, agendador.tarefas_executadas
+
+    medir("threading.Timer", cadeia_timer)
+    medir("Agendador", agendador_unico)
@@ -1,11 +1,15 @@
 import flet as ft
-from datetime import datetime
 import locale
 import pygame
 import json
 import os
 import logging
 import asyncio
+import sys
+
+# O relógio de parede compartilhado fica na raiz do projeto
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data_hora import publicador_data_hora
 
 # Paleta de cores extraída da logo
 logo_primary_color = "#1A532D"  # Verde das folhas
@@ -49,6 +53,7 @@ class CronometroApp:
         self.icon_buttons = {}
         self.running = False
         self.current_time = 0
+        self.inscrito_data_hora = None
 
         # Definir cores da logo como atributos da instância
         self.logo_secondary_color = logo_secondary_color
@@ -126,6 +131,7 @@ class CronometroApp:
         self.logo = ft.Image(src=self.logo_path)
         self.title_label = ft.Text(value="Nome do Software", size=24, color=self.fg_color)
         self.date_time_label = ft.Text(value="", size=16, color=self.fg_color)
+        self.update_date_time()
 
         self.username_label = ft.Text(value="Usuário:", size=16, color=self.fg_color)
         self.username_entry = ft.TextField(width=300, border_color=self.fg_color, color=self.logo_secondary_color, text_style=ft.TextStyle(color=self.logo_secondary_color))
@@ -177,6 +183,7 @@ class CronometroApp:
 
         self.logo = ft.Image(src=self.logo_path)
         self.date_time_label = ft.Text(value="", size=16, color=self.fg_color)
+        self.update_date_time()
 
         buttons = [
             ("Tribuna", self.start_tribune_timer),
@@ -219,12 +226,13 @@ class CronometroApp:
         self.save_session(logged_in=False)
         self.setup_login_screen()
 
-    async def update_date_time(self):
-        while True:
-            current_time = datetime.now().strftime("%d de %B de %Y, %H:%M:%S")
-            self.date_time_label.value = current_time
-            self.page.update()
-            await asyncio.sleep(1)
+    def update_date_time(self):
+        # Cada tela cria o seu rótulo; só o atual fica inscrito no relógio da página
+        relogio = publicador_data_hora(self.page)
+        if self.inscrito_data_hora is not None:
+            relogio.cancelar_inscricao(self.inscrito_data_hora)
+        relogio.inscrever(self.date_time_label)
+        self.inscrito_data_hora = self.date_time_label
 
     def on_page_resize(self, event):
         self.page.update()
@@ -344,6 +352,7 @@ class CronometroApp:
         self.logo_label = ft.Image(src=self.logo_path)
         self.session_label = ft.Text(value="Sessão Plenária", size=48, color=self.fg_color)
         self.date_time_label = ft.Text(value="", size=24, color=self.fg_color)
+        self.update_date_time()
         self.back_button = ft.ElevatedButton(text="Voltar", on_click=self.setup_main_menu, bgcolor=self.button_color, color=self.logo_background_color)
 
         self.page.add(
@@ -471,7 +480,6 @@ class CronometroApp:
         self.setup_main_menu()
 
 def main(page: ft.Page):
-    asyncio.run(CronometroApp(page).update_date_time())
     CronometroApp(page)
 
 ft.app(target=main)
@@ -1,14 +1,145 @@
+import logging
+from collections import deque
+
 import flet as ft
 
+from agendador import agendador_da_pagina
+from config import RUTA_START_SOUND, RUTA_ALERT_SOUND, RUTA_END_SOUND, SAIDA_AUDIO
+
+CHAVE_SESSAO = "sinais_sonoros"
+
+# Sinais disponíveis -> arquivo WAV (configurados em config.ini)
+SONS = {
+    "inicio": RUTA_START_SOUND,
+    "alerta": RUTA_ALERT_SOUND,
+    "fim": RUTA_END_SOUND,
+}
+
+
+class PlayersFlet:
+    """
+    Saída pelos players do cliente Flet.
+
+    Cada sinal tem um único ft.Audio, criado e colocado no overlay uma vez
+    por página: o cliente baixa e decodifica o WAV antes do primeiro uso, e
+    as telas reaproveitam os mesmos players em vez de criar novos.
+    """
+
+    def __init__(self, page, sons=SONS):
+        self.players = {nome: ft.Audio(src=caminho, autoplay=False) for nome, caminho in sons.items()}
+        page.overlay.extend(self.players.values())
+        page.update()
+
+    def tocar(self, nome):
+        self.players[nome].play()
+
+    def preparar(self, nome):
+        self.players[nome].seek(0)
+
+
+def criar_saida(page, sons=SONS, tipo=SAIDA_AUDIO):
+    """
+    Cria a saída dos sinais conforme SAIDA_AUDIO.
+
+    "local" e "nula" usam o mixer do processo (mixer_local.py); se ele não
+    puder ser criado (ex.: sem pygame), os players do Flet são usados.
+    """
+    if tipo in ("local", "nula"):
+        try:
+            from mixer_local import mixer_do_processo
+            return mixer_do_processo(sons, nula=(tipo == "nula"))
+        except Exception:
+            logging.exception("Mixer local indisponível; usando o áudio do Flet")
+    return PlayersFlet(page, sons)
+
+
+class SinaisSonoros:
+    """
+    Sinais sonoros (início, alerta e fim) da página.
+
+    A saída pode ser o cliente Flet (PlayersFlet) ou o mixer local do
+    processo; as duas têm tocar(nome) e preparar(nome).
+
+    Sinais com hora marcada (como o fim da contagem) são agendados no
+    agendador da página pelo prazo, e não disparados pelo tick que percebe
+    o zero. Pouco antes do prazo o player é rebobinado (seek(0)), para que
+    o play no prazo comece do início sem esperar.
+
+    Cada disparo agendado fica registrado em 'disparos' como
+    (sinal, prazo, instante do disparo), no relógio do agendador.
+    """
+
+    # Quanto antes do prazo o player é preparado
+    ANTECEDENCIA = 0.25
+    # Atraso máximo aceitável entre o prazo e o disparo
+    ORCAMENTO_ATRASO = 0.02
+
+    def __init__(self, page, agendador, saida):
+        self.page = page
+        self.agendador = agendador
+        self.saida = saida
+
+        # Instrumentação
+        self.disparos = deque(maxlen=100)
+        self.disparos_atrasados = 0
+
+    def tocar(self, nome):
+        """Toca o sinal imediatamente."""
+        self.saida.tocar(nome)
+
+    def preparar(self, nome):
+        """Rebobina o player do sinal, deixando-o pronto para tocar do início."""
+        self.saida.preparar(nome)
+
+    def agendar(self, nome, prazo, token=None):
+        """
+        Agenda o sinal para o instante 'prazo' (no relógio do agendador).
+
+        Com um token, cancelar a contagem cancela também o sinal.
+        """
+        agora = self.agendador.relogio()
+        self.agendador.agendar(max(prazo - self.ANTECEDENCIA - agora, 0), self.preparar, nome, token=token)
+        return self.agendador.agendar(max(prazo - agora, 0), self._disparar, nome, prazo, token=token)
+
+    def _disparar(self, nome, prazo):
+        self.tocar(nome)
+        instante = self.agendador.relogio()
+        self.disparos.append((nome, prazo, instante))
+        if instante - prazo > self.ORCAMENTO_ATRASO:
+            self.disparos_atrasados += 1
+            logging.warning("Sinal '%s' disparado %.1f ms após o prazo", nome, 1000 * (instante - prazo))
+
+    def atrasos(self, nome=None):
+        """Atrasos (s) dos últimos disparos agendados, opcionalmente de um só sinal."""
+        return [instante - prazo for sinal, prazo, instante in self.disparos if nome in (None, sinal)]
+
+
+def sinais_da_pagina(page):
+    """Retorna os sinais sonoros da página, criando (e pré-carregando) na primeira chamada."""
+    sinais = page.session.get(CHAVE_SESSAO)
+    if sinais is None:
+        sinais = SinaisSonoros(page, agendador_da_pagina(page), criar_saida(page))
+        page.session.set(CHAVE_SESSAO, sinais)
+    return sinais
+
+
 def main(page: ft.Page):
-    def tocar_som():
+    """Demonstração: toca os sinais pelos mesmos players pré-carregados."""
+    sinais = sinais_da_pagina(page)
+
+    def tocar_som(nome):
         try:
-            audio = ft.Audio(src="assets/start_sound.wav", autoplay=True)
-            page.overlay.append(audio)
-            page.update()
+            sinais.tocar(nome)
         except Exception as e:
             print(f"Erro ao reproduzir áudio: {e}")
 
-    page.add(ft.ElevatedButton("Tocar Som", on_click=lambda _: tocar_som()))
+    page.add(
+        ft.Row([
+            ft.ElevatedButton(f"Tocar {nome}", on_click=lambda _, n=nome: tocar_som(n))
+            for nome in SONS
+        ])
+    )
+
 
-ft.app(target=main)
+if __name__ == "__main__":
+    ft.app(target=main)
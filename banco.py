@@ -0,0 +1,242 @@
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from config import DATABASE_PATH
+
+_banco = None
+_trava_banco = threading.Lock()
+
+
+class Banco:
+    """
+    Acesso ao SQLite compartilhado por todas as telas e threads.
+
+    Mantém uma única conexão aberta durante a vida do app, em vez de um
+    connect/close por consulta. Os handlers do Flet rodam em threads
+    diferentes, por isso a conexão é criada com check_same_thread=False e
+    todo acesso passa por uma trava. O sqlite3 guarda as instruções já
+    preparadas por conexão (cached_statements): como a conexão é sempre a
+    mesma, cada SQL é compilado uma única vez.
+
+    Fora de uma transação, cada executar() é gravado imediatamente
+    (autocommit); dentro de 'with banco.transacao():' as instruções são
+    confirmadas juntas no fim do bloco ou desfeitas se ocorrer um erro.
+
+    Quem mantém dados em memória (como a lista de usuários) pode observar
+    uma tabela e ser avisado de cada linha alterada (ver observar).
+    """
+
+    def __init__(self, caminho=DATABASE_PATH, instrucoes_em_cache=128):
+        self.caminho = caminho
+        # isolation_level=None: o controle de transações é todo explícito (ver transacao)
+        self.conexao = sqlite3.connect(
+            caminho,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=instrucoes_em_cache,
+        )
+        self._trava = threading.RLock()
+        self._profundidade = 0
+        self._observadores = {}  # tabela -> [callback(operacao, rowid)]
+        self._alteracoes = []  # (tabela, operacao, rowid) ainda não confirmadas
+        self.conexao.create_function("anotar_alteracao", 3, self._anotar)
+
+        # Instrumentação
+        self.consultas = 0
+        self.transacoes = 0
+
+    def consultar(self, sql, parametros=()):
+        """Executa um SELECT e retorna todas as linhas."""
+        with self._trava:
+            self.consultas += 1
+            return self.conexao.execute(sql, parametros).fetchall()
+
+    def consultar_um(self, sql, parametros=()):
+        """Executa um SELECT e retorna a primeira linha (ou None)."""
+        with self._trava:
+            self.consultas += 1
+            return self.conexao.execute(sql, parametros).fetchone()
+
+    def executar(self, sql, parametros=()):
+        """
+        Executa um INSERT/UPDATE/DELETE e retorna o cursor (lastrowid, rowcount).
+        """
+        with self._trava:
+            self.consultas += 1
+            cursor = self.conexao.execute(sql, parametros)
+            alteracoes = self._confirmadas() if self._profundidade == 0 else []
+        self._notificar(alteracoes)
+        return cursor
+
+    @contextmanager
+    def transacao(self):
+        """
+        Agrupa instruções numa transação; transações aninhadas fazem parte
+        da mais externa. Enquanto ela estiver aberta, as outras threads
+        esperam a vez.
+        """
+        alteracoes = []
+        with self._trava:
+            externa = self._profundidade == 0
+            if externa:
+                self.conexao.execute("BEGIN")
+            self._profundidade += 1
+            try:
+                yield self
+            except BaseException:
+                self._profundidade -= 1
+                if externa:
+                    self.conexao.execute("ROLLBACK")
+                    self._alteracoes.clear()
+                raise
+            self._profundidade -= 1
+            if externa:
+                self.conexao.execute("COMMIT")
+                self.transacoes += 1
+                alteracoes = self._confirmadas()
+        self._notificar(alteracoes)
+
+    def observar(self, tabela, callback):
+        """
+        Chama callback(operacao, rowid) para cada linha de 'tabela' inserida
+        ("INSERT"), alterada ("UPDATE") ou excluída ("DELETE") por esta
+        conexão, logo depois de a alteração ser confirmada; alterações
+        desfeitas (ROLLBACK) não são avisadas.
+
+        As linhas são anotadas por gatilhos TEMP, que só existem nesta
+        conexão e não mudam o esquema do arquivo. O callback roda na thread
+        que fez a alteração, fora da trava do banco.
+        """
+        if not tabela.isidentifier():
+            raise ValueError(f"Nome de tabela inválido: {tabela!r}")
+        with self._trava:
+            if tabela not in self._observadores:
+                for operacao, linha in (("INSERT", "new"), ("UPDATE", "new"), ("DELETE", "old")):
+                    self.conexao.execute(f"""
+                        CREATE TEMP TRIGGER IF NOT EXISTS {tabela}_observada_{operacao.lower()}
+                        AFTER {operacao} ON main.{tabela} BEGIN
+                            SELECT anotar_alteracao('{tabela}', '{operacao}', {linha}.rowid);
+                        END
+                    """)
+                self._observadores[tabela] = []
+            self._observadores[tabela].append(callback)
+
+    def deixar_de_observar(self, tabela, callback):
+        with self._trava:
+            observadores = self._observadores.get(tabela, [])
+            if callback in observadores:
+                observadores.remove(callback)
+
+    def _anotar(self, tabela, operacao, rowid):
+        # Chamado pelos gatilhos, dentro do execute (com a trava já tomada)
+        if self._observadores.get(tabela):
+            self._alteracoes.append((tabela, operacao, rowid))
+
+    def _confirmadas(self):
+        alteracoes = self._alteracoes
+        self._alteracoes = []
+        return [(list(self._observadores.get(tabela, ())), operacao, rowid) for tabela, operacao, rowid in alteracoes]
+
+    def _notificar(self, alteracoes):
+        for observadores, operacao, rowid in alteracoes:
+            for callback in observadores:
+                try:
+                    callback(operacao, rowid)
+                except Exception:
+                    logging.exception("Erro ao avisar a alteração %s da linha %s", operacao, rowid)
+
+    def fechar(self):
+        with self._trava:
+            self.conexao.close()
+
+
+def banco_do_processo():
+    """Retorna o banco do processo, abrindo a conexão na primeira chamada."""
+    global _banco
+    with _trava_banco:
+        if _banco is None:
+            _banco = Banco()
+        return _banco
+
+
+def fechar_banco():
+    """Fecha a conexão do processo (ao encerrar o app)."""
+    global _banco
+    with _trava_banco:
+        if _banco is not None:
+            _banco.fechar()
+            _banco = None
+
+
+if __name__ == "__main__":
+    # Latência por operação numa base de 50 mil usuários: connect por chamada x Banco
+    import os
+    import tempfile
+    import time
+
+    caminho = os.path.join(tempfile.mkdtemp(), "bench.db")
+    banco = Banco(caminho)
+    with banco.transacao():
+        banco.executar("""
+            CREATE TABLE usuarios (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, usuario TEXT NOT NULL, senha TEXT NOT NULL,
+                admin INTEGER DEFAULT 0, data_expiracao TEXT, serial TEXT
+            )
+        """)
+        banco.conexao.executemany(
+            "INSERT INTO usuarios (usuario, senha, data_expiracao) VALUES (?, ?, '2030-01-01')",
+            ((f"usuario{i}", f"senha{i}") for i in range(50000)),
+        )
+
+    def por_conexao(sql, parametros):
+        conn = sqlite3.connect(caminho)
+        cursor = conn.cursor()
+        cursor.execute(sql, parametros)
+        resultado = cursor.fetchone()
+        conn.close()
+        return resultado
+
+    operacoes = (
+        ("por id", "SELECT id, usuario, data_expiracao, admin, serial FROM usuarios WHERE id = ?",
+         lambda i: (i * 7919 % 50000 + 1,)),
+        ("login", "SELECT usuario, senha, data_expiracao FROM usuarios WHERE usuario = ? AND senha = ?",
+         lambda i: (f"usuario{i * 7919 % 50000}", f"senha{i * 7919 % 50000}")),
+    )
+    for nome, sql, parametros in operacoes:
+        repeticoes = 2000 if nome == "por id" else 200
+        for rotulo, executar in (("connect/close", por_conexao), ("Banco", banco.consultar_um)):
+            inicio = time.perf_counter()
+            for i in range(repeticoes):
+                executar(sql, parametros(i))
+            decorrido = time.perf_counter() - inicio
+            print(f"{nome:>6} {rotulo:>13}: {1e6 * decorrido / repeticoes:8.1f} µs/operação")
+
+    # Login e validade com os índices de migracoes.py, à medida que a tabela cresce
+    from migracoes import criar_indices_usuarios
+
+    with banco.transacao():
+        criar_indices_usuarios(banco.conexao.cursor())
+    consultas = (
+        ("login", "SELECT usuario, senha, data_expiracao FROM usuarios WHERE usuario = ? AND senha = ?",
+         lambda i, n: (f"usuario{i * 7919 % n}", f"senha{i * 7919 % n}")),
+        ("validade", "SELECT data_expiracao FROM usuarios WHERE usuario = ?",
+         lambda i, n: (f"usuario{i * 7919 % n}",)),
+    )
+    total = 50000
+    for alvo in (50000, 100000, 200000, 400000):
+        with banco.transacao():
+            banco.conexao.executemany(
+                "INSERT INTO usuarios (usuario, senha, data_expiracao) VALUES (?, ?, '2030-01-01')",
+                ((f"usuario{i}", f"senha{i}") for i in range(total, alvo)),
+            )
+        total = alvo
+        for nome, sql, parametros in consultas:
+            inicio = time.perf_counter()
+            for i in range(2000):
+                banco.consultar_um(sql, parametros(i, total))
+            decorrido = time.perf_counter() - inicio
+            plano = banco.consultar_um("EXPLAIN QUERY PLAN " + sql, parametros(0, total))[-1]
+            print(f"{total:>7} linhas {nome:>8}: {1e6 * decorrido / 2000:6.1f} µs/operação  ({plano})")
+    banco.fechar()
@@ -1,6 +1,5 @@
 import os
 import sys
-import sqlite3
 import configparser  # Importar o configparser
 import json
 
@@ -31,47 +30,13 @@ RUTA_END_SOUND = resource_path(config['DEFAULT'].get('RUTA_END_SOUND', 'assets/e
 
 # Configurações do aplicativo
 TEMA = config['DEFAULT'].get('TEMA', 'Claro') if 'DEFAULT' in config else 'Claro'
+# Saída dos sinais sonoros: "flet" (cliente), "local" (mixer no processo, requer pygame) ou "nula"
+SAIDA_AUDIO = config['DEFAULT'].get('SAIDA_AUDIO', 'flet') if 'DEFAULT' in config else 'flet'
 
 
-# Configuração do banco de dados SQLite
+# Configuração do banco de dados SQLite (o esquema é criado/atualizado por migracoes.migrar, chamado em main)
 DATABASE_PATH = resource_path("database.db")
 
-# Função para criar o banco de dados e a tabela de usuários se não existirem
-def initialize_database():
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    # Criação da tabela de usuários (se não existir)
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS usuarios (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            usuario TEXT NOT NULL,
-            senha TEXT NOT NULL,
-            admin INTEGER DEFAULT 0,  -- Adiciona a coluna admin para verificar privilégios
-            data_expiracao TEXT,
-            serial TEXT  -- Adiciona a coluna serial para gerenciar a ativação da licença
-        )
-    ''')
-
-    # Verificação e adição das colunas admin, data_expiracao, e serial (se não existirem)
-    cursor.execute("PRAGMA table_info(usuarios)")
-    columns = [column[1] for column in cursor.fetchall()]
-    
-    if "admin" not in columns:
-        cursor.execute("ALTER TABLE usuarios ADD COLUMN admin INTEGER DEFAULT 0")
-
-    if "data_expiracao" not in columns:
-        cursor.execute("ALTER TABLE usuarios ADD COLUMN data_expiracao TEXT")
-
-    if "serial" not in columns:
-        cursor.execute("ALTER TABLE usuarios ADD COLUMN serial TEXT")
-    
-    conn.commit()
-    conn.close()
-
-# Chamar a função de inicialização do banco de dados ao importar o config
-initialize_database()
-
 CONFIG_FILE = "config.json"
 
 def salvar_configuracao(chave, valor):
@@ -3,29 +3,36 @@ import configparser
 from config import salvar_configuracao, carregar_configuracao
 from tema import aplicar_tema
 from verify_license import obter_validade_serial
+from telas import Tela, rota, roteador_da_pagina
+from estilos import obter_estilo
 
 def configuracoes_page(page: ft.Page, usuario: str):
-    """Constrói a interface de configurações."""
+    """Exibe a interface de configurações."""
+    roteador_da_pagina(page).ir("/configuracoes", usuario)
 
-    # Lê config.ini
-    config = configparser.ConfigParser()
-    config.read('config.ini')
 
-    # Carrega valores do config
-    start_sound_val = config['DEFAULT'].get('RUTA_START_SOUND', '')
-    end_sound_val = config['DEFAULT'].get('RUTA_END_SOUND', '')
-    tema_val = config['DEFAULT'].get('TEMA', 'Claro')
-    tam_cronometro_val = config['DEFAULT'].get('TAMANHO_CRONOMETRO', '150')
+@rota("/configuracoes")
+def criar_tela_configuracoes(page: ft.Page, usuario: str):
+    """Constrói a interface de configurações (uma vez; os valores são relidos a cada exibição)."""
+
+    config = configparser.ConfigParser()
 
     # Cria TextFields e Dropdown
-    start_sound = ft.TextField(label="Som de Início", value=start_sound_val)
-    end_sound = ft.TextField(label="Som de Fim", value=end_sound_val)
+    start_sound = ft.TextField(label="Som de Início")
+    end_sound = ft.TextField(label="Som de Fim")
     tema = ft.Dropdown(
         label="Tema",
-        value=tema_val,
         options=[ft.dropdown.Option("Claro"), ft.dropdown.Option("Escuro")],
     )
-    tamanho_cronometro = ft.TextField(label="Tamanho do Cronômetro", value=tam_cronometro_val)
+    tamanho_cronometro = ft.TextField(label="Tamanho do Cronômetro")
+
+    def carregar_valores():
+        """Lê config.ini e preenche os campos."""
+        config.read('config.ini')
+        start_sound.value = config['DEFAULT'].get('RUTA_START_SOUND', '')
+        end_sound.value = config['DEFAULT'].get('RUTA_END_SOUND', '')
+        tema.value = config['DEFAULT'].get('TEMA', 'Claro')
+        tamanho_cronometro.value = config['DEFAULT'].get('TAMANHO_CRONOMETRO', '150')
 
     def salvar_configuracoes(e):
         """Salva config e retorna ao menu."""
@@ -35,7 +42,9 @@ def configuracoes_page(page: ft.Page, usuario: str):
             'RUTA_ALERT_SOUND': 'assets/alert_sound.wav',
             'RUTA_END_SOUND': end_sound.value,
             'TEMA': tema.value,
-            'TAMANHO_CRONOMETRO': tamanho_cronometro.value
+            'TAMANHO_CRONOMETRO': tamanho_cronometro.value,
+            # Sem campo na tela: preserva o valor do arquivo
+            'SAIDA_AUDIO': config['DEFAULT'].get('SAIDA_AUDIO', 'flet')
         }
         with open('config.ini', 'w') as configfile:
             config.write(configfile)
@@ -45,54 +54,58 @@ def configuracoes_page(page: ft.Page, usuario: str):
         voltar_menu(page, usuario)
 
     def voltar_menu(page_, usuario_):
-        from menu_principal import mostrar_menu
-        mostrar_menu(page_, usuario_)
+        roteador_da_pagina(page_).ir("/menu")
 
-    page.clean()
     # Monta layout
-    page.add(
-        ft.Container(
-            content=ft.Column(
-                controls=[
-                    ft.Text(value="Configurações", size=32, weight="bold"),
-                    start_sound,
-                    end_sound,
-                    tema,
-                    tamanho_cronometro,
-                    ft.Row(
-                        controls=[
-                            ft.ElevatedButton(
-                                "Salvar",
-                                on_click=salvar_configuracoes,
-                                width=200,
-                                height=50,
-                                bgcolor=ft.colors.BLUE_GREY_700,
-                                color=ft.colors.WHITE,
-                            ),
-                            ft.ElevatedButton(
-                                "Voltar",
-                                on_click=lambda e: voltar_menu(page, usuario),
-                                width=200,
-                                height=50,
-                                bgcolor=ft.colors.BLUE_GREY_700,
-                                color=ft.colors.WHITE,
-                            )
-                        ],
-                        alignment=ft.MainAxisAlignment.CENTER
-                    )
-                ],
-                alignment=ft.MainAxisAlignment.CENTER,
-                horizontal_alignment=ft.CrossAxisAlignment.CENTER
-            ),
-            padding=50,
-            border_radius=10,
-            shadow=ft.BoxShadow(
-                spread_radius=2,
-                blur_radius=15,
-                color=ft.colors.BLACK,
-                offset=ft.Offset(2, 2)
-            ),
-            alignment=ft.alignment.center
+    layout = ft.Container(
+        content=ft.Column(
+            controls=[
+                ft.Text(value="Configurações", size=32, weight="bold"),
+                start_sound,
+                end_sound,
+                tema,
+                tamanho_cronometro,
+                ft.Row(
+                    controls=[
+                        ft.ElevatedButton(
+                            "Salvar",
+                            on_click=salvar_configuracoes,
+                            width=200,
+                            height=50,
+                            bgcolor=ft.colors.BLUE_GREY_700,
+                            color=ft.colors.WHITE,
+                        ),
+                        ft.ElevatedButton(
+                            "Voltar",
+                            on_click=lambda e: voltar_menu(page, usuario),
+                            width=200,
+                            height=50,
+                            bgcolor=ft.colors.BLUE_GREY_700,
+                            color=ft.colors.WHITE,
+                        )
+                    ],
+                    alignment=ft.MainAxisAlignment.CENTER
+                )
+            ],
+            alignment=ft.MainAxisAlignment.CENTER,
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER
+        ),
+        padding=50,
+        border_radius=10,
+        shadow=obter_estilo("sombra_configuracoes"),
+        alignment=ft.alignment.center
+    )
+
+    tela = Tela(
+        page,
+        "configuracoes",
+        view=ft.View(
+            "/configuracoes",
+            controls=[layout],
+            vertical_alignment=ft.MainAxisAlignment.CENTER,
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER
         )
     )
-    page.update()
+    # config.ini pode ter mudado desde a última visita
+    tela.ao_montar(carregar_valores)
+    return tela
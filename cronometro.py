@@ -1,7 +1,35 @@
+import bisect
+import math
 import time
+from array import array
+
+# Sufixos ":SS" pré-formatados, compartilhados por todas as tabelas de quadros
+_SEGUNDOS = [f":{s:02}" for s in range(60)]
+
+
+class RelogioVirtual:
+    """
+    Relógio controlado manualmente, para simular o cronômetro sem dormir.
+
+    Pode ser passado no lugar de time.monotonic ao criar o Cronometro.
+    """
+
+    def __init__(self, inicio=0.0):
+        self.agora = inicio
+
+    def __call__(self):
+        return self.agora
+
+    def avancar(self, segundos):
+        """Avança o relógio em 'segundos'."""
+        self.agora += segundos
+
 
 class Cronometro:
-    def __init__(self):
+    def __init__(self, relogio=time.monotonic):
+        # Base de tempo monotônica por padrão: ajustes do relógio do sistema
+        # (ex.: sincronização NTP) não alteram o tempo restante.
+        self.relogio = relogio
         self.tempo_inicial = 0
         self.tempo_final = 0
         self.tempo_pausado = 0
@@ -20,20 +48,21 @@ class Cronometro:
         Inicia o cronômetro.
         """
         if not self.em_andamento and not self.em_pausa:
-            self.tempo_inicial = time.time()
+            self.tempo_inicial = self.relogio()
             self.em_andamento = True
         elif self.em_pausa:
             self.em_andamento = True
             self.em_pausa = False
             # Ajusta o tempo inicial para compensar o tempo em pausa
-            self.tempo_inicial += time.time() - self.tempo_pausado
+            self.tempo_inicial += self.relogio() - self.tempo_pausado
 
     def parar(self):
         """
-        Para o cronômetro.
+        Para o cronômetro (também a partir da pausa: a próxima contagem
+        começa do zero, e não de onde a pausa parou).
         """
-        if self.em_andamento:
-            self.tempo_final = time.time()
+        if self.em_andamento or self.em_pausa:
+            self.tempo_final = self.tempo_pausado if self.em_pausa else self.relogio()
             self.em_andamento = False
             self.em_pausa = False
 
@@ -54,14 +83,14 @@ class Cronometro:
         if self.em_andamento:
             self.em_andamento = False
             self.em_pausa = True
-            self.tempo_pausado = time.time()
+            self.tempo_pausado = self.relogio()
 
     def tempo_restante(self):
         """
         Calcula o tempo restante em segundos.
         """
         if self.em_andamento:
-            tempo_decorrido = time.time() - self.tempo_inicial
+            tempo_decorrido = self.relogio() - self.tempo_inicial
             return max(0, self.duracao - tempo_decorrido)
         elif self.em_pausa:
             tempo_decorrido = self.tempo_pausado - self.tempo_inicial
@@ -69,13 +98,136 @@ class Cronometro:
         else:
             return max(0, self.duracao)
 
+    def prazo_final(self):
+        """
+        Instante (no relógio do cronômetro) em que a contagem chega a zero,
+        ou None se ela não estiver em andamento.
+        """
+        if not self.em_andamento:
+            return None
+        return self.tempo_inicial + self.duracao
+
     def tempo_decorrido(self):
         """
         Calcula o tempo decorrido em segundos.
         """
         if self.em_andamento:
-            return time.time() - self.tempo_inicial
+            return self.relogio() - self.tempo_inicial
         elif self.em_pausa:
             return self.tempo_pausado - self.tempo_inicial
         else:
             return 0
+
+
+class TabelaQuadros:
+    """
+    Quadros pré-calculados da contagem regressiva, um por segundo restante.
+
+    Cada quadro guarda o texto MM:SS e a largura da barra (em pixels), de
+    modo que o tick vira uma consulta por índice. As larguras ficam num
+    array compacto (2 bytes por segundo) e os textos são montados a partir
+    de prefixos por minuto, o que mantém a memória limitada mesmo em
+    sessões de várias horas. As mudanças de cor não passam pelo tick: são
+    eventos da AgendaEventos.
+    """
+
+    def __init__(self, duracao, largura_barra):
+        self.duracao = duracao
+        self.largura_barra = largura_barra
+        total = int(math.ceil(duracao))
+
+        self.larguras = array("H", bytes(2 * (total + 1)))
+        for segundos in range(total + 1):
+            progresso = 1 - segundos / duracao if duracao else 1
+            self.larguras[segundos] = int(round(largura_barra * min(progresso, 1)))
+
+        self._minutos = [f"{m:02}" for m in range(total // 60 + 1)]
+
+    def corresponde(self, duracao, largura_barra):
+        """Indica se a tabela ainda vale para a duração e largura informadas."""
+        return self.duracao == duracao and self.largura_barra == largura_barra
+
+    def quadro(self, segundos):
+        """Retorna (texto, largura) para o número de segundos restantes."""
+        return (
+            self._minutos[segundos // 60] + _SEGUNDOS[segundos % 60],
+            self.larguras[segundos],
+        )
+
+
+class Limiar:
+    """
+    Aviso da contagem regressiva: uma ação disparada quando restarem
+    'restante' segundos ou quando a fração 'progresso' da duração tiver
+    passado (informe só um dos dois).
+
+    'acao' é o nome da ação (ex.: "som", "faixa", "pulso", "gancho") e
+    'args' seus argumentos; quem interpreta os nomes é o dono da agenda.
+    """
+
+    __slots__ = ("acao", "args", "restante", "progresso")
+
+    def __init__(self, acao, *args, restante=None, progresso=None):
+        if (restante is None) == (progresso is None):
+            raise ValueError("Informe 'restante' ou 'progresso' no limiar")
+        self.acao = acao
+        self.args = args
+        self.restante = restante
+        self.progresso = progresso
+
+    def instante(self, duracao):
+        """Segundos de contagem (tempo decorrido) em que o aviso dispara."""
+        if self.restante is not None:
+            return duracao - self.restante
+        return duracao * self.progresso
+
+    def __repr__(self):
+        quando = f"restante={self.restante}" if self.restante is not None else f"progresso={self.progresso}"
+        return f"Limiar({self.acao!r}, {quando})"
+
+
+class AgendaEventos:
+    """
+    Limiares compilados para uma duração: instantes (em tempo decorrido)
+    em ordem crescente, cada um com seu limiar.
+
+    A agenda é montada uma vez por duração (ao definir a duração ou
+    iniciar) e percorrida por um cursor, sem nenhuma verificação por tick.
+    Como o tempo decorrido do Cronometro já desconta as pausas, pausar e
+    retomar desloca todos os eventos pendentes sem recompilar nada; limiares
+    que caem fora da contagem (ex.: 1 min antes do fim numa contagem de
+    30 s) são descartados.
+    """
+
+    def __init__(self, limiares, duracao):
+        self.limiares_origem = limiares
+        self.duracao = duracao
+        eventos = sorted(
+            ((limiar.instante(duracao), i, limiar) for i, limiar in enumerate(limiares)),
+            key=lambda evento: evento[:2],
+        )
+        eventos = [(instante, limiar) for instante, _, limiar in eventos if 0 <= instante <= duracao]
+        self.instantes = [instante for instante, _ in eventos]
+        self.limiares = [limiar for _, limiar in eventos]
+
+    def corresponde(self, limiares, duracao):
+        """Indica se a agenda ainda vale para os limiares e a duração informados."""
+        return self.limiares_origem is limiares and self.duracao == duracao
+
+    def __len__(self):
+        return len(self.instantes)
+
+    def posicao(self, decorrido):
+        """Índice do primeiro evento ainda não alcançado em 'decorrido' segundos."""
+        return bisect.bisect_right(self.instantes, decorrido)
+
+    def vencidos(self, inicio, decorrido):
+        """Índice final e limiares de inicio em diante com instante <= decorrido."""
+        fim = max(self.posicao(decorrido), inicio)
+        return fim, self.limiares[inicio:fim]
+
+    def espera(self, indice, decorrido):
+        """Segundos até o evento 'indice', ou None se não houver mais eventos."""
+        if indice >= len(self.instantes):
+            return None
+        return max(self.instantes[indice] - decorrido, 0)
@@ -1,23 +1,108 @@
 import flet as ft
-import threading
 import time
-from datetime import datetime, timezone, timedelta
-from cronometro import Cronometro
-from config import RUTA_START_SOUND, RUTA_END_SOUND, TEMA, RUTA_LOGO
+from collections import deque
+from cronometro import Cronometro, TabelaQuadros, Limiar, AgendaEventos
+from agendador import agendador_da_pagina, TokenCancelamento
+from renderizacao import AtualizadorControles
+from efeitos import EfeitoPulso
+from mostrador import MostradorDigitos
+from estilos import obter_estilo, gradiente_rampa
+from telas import Tela, rota, roteador_da_pagina
+from audio import sinais_da_pagina
+from config import TEMA, RUTA_LOGO
 
 class CronometroControl(ft.UserControl):
-    def __init__(self, page, usuario, on_voltar=None):
+    # Cor do texto para cada faixa de progresso (a barra usa a rampa de estilos.py)
+    CORES_FAIXAS = (
+        ft.colors.GREEN_ACCENT,
+        ft.colors.AMBER,
+        ft.colors.RED_ACCENT_400,
+        ft.colors.RED_ACCENT_400,
+    )
+    # Avisos da contagem, compilados numa AgendaEventos a cada duração e
+    # disparados no instante exato pelo agendador. Ações: "faixa" (cor da
+    # barra e do texto), "pulso", "som", "gancho" (função) e "esgotar".
+    LIMIARES = (
+        Limiar("faixa", 0, progresso=0),
+        Limiar("faixa", 1, progresso=0.5),
+        Limiar("faixa", 2, progresso=0.75),
+        Limiar("faixa", 3, progresso=0.9),
+        Limiar("pulso", True, progresso=0.9),
+        Limiar("som", "alerta", progresso=0.9),
+        Limiar("esgotar", restante=0),
+    )
+    # Ações que deixam um estado na tela, com o valor antes do primeiro aviso:
+    # ao recompilar a agenda no meio da contagem, vale a última alcançada
+    ACOES_ESTADO = {"faixa": (0,), "pulso": (False,)}
+    # Duração (ms) das transições da barra fora da contagem (pausa, reinício, quadros)
+    DURACAO_TRANSICAO_BARRA = 1000
+
+    # Tabela de transições: (estado, comando) -> (ação, próximo estado).
+    # "*" vale para qualquer estado; próximo estado None mantém o atual.
+    TRANSICOES = {
+        ("parado", "iniciar"): ("_iniciar", "rodando"),
+        ("pausado", "iniciar"): ("_iniciar", "rodando"),
+        ("pausado", "retomar"): ("_retomar", "rodando"),
+        ("rodando", "pausar"): ("_pausar", "pausado"),
+        ("rodando", "tick"): ("atualizar_progresso", None),
+        ("rodando", "evento"): ("disparar_eventos", None),
+        ("rodando", "esgotar"): ("_esgotar", "esgotado"),
+        ("rodando", "parar"): ("_parar", "parado"),
+        ("pausado", "parar"): ("_parar", "parado"),
+        ("esgotado", "parar"): ("_parar", "parado"),
+        ("*", "reiniciar"): ("_reiniciar", "parado"),
+        ("*", "definir_duracao"): ("_definir_duracao", None),
+        ("*", "definir_limiares"): ("_definir_limiares", None),
+        ("*", "redimensionar"): ("_redimensionar", None),
+        ("*", "alternar_tema"): ("_alternar_tema", None),
+        ("*", "alternar_modo"): ("_alternar_modo", None),
+        ("*", "encerrar"): ("_encerrar", "parado"),
+    }
+    # Atalhos de teclado -> comandos
+    ATALHOS = {"enter": "iniciar", " ": "pausar", "r": "reiniciar", "c": "retomar"}
+
+    # Intervalo do primeiro tick após iniciar/retomar
+    INTERVALO_MINIMO = 0.05
+    # Margem para acordar logo após a virada, e não um instante antes
+    MARGEM_PRAZO = 0.002
+
+    def __init__(self, page, usuario, limiares=None):
         super().__init__()
         self.page = page
         self.usuario = usuario
-        self.on_voltar = on_voltar
-        self.cronometro = Cronometro()
+        # Overlays, handlers e inscrições da tela, liberados ao sair dela
+        self.tela = Tela(page, "cronometro")
+
+        # Laço de agendamento único da página (ticks de progresso, relógio e reinício).
+        # Sua thread também é a única dona do estado do cronômetro: handlers e
+        # ticks só enfileiram comandos (ver processar).
+        self.agendador = agendador_da_pagina(page)
+        self.estado = "parado"
+        self.comandos_processados = 0
+        self.comandos_ignorados = 0
+        self.cronometro = Cronometro(relogio=self.agendador.relogio)
+        self.tarefa_progresso = None
+        # Avisos da contagem (ver LIMIARES) e cursor do próximo a disparar
+        self.limiares = tuple(limiares) if limiares is not None else self.LIMIARES
+        self.agenda = None
+        self.indice_evento = 0
+        # Faixa de progresso aplicada na contagem atual (None antes do primeiro aviso)
+        self.faixa_atual = None
+        # Eventos disparados: (limiar, prazo, instante do disparo), no relógio do agendador
+        self.eventos_disparados = deque(maxlen=100)
+        # Token da contagem atual: cancela de uma vez o tick e o reinício pendente
+        self.token_contagem = TokenCancelamento()
+        # Latência (s) entre o atalho de teclado e o envio do quadro do comando
+        self.latencias_atalhos = deque(maxlen=100)
+
+        # Envia ao cliente apenas as propriedades que mudaram
+        self.atualizador = AtualizadorControles(page)
 
         # Flags de controle e variáveis extras para UX
-        self.stop_data_timer = False
-        self.stop_progress_timer = False
-        self.pulsando = False  # Para animação de pulso
+        self.pulsando = False  # Alerta de tempo acabando ativo
         self.minimal_mode = False  # Modo minimalista que oculta controles
+        # Barra animada pelo cliente: uma mensagem por mudança de estado, não por tick
+        self.barra_animada_cliente = True
         self.historico_tempos = []  # Guarda os últimos tempos configurados
 
         # Configuração inicial da janela, tema e dimensões
@@ -26,22 +111,25 @@ class CronometroControl(ft.UserControl):
         self.update_dimensions()
         self.apply_theme()
 
-        # Adiciona handler para redimensionamento da janela
-        self.page.on_resize = self.resize_handler
+        # Ajusta o layout depois que as rajadas de redimensionamento se acalmam
+        self.tela.redimensionamento(self.resize_handler)
 
         # Configuração do cronômetro e elementos visuais
         self.cronometro.definir_duracao(5 * 60)
         self.tempo_configurado = 5
-        self.som_fim_tocado = False
-
-        self.contador_tempo = ft.Text(
-            value="05:00",
-            size=self.contador_size,
-            weight="bold",
-            color=self.text_color,
-            text_align=ft.TextAlign.CENTER,
+        self.tabela_quadros = None
+        self.obter_tabela_quadros()
+        self.obter_agenda()
+
+        # Contador em células de largura fixa: cada tick envia só os dígitos que mudaram
+        self.mostrador = MostradorDigitos(
+            self.atualizador,
+            "05:00",
+            self.contador_size,
+            self.text_color,
             animate_scale=300  # Animação de escala (usada também na animação de início)
         )
+        self.contador_tempo = self.mostrador.linha
 
         self.tempo_configurado_texto = ft.Text(
             value=f"Tempo: {self.tempo_configurado} minutos",
@@ -50,6 +138,12 @@ class CronometroControl(ft.UserControl):
             text_align=ft.TextAlign.CENTER
         )
 
+        # Gradiente da barra em cada faixa: da cor inicial da rampa até a cor
+        # do fim da faixa (objetos compartilhados, ver estilos.py)
+        self.gradientes_faixas = [
+            gradiente_rampa((faixa + 1) / len(self.CORES_FAIXAS)) for faixa in range(len(self.CORES_FAIXAS))
+        ]
+
         # --- Implementação corrigida da barra de progresso ---
         self.barra_progresso_container = ft.Container(
             width=self.progress_bar_width,
@@ -58,24 +152,15 @@ class CronometroControl(ft.UserControl):
             bgcolor=ft.colors.GREY_800 if self.theme == "Escuro" else ft.colors.GREY_300,
             clip_behavior=ft.ClipBehavior.HARD_EDGE,
             padding=0,
-            shadow=ft.BoxShadow(
-                spread_radius=1,
-                blur_radius=15,
-                color=ft.colors.BLACK54,
-                offset=ft.Offset(0, 3)
-            )
+            shadow=obter_estilo("sombra_barra")
         )
 
         self.barra_progresso_interna = ft.Container(
             width=0,
             height=40,
             border_radius=20,
-            animate=ft.animation.Animation(800, "easeOutQuint"),
-            gradient=ft.LinearGradient(
-                begin=ft.alignment.center_left,
-                end=ft.alignment.center_right,
-                colors=[ft.colors.GREEN_ACCENT, ft.colors.AMBER]
-            )
+            animate=ft.animation.Animation(self.DURACAO_TRANSICAO_BARRA, "linear"),  # Interpola entre os quadros de cada segundo
+            gradient=self.gradientes_faixas[0]
         )
 
         self.barra_indicador = ft.Container(
@@ -83,12 +168,7 @@ class CronometroControl(ft.UserControl):
             height=40,
             bgcolor=ft.colors.WHITE,
             border_radius=20,
-            shadow=ft.BoxShadow(
-                spread_radius=2,
-                blur_radius=15,
-                color=ft.colors.BLACK54,
-                offset=ft.Offset(0, 3)
-            ),
+            shadow=obter_estilo("sombra_indicador"),
             alignment=ft.alignment.center,
             content=ft.Icon(ft.icons.TIMER, size=20, color=ft.colors.BLACK87),
             animate_position=ft.animation.Animation(600, "easeOutBack"),
@@ -111,34 +191,45 @@ class CronometroControl(ft.UserControl):
         # --- Fim da implementação corrigida ---
 
         self.data_hora_texto = ft.Text(
-            value=self.obter_data_hora(),
             size=60,
             color=self.text_color,
             weight="bold",
             text_align=ft.TextAlign.CENTER
         )
 
-        # Áudios
-        self.start_audio = ft.Audio(src=RUTA_START_SOUND)
-        self.end_audio = ft.Audio(src=RUTA_END_SOUND)
-        self.page.overlay.extend([self.start_audio, self.end_audio])
+        # Efeitos de alerta nos segundos finais (animados pelo cliente)
+        self.pulso_contador = EfeitoPulso(self.atualizador, self.contador_tempo, escala=1.05)
+        self.pulso_indicador = EfeitoPulso(self.atualizador, self.barra_indicador, escala=1.2)
+
+        # Sinais sonoros pré-carregados uma vez por página (ver audio.py)
+        self.sons = sinais_da_pagina(page)
 
         # Atalhos de teclado
-        self.page.on_keyboard_event = self.handle_key_event
+        self.tela.handler("on_keyboard_event", self.handle_key_event)
+        self.tela.dialogos()
+
+        # Relógio de parede compartilhado (o texto recebe o valor ao montar)
+        self.tela.data_hora(self.data_hora_texto, self.atualizador)
+        # A contagem para junto com a tela
+        self.tela.ao_descartar(lambda: self.enviar("encerrar"))
 
         # Inicializa variável para otimização de atualizações
         self.ultimo_progresso = 0
 
-        # Monta o layout inicial
-        self.page.add(self.build())
-        self.start_data_timer()
+        # Monta o layout inicial (árvore retida, ver build)
+        self.layout = None
+        self.botoes = []  # (botão, ícone, multiplicador de largura)
+        self.tela.view = ft.View(
+            "/cronometro",
+            controls=[self.build()],
+            vertical_alignment=ft.MainAxisAlignment.START,
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER
+        )
 
-    def resize_handler(self, event):
-        """Handler chamado quando a janela é redimensionada."""
-        self.update_dimensions()
-        self.page.clean()
-        self.page.add(self.build())
-        self.page.update()
+    def resize_handler(self):
+        """Chamado pelo serviço de redimensionamento, já na thread do agendador."""
+        # Só as propriedades que dependem do tamanho da janela são reenviadas
+        self.processar("redimensionar")
 
     def update_dimensions(self):
         largura_janela = self.page.window.width
@@ -154,165 +245,178 @@ class CronometroControl(ft.UserControl):
             self.primary_color = ft.colors.BLUE_GREY_900
             self.secondary_color = ft.colors.BLUE_GREY_50
             self.text_color = ft.colors.WHITE
-            self.button_color = ft.colors.BLUE_GREY_700
-            self.button_text_color = ft.colors.WHITE
             self.timer_background_color = ft.colors.BLACK
             self.progress_bar_color = ft.colors.LIGHT_GREEN_700
-            self.gradient_colors = [ft.colors.BLUE_GREY_900, ft.colors.BLUE_GREY_700]
         else:
             self.primary_color = ft.colors.BLUE_GREY_50
             self.secondary_color = ft.colors.WHITE
             self.text_color = ft.colors.BLACK
-            self.button_color = ft.colors.BLUE_GREY_300
-            self.button_text_color = ft.colors.BLACK
             self.timer_background_color = ft.colors.WHITE
             self.progress_bar_color = ft.colors.GREEN_700
-            self.gradient_colors = [ft.colors.LIGHT_BLUE_100, ft.colors.WHITE]
-
-    def obter_data_hora(self):
-        return datetime.now(timezone(timedelta(hours=-3))).strftime("%d de %B de %Y, %H:%M:%S")
-
-    def start_data_timer(self):
-        def tick():
-            if self.stop_data_timer:
-                return
-            self.atualizar_data_hora()
-            threading.Timer(1.0, tick).start()
-        tick()
-
-    def atualizar_data_hora(self):
-        self.data_hora_texto.value = self.obter_data_hora()
-        self.data_hora_texto.update()
 
     def build(self):
+        """Retorna a árvore da tela, criada uma única vez e mantida entre modos, temas e tamanhos."""
+        if self.layout is None:
+            self.layout = self.criar_layout()
+        return self.layout
+
+    def criar_layout(self):
         self.update_dimensions()
         self.apply_theme()
         self.page.title = "Aplicação Cronômetro"
         self.page.vertical_alignment = ft.MainAxisAlignment.START
         self.page.horizontal_alignment = ft.CrossAxisAlignment.CENTER
 
-        if self.minimal_mode:
-            controls = [
-                ft.Container(
-                    content=ft.Image(src=RUTA_LOGO, width=self.logo_size, height=self.logo_size),
-                    alignment=ft.alignment.top_center,
-                    padding=ft.padding.only(top=-100, bottom=10)
-                ),
-                self.data_hora_texto,
-                ft.Container(
-                    content=ft.Column(
-                        controls=[self.contador_tempo],
-                        alignment=ft.MainAxisAlignment.CENTER,
-                        horizontal_alignment=ft.CrossAxisAlignment.CENTER
-                    ),
-                    alignment=ft.alignment.center,
-                    padding=20,
-                    border_radius=ft.border_radius.all(10),
-                    bgcolor=self.timer_background_color,
-                    shadow=ft.BoxShadow(
-                        spread_radius=5,
-                        blur_radius=20,
-                        color=ft.colors.BLACK26,
-                        offset=ft.Offset(0, 4)
-                    )
-                ),
-                ft.Container(height=10),
-                self.container_barra_progresso,
-                ft.Container(height=10),
-                self.create_button("Sair do Modo Minimalista", ft.icons.CANCEL, self.toggle_minimal_mode, tooltip="Exibe todos os controles")
-            ]
-        else:
-            historico_dropdown = None
-            if self.historico_tempos:
-                historico_dropdown = ft.Dropdown(
-                    label="Histórico de Tempos",
-                    width=150,
-                    options=[ft.dropdown.Option(f"{t} minutos") for t in sorted(self.historico_tempos)],
-                    on_change=lambda e: self.selecionar_tempo(e.control.value),
-                    tooltip="Selecione um tempo previamente usado"
-                )
-            controls = [
-                ft.Container(
-                    content=ft.Image(src=RUTA_LOGO, width=self.logo_size, height=self.logo_size),
-                    alignment=ft.alignment.top_center,
-                    padding=ft.padding.only(top=-100, bottom=10)
-                ),
-                ft.Container(
-                    content=self.data_hora_texto,
-                    alignment=ft.alignment.center,
-                    padding=ft.padding.only(top=-100, bottom=5)
-                ),
-                ft.Container(
-                    content=ft.Column(
-                        controls=[self.contador_tempo, self.tempo_configurado_texto],
-                        alignment=ft.MainAxisAlignment.CENTER,
-                        horizontal_alignment=ft.CrossAxisAlignment.CENTER
-                    ),
-                    alignment=ft.alignment.center,
-                    padding=20,
-                    border_radius=ft.border_radius.all(10),
-                    bgcolor=self.timer_background_color,
-                    shadow=ft.BoxShadow(
-                        spread_radius=5,
-                        blur_radius=20,
-                        color=ft.colors.BLACK26,
-                        offset=ft.Offset(0, 4)
-                    )
-                ),
-                ft.Container(height=10),
-                self.container_barra_progresso,
-                ft.Container(height=10),
-                ft.Row(
-                    controls=[
-                        self.create_button("Iniciar", ft.icons.PLAY_ARROW, self.iniciar, tooltip="Inicia o cronômetro"),
-                        self.create_button("Pausar", ft.icons.PAUSE, self.pausar, tooltip="Pausa o cronômetro"),
-                        self.create_button("Retomar", ft.icons.PLAY_ARROW, self.retomar, tooltip="Retoma o cronômetro"),
-                        self.create_button("Reiniciar", ft.icons.RESTART_ALT, self.reiniciar, tooltip="Reinicia o cronômetro"),
-                        self.create_button("Parar", ft.icons.STOP, self.confirm_parar, tooltip="Pede confirmação para parar o cronômetro")
-                    ],
-                    alignment=ft.MainAxisAlignment.CENTER,
-                    spacing=self.button_spacing,
-                    wrap=True
-                ),
-                ft.Container(height=10),
-                ft.Row(
-                    controls=[
-                        self.create_button("Voltar", ft.icons.ARROW_BACK, self.voltar_menu, width_multiplier=2, tooltip="Volta ao menu principal"),
-                        self.create_button("Tela Cheia", ft.icons.FULLSCREEN, self.toggle_full_screen, tooltip="Alterna modo tela cheia"),
-                        self.create_button("Tema", ft.icons.BRIGHTNESS_4, self.toggle_theme, tooltip="Alterna entre temas"),
-                        self.create_button("Atalhos", ft.icons.INFO, self.mostrar_atalhos, tooltip="Exibe os atalhos de teclado"),
-                        self.create_button("Tempo", "⏱️", self.abrir_dialogo_tempo, tooltip=f"Configura o tempo (atual: {self.tempo_configurado} minutos)"),
-                        self.create_button("Modo Minimalista", ft.icons.VIDEOCAM_OFF, self.toggle_minimal_mode, tooltip="Oculta controles durante a contagem")
-                    ],
-                    alignment=ft.MainAxisAlignment.CENTER,
-                    spacing=self.button_spacing,
-                    wrap=True
-                ),
-                historico_dropdown if historico_dropdown else ft.Container()
-            ]
-        return ft.Container(
+        # Os controles dos dois modos ficam na mesma árvore; alternar o modo só muda 'visible'
+        self.logo = ft.Image(src=RUTA_LOGO, width=self.logo_size, height=self.logo_size)
+        self.data_hora_container = ft.Container(
+            content=self.data_hora_texto,
+            alignment=ft.alignment.center
+        )
+        self.caixa_contador = ft.Container(
             content=ft.Column(
-                controls=controls,
+                controls=[self.contador_tempo, self.tempo_configurado_texto],
+                alignment=ft.MainAxisAlignment.CENTER,
+                horizontal_alignment=ft.CrossAxisAlignment.CENTER
+            ),
+            alignment=ft.alignment.center,
+            padding=20,
+            border_radius=ft.border_radius.all(10),
+            bgcolor=self.timer_background_color,
+            shadow=obter_estilo("sombra_caixa_contador")
+        )
+        self.botoes_controle = ft.Row(
+            controls=[
+                self.create_button("Iniciar", ft.icons.PLAY_ARROW, self.iniciar, tooltip="Inicia o cronômetro"),
+                self.create_button("Pausar", ft.icons.PAUSE, self.pausar, tooltip="Pausa o cronômetro"),
+                self.create_button("Retomar", ft.icons.PLAY_ARROW, self.retomar, tooltip="Retoma o cronômetro"),
+                self.create_button("Reiniciar", ft.icons.RESTART_ALT, self.reiniciar, tooltip="Reinicia o cronômetro"),
+                self.create_button("Parar", ft.icons.STOP, self.confirm_parar, tooltip="Pede confirmação para parar o cronômetro")
+            ],
+            alignment=ft.MainAxisAlignment.CENTER,
+            spacing=self.button_spacing,
+            wrap=True
+        )
+        self.espaco_navegacao = ft.Container(height=10)
+        botao_tempo = self.create_button("Tempo", "⏱️", self.abrir_dialogo_tempo, tooltip=self.dica_tempo())
+        self.botao_tempo = botao_tempo.content  # a dica acompanha o tempo configurado
+        self.botoes_navegacao = ft.Row(
+            controls=[
+                self.create_button("Voltar", ft.icons.ARROW_BACK, self.voltar_menu, width_multiplier=2, tooltip="Volta ao menu principal"),
+                self.create_button("Tela Cheia", ft.icons.FULLSCREEN, self.toggle_full_screen, tooltip="Alterna modo tela cheia"),
+                self.create_button("Tema", ft.icons.BRIGHTNESS_4, self.toggle_theme, tooltip="Alterna entre temas"),
+                self.create_button("Atalhos", ft.icons.INFO, self.mostrar_atalhos, tooltip="Exibe os atalhos de teclado"),
+                botao_tempo,
+                self.create_button("Modo Minimalista", ft.icons.VIDEOCAM_OFF, self.toggle_minimal_mode, tooltip="Oculta controles durante a contagem")
+            ],
+            alignment=ft.MainAxisAlignment.CENTER,
+            spacing=self.button_spacing,
+            wrap=True
+        )
+        self.historico_dropdown = ft.Dropdown(
+            label="Histórico de Tempos",
+            width=150,
+            options=[],
+            on_change=lambda e: self.selecionar_tempo(e.control.value),
+            tooltip="Selecione um tempo previamente usado"
+        )
+        self.botao_sair_minimal = self.create_button(
+            "Sair do Modo Minimalista", ft.icons.CANCEL, self.toggle_minimal_mode, tooltip="Exibe todos os controles"
+        )
+
+        self.layout_container = ft.Container(
+            content=ft.Column(
+                controls=[
+                    ft.Container(
+                        content=self.logo,
+                        alignment=ft.alignment.top_center,
+                        padding=ft.padding.only(top=-100, bottom=10)
+                    ),
+                    self.data_hora_container,
+                    self.caixa_contador,
+                    ft.Container(height=10),
+                    self.container_barra_progresso,
+                    ft.Container(height=10),
+                    self.botoes_controle,
+                    self.espaco_navegacao,
+                    self.botoes_navegacao,
+                    self.historico_dropdown,
+                    self.botao_sair_minimal
+                ],
                 alignment=ft.MainAxisAlignment.START,
                 horizontal_alignment=ft.CrossAxisAlignment.CENTER,
                 expand=True
             ),
             padding=80,
             border_radius=30,
-            shadow=ft.BoxShadow(
-                spread_radius=5,
-                blur_radius=25,
-                color=ft.colors.BLACK26,
-                offset=ft.Offset(2, 4)
-            ),
-            gradient=ft.LinearGradient(
-                begin=ft.Alignment(0, -1),
-                end=ft.Alignment(0, 1),
-                colors=self.gradient_colors
-            ),
+            shadow=obter_estilo("sombra_cronometro"),
             alignment=ft.alignment.top_center
         )
 
+        # Estado inicial: aplica direto nos controles, que ainda não estão na página
+        for controle, propriedades in self.propriedades_layout():
+            for nome, valor in propriedades.items():
+                setattr(controle, nome, valor)
+        return self.layout_container
+
+    def dica_tempo(self):
+        return f"Configura o tempo (atual: {self.tempo_configurado} minutos)"
+
+    def propriedades_layout(self):
+        return self.propriedades_modo() + self.propriedades_tema() + self.propriedades_dimensoes()
+
+    def propriedades_modo(self):
+        """Propriedades que dependem do modo (completo ou minimalista)."""
+        completo = not self.minimal_mode
+        return [
+            (self.data_hora_container, {"padding": ft.padding.only(top=-100, bottom=5) if completo else 0}),
+            (self.tempo_configurado_texto, {"visible": completo}),
+            (self.botoes_controle, {"visible": completo}),
+            (self.espaco_navegacao, {"visible": completo}),
+            (self.botoes_navegacao, {"visible": completo}),
+            (self.historico_dropdown, {"visible": completo and bool(self.historico_tempos)}),
+            (self.botao_sair_minimal, {"visible": not completo}),
+        ]
+
+    def propriedades_tema(self):
+        """Propriedades de cor, as únicas que mudam ao alternar o tema."""
+        pares = [
+            (self.layout_container, {"gradient": obter_estilo("fundo_cronometro", self.theme)}),
+            (self.caixa_contador, {"bgcolor": self.timer_background_color}),
+            (self.barra_progresso_container, {
+                "bgcolor": ft.colors.GREY_800 if self.theme == "Escuro" else ft.colors.GREY_300
+            }),
+            (self.tempo_configurado_texto, {"color": self.text_color}),
+            (self.data_hora_texto, {"color": self.text_color}),
+        ]
+        if self.faixa_atual is None:
+            # Depois do primeiro aviso, a cor do contador segue a faixa de progresso
+            pares.extend(self.mostrador.propriedades(cor=self.text_color))
+        # As cores dos botões vêm do estilo do tema (ver estilos.botao_cronometro)
+        estilo_botoes = obter_estilo("botao_cronometro", self.theme)
+        for btn, _, _ in self.botoes:
+            pares.append((btn, {"style": estilo_botoes}))
+        return pares
+
+    def propriedades_dimensoes(self):
+        """Propriedades que dependem do tamanho da janela (ver update_dimensions)."""
+        pares = [
+            (self.logo, {"width": self.logo_size, "height": self.logo_size}),
+            (self.barra_progresso_container, {"width": self.progress_bar_width}),
+            (self.botoes_controle, {"spacing": self.button_spacing}),
+            (self.botoes_navegacao, {"spacing": self.button_spacing}),
+        ]
+        pares.extend(self.mostrador.propriedades(tamanho=self.contador_size))
+        for btn, icon_widget, width_multiplier in self.botoes:
+            pares.append((btn, {"width": self.button_width * width_multiplier, "height": self.button_height}))
+            pares.append((icon_widget, {"size": self.button_height}))
+        return pares
+
+    def aplicar(self, pares):
+        """Aplica pares (controle, propriedades) pelo atualizador: só o que mudou é enviado."""
+        for controle, propriedades in pares:
+            self.atualizador.definir(controle, **propriedades)
+
     def create_button(self, text, icon, on_click, width_multiplier=1, tooltip=""):
         if isinstance(icon, str):
             icon_widget = ft.Text(value=icon, size=self.button_height)
@@ -324,26 +428,14 @@ class CronometroControl(ft.UserControl):
             on_click=on_click,
             width=self.button_width * width_multiplier,
             height=self.button_height,
-            bgcolor=self.button_color,
-            color=self.button_text_color,
             tooltip=tooltip,
             animate_opacity=True,
-            style=ft.ButtonStyle(
-                shape=ft.RoundedRectangleBorder(radius=20),
-                padding=ft.padding.symmetric(horizontal=10, vertical=8),
-                overlay_color=ft.colors.TRANSPARENT
-            )
-        )
-        btn_container = ft.Container(
-            content=btn,
-            shadow=ft.BoxShadow(
-                spread_radius=4,
-                blur_radius=25,
-                color=ft.colors.BLACK26,
-                offset=ft.Offset(2, 4)
-            )
+            style=obter_estilo("botao_cronometro", self.theme)  # cores do tema no próprio estilo
         )
+        btn_container = ft.Container(content=btn, shadow=obter_estilo("sombra_botao_cronometro"))
         btn.on_hover = lambda e: self.animar_botao(btn_container, e.data == "true")
+        # Guarda o botão para atualizar cores e tamanhos sem recriá-lo
+        self.botoes.append((btn, icon_widget, width_multiplier))
         return btn_container
 
     def animar_botao(self, container, hover):
@@ -356,21 +448,10 @@ class CronometroControl(ft.UserControl):
                 minutos = int(minutos_input.value)
                 if minutos <= 0:
                     raise ValueError
-                self.cronometro.definir_duracao(minutos * 60)
-                self.contador_tempo.value = f"{minutos:02}:00"
-                self.tempo_configurado = minutos
-                self.tempo_configurado_texto.value = f"Tempo: {self.tempo_configurado} minutos"
-                if minutos not in self.historico_tempos:
-                    self.historico_tempos.append(minutos)
                 dialog.open = False
-                self.page.show_snack_bar(
-                    ft.SnackBar(content=ft.Text(f"Cronômetro configurado para {minutos} minutos"), open=True)
-                )
-                self.page.update()
+                self.enviar("definir_duracao", minutos)
             except ValueError:
-                self.page.show_snack_bar(
-                    ft.SnackBar(content=ft.Text("Por favor, insira um valor válido de minutos."), open=True)
-                )
+                self.mostrar_mensagem("Por favor, insira um valor válido de minutos.")
         minutos_input = ft.TextField(
             label="Minutos",
             value=str(self.tempo_configurado),
@@ -398,19 +479,9 @@ class CronometroControl(ft.UserControl):
 
     def selecionar_tempo(self, valor):
         try:
-            minutos = int(valor.split()[0])
-            self.cronometro.definir_duracao(minutos * 60)
-            self.contador_tempo.value = f"{minutos:02}:00"
-            self.tempo_configurado = minutos
-            self.tempo_configurado_texto.value = f"Tempo: {self.tempo_configurado} minutos"
-            self.page.show_snack_bar(
-                ft.SnackBar(content=ft.Text(f"Cronômetro configurado para {minutos} minutos"), open=True)
-            )
-            self.page.update()
+            self.enviar("definir_duracao", int(valor.split()[0]))
         except Exception as ex:
-            self.page.show_snack_bar(
-                ft.SnackBar(content=ft.Text(f"Erro ao selecionar tempo: {str(ex)}"), open=True)
-            )
+            self.mostrar_mensagem(f"Erro ao selecionar tempo: {str(ex)}")
 
     def mostrar_atalhos(self, e):
         dialog = ft.AlertDialog(
@@ -429,198 +500,343 @@ class CronometroControl(ft.UserControl):
         dialog.open = True
         self.page.update()
 
+    def mostrar_mensagem(self, texto):
+        """Exibe uma SnackBar; dentro de um quadro, vai no mesmo envio que o resto."""
+        self.page.snack_bar = ft.SnackBar(content=ft.Text(texto), open=True)
+        self.atualizador.marcar(self.page)
+
     def enviar_notificacao(self):
-        self.page.show_snack_bar(
-            ft.SnackBar(content=ft.Text("Tempo esgotado!"), open=True)
-        )
-        self.tocar_som_fim()
+        # O som de fim já tocou no prazo (ver agendar_som_fim)
+        self.mostrar_mensagem("Tempo esgotado!")
 
     def tocar_som_inicio(self):
-        self.start_audio.play()
-
-    def tocar_som_fim(self):
-        self.end_audio.play()
+        self.sons.tocar("inicio")
+
+    def agendar_som_fim(self):
+        """Agenda o som de fim para o instante exato em que a contagem chega a zero."""
+        prazo = self.cronometro.prazo_final()
+        if prazo is not None:
+            # Pausar, parar ou reiniciar cancela o token e, com ele, o som
+            self.sons.agendar("fim", prazo, token=self.token_contagem)
+
+    def enviar(self, comando, *args, inicio=None):
+        """Enfileira um comando para a thread do agendador (não bloqueia)."""
+        self.agendador.agendar(0, self.executar_comando, comando, args, inicio)
+
+    def executar_comando(self, comando, args, inicio):
+        self.processar(comando, *args)
+        if inicio is not None:
+            self.latencias_atalhos.append(time.monotonic() - inicio)
+
+    def processar(self, comando, *args):
+        """
+        Processa um comando conforme a tabela de transições.
+
+        Roda sempre na thread do agendador, que é a única a alterar o estado
+        (Cronometro, pulso, token da contagem); por isso não há locks. Comandos
+        sem transição no estado atual são ignorados.
+        """
+        transicao = self.TRANSICOES.get((self.estado, comando)) or self.TRANSICOES.get(("*", comando))
+        if transicao is None:
+            self.comandos_ignorados += 1
+            return None
+
+        acao, destino = transicao
+        with self.atualizador.quadro():
+            try:
+                resultado = getattr(self, acao)(*args)
+            except Exception as ex:
+                self.mostrar_mensagem(f"Erro ao {comando}: {str(ex)}")
+                return None
+        if destino is not None:
+            self.estado = destino
+        self.comandos_processados += 1
+        return resultado
 
     def start_progress_timer(self):
-        def tick():
-            if self.stop_progress_timer:
-                return
-            self.atualizar_progresso()
-            threading.Timer(0.05, tick).start()
-        tick()
-
-    # Função de atualização de cores corrigida
-    def atualizar_cores_progresso(self, progresso):
-        # Transição de cores suave
-        if progresso < 0.5:
-            color1 = ft.colors.GREEN_ACCENT
-            color2 = ft.colors.LIGHT_GREEN_ACCENT_200
-        elif progresso < 0.75:
-            color1 = ft.colors.AMBER
-            color2 = ft.colors.DEEP_ORANGE_300
-        else:
-            color1 = ft.colors.RED_ACCENT_400
-            color2 = ft.colors.DEEP_ORANGE_ACCENT_700
-
-        # Atualiza gradiente com animação
-        self.barra_progresso_interna.gradient = ft.LinearGradient(
-            begin=ft.alignment.center_left,
-            end=ft.alignment.center_right,
-            colors=[color1, color2]
+        """Inicia uma nova contagem, cancelando tudo que a anterior deixou agendado."""
+        self.cancel_progress_timer()
+        self.token_contagem = TokenCancelamento()
+        self.tarefa_progresso = self.agendador.agendar_repetido(
+            self.INTERVALO_MINIMO, self.processar, "tick", token=self.token_contagem
         )
-        
-        # Efeito de pulso no indicador
-        if progresso > 0.9 and not self.pulsando:
-            self.barra_indicador.scale = 1.2
-            self.barra_indicador.update()
-            self.pulsando = True
-        elif progresso <= 0.9 and self.pulsando:
-            self.barra_indicador.scale = 1.0
-            self.barra_indicador.update()
-            self.pulsando = False
-
-        # Atualiza cor do texto
-        self.contador_tempo.color = color1
-
-    def hsl_to_rgb(self, h, s, l):
-        """Converte valores HSL para RGB"""
-        s /= 100
-        l /= 100
-        c = (1 - abs(2 * l - 1)) * s
-        x = c * (1 - abs((h / 60) % 2 - 1))
-        m = l - c / 2
-        if 0 <= h < 60:
-            r, g, b = c, x, 0
-        elif 60 <= h < 120:
-            r, g, b = x, c, 0
-        elif 120 <= h < 180:
-            r, g, b = 0, c, x
-        elif 180 <= h < 240:
-            r, g, b = 0, x, c
-        elif 240 <= h < 300:
-            r, g, b = x, 0, c
-        else:
-            r, g, b = c, 0, x
-        r = int((r + m) * 255)
-        g = int((g + m) * 255)
-        b = int((b + m) * 255)
-        return r, g, b
+
+    def cancel_progress_timer(self):
+        """Cancela o tick de progresso e o reinício pendente da contagem atual."""
+        self.token_contagem.cancelar()
+        self.tarefa_progresso = None
+
+    def obter_tabela_quadros(self):
+        """Retorna a tabela de quadros, reconstruindo-a se a duração ou a largura mudou."""
+        duracao = self.cronometro.duracao
+        if self.tabela_quadros is None or not self.tabela_quadros.corresponde(duracao, self.progress_bar_width):
+            self.tabela_quadros = TabelaQuadros(duracao, self.progress_bar_width)
+        return self.tabela_quadros
+
+    def obter_agenda(self):
+        """Retorna a agenda de avisos, recompilando-a se a duração ou os limiares mudaram."""
+        duracao = self.cronometro.duracao
+        if self.agenda is None or not self.agenda.corresponde(self.limiares, duracao):
+            self.agenda = AgendaEventos(self.limiares, duracao)
+            self.indice_evento = 0
+            decorrido = self.cronometro.tempo_decorrido()
+            if decorrido:
+                self.retomar_agenda(decorrido)
+        return self.agenda
+
+    def retomar_agenda(self, decorrido):
+        """
+        Posiciona o cursor da agenda recém-compilada no meio da contagem.
+
+        Os eventos já alcançados não disparam de novo, mas a tela recebe a
+        última faixa e o último pulso até 'decorrido'. O fim nunca é pulado:
+        se a nova duração já passou, ele fica pendente e dispara em seguida.
+        """
+        limiares = self.agenda.limiares[:self.agenda.posicao(decorrido)]
+        indice = next((i for i, limiar in enumerate(limiares) if limiar.acao == "esgotar"), len(limiares))
+        estado = dict(self.ACOES_ESTADO)
+        for limiar in limiares[:indice]:
+            if limiar.acao in estado:
+                estado[limiar.acao] = limiar.args
+        for acao, args in estado.items():
+            getattr(self, f"evento_{acao}")(*args)
+        self.indice_evento = indice
+
+    def agendar_eventos(self):
+        """Agenda o próximo aviso pendente no token da contagem atual."""
+        espera = self.obter_agenda().espera(self.indice_evento, self.cronometro.tempo_decorrido())
+        if espera is not None:
+            self.agendador.agendar(espera, self.processar, "evento", token=self.token_contagem)
+
+    def disparar_eventos(self):
+        """Dispara os avisos cujo instante já chegou e agenda o próximo."""
+        agenda = self.obter_agenda()
+        decorrido = self.cronometro.tempo_decorrido()
+        inicio = self.indice_evento
+        self.indice_evento, limiares = agenda.vencidos(inicio, decorrido)
+        agora = self.agendador.relogio()
+        for i, limiar in enumerate(limiares, inicio):
+            self.eventos_disparados.append((limiar, self.cronometro.tempo_inicial + agenda.instantes[i], agora))
+            getattr(self, f"evento_{limiar.acao}")(*limiar.args)
+        self.agendar_eventos()
+
+    def evento_faixa(self, faixa):
+        """Muda a cor da barra e do contador para a faixa de progresso."""
+        self.faixa_atual = faixa
+        self.atualizador.definir(self.barra_progresso_interna, gradient=self.gradientes_faixas[faixa])
+        self.mostrador.colorir(self.CORES_FAIXAS[faixa])
+
+    def evento_pulso(self, ligado):
+        if ligado and not self.pulsando:
+            self.iniciar_animacao_pulso()
+        elif not ligado and self.pulsando:
+            self.parar_animacao_pulso()
+
+    def evento_som(self, nome):
+        self.sons.tocar(nome)
+
+    def evento_gancho(self, funcao, *args):
+        funcao(self, *args)
+
+    def evento_esgotar(self):
+        # Encerra o tick; o fim é uma transição própria (rodando -> esgotado)
+        if self.tarefa_progresso is not None:
+            self.tarefa_progresso.cancelar()
+        self.enviar("esgotar")
 
     def atualizar_progresso(self):
         restante = self.cronometro.tempo_restante()
         if restante <= 0:
-            if not self.som_fim_tocado:
-                self.enviar_notificacao()
-                self.som_fim_tocado = True
-            def reiniciar_apos_delay():
-                try:
-                    self.reiniciar(None)
-                except Exception as ex:
-                    self.page.show_snack_bar(
-                        ft.SnackBar(content=ft.Text(f"Erro no reinício: {str(ex)}"), open=True)
-                    )
-            threading.Timer(5.0, reiniciar_apos_delay).start()
-            self.stop_progress_timer = True
-            return
-
-        progresso = 1 - (restante / self.cronometro.duracao)
-        nova_largura = self.progress_bar_width * progresso
-        
-        # Atualiza apenas se houver mudança relevante
-        if abs(nova_largura - self.barra_progresso_interna.width) > 1:
-            self.barra_progresso_interna.width = nova_largura
-            self.barra_indicador.left = min(nova_largura - 20, self.progress_bar_width - 40)
-            
-            self.atualizar_cores_progresso(progresso)
-            
-            self.barra_progresso_interna.update()
-            self.barra_indicador.update()
-            
-        # Atualização contínua do contador
-        self.contador_tempo.value = f"{int(restante//60):02}:{int(restante%60):02}"
-        self.contador_tempo.update()
+            # O fim (esgotar) é um evento da agenda; aqui só encerra o tick
+            self.tarefa_progresso.cancelar()
+            return None
+
+        # Consulta o quadro pré-calculado do segundo atual
+        texto, nova_largura = self.obter_tabela_quadros().quadro(int(restante))
+
+        # Cada controle só é enviado se a barra andou ou o segundo virou;
+        # as cores e o pulso mudam pelos eventos da agenda (ver disparar_eventos)
+        if not self.barra_animada_cliente:
+            # (com a barra animada pelo cliente, a largura já está sendo interpolada até o fim)
+            self.atualizador.definir(self.barra_progresso_interna, width=nova_largura)
+            self.atualizador.definir(
+                self.barra_indicador,
+                left=min(nova_largura - 20, self.progress_bar_width - 40)
+            )
+        self.mostrador.exibir(texto)
+
+        return self.calcular_proxima_espera(restante)
+
+    def definir_barra(self, largura, duracao_ms):
+        """Envia a largura alvo da barra e do indicador com uma animação linear de 'duracao_ms'."""
+        animacao = ft.animation.Animation(duracao_ms, "linear")
+        self.atualizador.definir(self.barra_progresso_interna, animate=animacao, width=largura)
+        self.atualizador.definir(
+            self.barra_indicador,
+            animate_position=animacao,
+            left=min(largura - 20, self.progress_bar_width - 40)
+        )
+
+    def animar_barra_ate_o_fim(self):
+        """Manda o cliente encher a barra ao longo de todo o tempo restante."""
+        if self.barra_animada_cliente:
+            restante = self.cronometro.tempo_restante()
+            self.definir_barra(self.progress_bar_width, int(restante * 1000))
+
+    def congelar_barra(self):
+        """Congela a barra na largura correspondente ao tempo decorrido."""
+        if self.barra_animada_cliente and self.cronometro.duracao:
+            progresso = 1 - self.cronometro.tempo_restante() / self.cronometro.duracao
+            self.definir_barra(self.progress_bar_width * progresso, 0)
+
+    def calcular_proxima_espera(self, restante):
+        """
+        Calcula quantos segundos faltam até a próxima mudança visível na tela.
+
+        Como os quadros são por segundo (texto e largura), a
+        próxima mudança é sempre a próxima virada de segundo do contador.
+        """
+        return (restante % 1.0 or 1.0) + self.MARGEM_PRAZO
 
     def iniciar_animacao_pulso(self):
         """Inicia a animação de pulso para alertar que o tempo está acabando."""
         self.pulsando = True
-        def animar():
-            while self.pulsando:
-                self.contador_tempo.opacity = 0.5
-                self.contador_tempo.scale = 1.05
-                self.contador_tempo.update()
-                time.sleep(0.5)
-                self.contador_tempo.opacity = 1
-                self.contador_tempo.scale = 1
-                self.contador_tempo.update()
-                time.sleep(0.5)
-        threading.Thread(target=animar, daemon=True).start()
+        self.pulso_contador.ativar()
+        self.pulso_indicador.ativar()
 
     def parar_animacao_pulso(self):
         """Para a animação de pulso e restaura os valores padrão."""
         self.pulsando = False
-        self.contador_tempo.opacity = 1
-        self.contador_tempo.scale = 1
-        self.contador_tempo.update()
+        self.pulso_contador.desativar()
+        self.pulso_indicador.desativar()
+
+    def _voltar_ao_inicio(self, mensagem):
+        self.mostrar_mensagem(mensagem)
+        self.mostrador.exibir(f"{int(self.tempo_configurado):02}:00")
+        self.mostrador.colorir(self.text_color)
+        self.definir_barra(0, self.DURACAO_TRANSICAO_BARRA)
+        self.atualizador.definir(self.barra_progresso_interna, gradient=self.gradientes_faixas[0])
+        self.indice_evento = 0
+        self.faixa_atual = None
+        self.cancel_progress_timer()
+        self.parar_animacao_pulso()
+
+    def _reiniciar(self):
+        self.cronometro.reiniciar()
+        self._voltar_ao_inicio("Cronômetro reiniciado")
+
+    def _iniciar(self):
+        self.cronometro.iniciar()
+        self.mostrar_mensagem("Cronômetro iniciado")
+        self.tocar_som_inicio()
+        self.atualizador.definir(self.contador_tempo, scale=1.2)
+        self.agendador.agendar(0.1, lambda: self.atualizador.definir(self.contador_tempo, scale=1))
+        self.start_progress_timer()
+        # Os avisos do instante zero (faixa 0) saem no mesmo quadro do início
+        self.disparar_eventos()
+        self.agendar_som_fim()
+        self.animar_barra_ate_o_fim()
+
+    def _pausar(self):
+        self.cronometro.pausar()
+        self.mostrar_mensagem("Cronômetro pausado")
+        self.cancel_progress_timer()
+        self.congelar_barra()
+
+    def _parar(self):
+        self.cronometro.parar()
+        self._voltar_ao_inicio("Cronômetro parado")
+
+    def _retomar(self):
+        self.cronometro.iniciar()
+        self.mostrar_mensagem("Cronômetro retomado")
+        self.start_progress_timer()
+        # O tempo decorrido desconta a pausa: os avisos pendentes andam junto
+        self.agendar_eventos()
+        self.agendar_som_fim()
+        self.animar_barra_ate_o_fim()
+
+    def _esgotar(self):
+        self.enviar_notificacao()
+        # O reinício automático fica preso ao token desta contagem
+        self.agendador.agendar(5.0, self.processar, "reiniciar", token=self.token_contagem)
+
+    def _definir_duracao(self, minutos):
+        self.cronometro.definir_duracao(minutos * 60)
+        self.obter_tabela_quadros()
+        self.obter_agenda()
+        self._reagendar_contagem()
+        if self.estado in ("rodando", "pausado"):
+            # No meio da contagem, o contador mostra o que resta na nova duração
+            self.mostrador.exibir(self.obter_tabela_quadros().quadro(int(self.cronometro.tempo_restante()))[0])
+        else:
+            self.mostrador.exibir(f"{minutos:02}:00")
+        self.tempo_configurado = minutos
+        self.atualizador.definir(self.tempo_configurado_texto, value=f"Tempo: {self.tempo_configurado} minutos")
+        self.atualizador.definir(self.botao_tempo, tooltip=self.dica_tempo())
+        if minutos not in self.historico_tempos:
+            self.historico_tempos.append(minutos)
+            self.atualizador.definir(
+                self.historico_dropdown,
+                options=[ft.dropdown.Option(f"{t} minutos") for t in sorted(self.historico_tempos)],
+                visible=not self.minimal_mode
+            )
+        self.mostrar_mensagem(f"Cronômetro configurado para {minutos} minutos")
+        # A animação em curso no cliente usava o tempo restante da duração anterior
+        self._sincronizar_barra()
+
+    def _definir_limiares(self, limiares):
+        """Troca os avisos da contagem; numa contagem em andamento, reagenda os pendentes."""
+        self.limiares = tuple(limiares)
+        self.obter_agenda()
+        self._reagendar_contagem()
+
+    def _reagendar_contagem(self):
+        """
+        Numa contagem em andamento, troca o token e reagenda o tick, os
+        avisos pendentes e o som de fim pelo prazo atual: o que estava
+        agendado valia para a duração ou os limiares anteriores. Se a nova
+        duração já passou, o fim dispara agora.
+        """
+        if self.estado == "rodando":
+            self.start_progress_timer()
+            self.disparar_eventos()
+            self.agendar_som_fim()
+
+    def _redimensionar(self):
+        self.update_dimensions()
+        self.aplicar(self.propriedades_dimensoes())
+        self._sincronizar_barra()
+
+    def _alternar_tema(self):
+        self.theme = "Claro" if self.theme == "Escuro" else "Escuro"
+        self.apply_theme()
+        self.aplicar(self.propriedades_tema())
+
+    def _alternar_modo(self):
+        self.minimal_mode = not self.minimal_mode
+        self.aplicar(self.propriedades_modo())
+
+    def _sincronizar_barra(self):
+        if self.estado == "rodando":
+            self.animar_barra_ate_o_fim()
+        elif self.estado == "pausado":
+            self.congelar_barra()
+
+    def _encerrar(self):
+        """Para a contagem sem tocar nos controles (a tela está sendo fechada)."""
+        if self.cronometro.em_andamento:
+            self.cronometro.parar()
+        self.cancel_progress_timer()
 
     def reiniciar(self, e):
-        try:
-            self.cronometro.reiniciar()
-            self.page.show_snack_bar(
-                ft.SnackBar(content=ft.Text("Cronômetro reiniciado"), open=True)
-            )
-            self.contador_tempo.value = f"{int(self.tempo_configurado):02}:00"
-            self.contador_tempo.color = self.text_color
-            self.contador_tempo.update()
-            self.barra_progresso_interna.width = 0
-            self.barra_progresso_interna.update()
-            self.barra_indicador.left = 0
-            self.barra_indicador.update()
-            self.som_fim_tocado = False
-            self.stop_progress_timer = True
-            time.sleep(0.05)
-            self.stop_progress_timer = False
-            self.parar_animacao_pulso()
-        except Exception as ex:
-            self.page.show_snack_bar(
-                ft.SnackBar(content=ft.Text(f"Erro ao reiniciar: {str(ex)}"), open=True)
-            )
-        self.page.update()
+        self.enviar("reiniciar")
 
     def iniciar(self, e):
-        try:
-            self.cronometro.iniciar()
-            self.page.show_snack_bar(
-                ft.SnackBar(content=ft.Text("Cronômetro iniciado"), open=True)
-            )
-            self.tocar_som_inicio()
-            self.som_fim_tocado = False
-            self.contador_tempo.scale = 1.2
-            self.contador_tempo.update()
-            time.sleep(0.1)
-            self.contador_tempo.scale = 1
-            self.contador_tempo.update()
-            self.stop_progress_timer = True
-            time.sleep(0.05)
-            self.stop_progress_timer = False
-            self.start_progress_timer()
-        except Exception as ex:
-            self.page.show_snack_bar(
-                ft.SnackBar(content=ft.Text(f"Erro ao iniciar: {str(ex)}"), open=True)
-            )
-        self.page.update()
+        self.enviar("iniciar")
 
     def pausar(self, e):
-        try:
-            self.cronometro.pausar()
-            self.page.show_snack_bar(
-                ft.SnackBar(content=ft.Text("Cronômetro pausado"), open=True)
-            )
-            self.stop_progress_timer = True
-        except Exception as ex:
-            self.page.show_snack_bar(
-                ft.SnackBar(content=ft.Text(f"Erro ao pausar: {str(ex)}"), open=True)
-            )
-        self.page.update()
+        self.enviar("pausar")
 
     def confirm_parar(self, e):
         """Exibe um pop-up de confirmação antes de parar o cronômetro."""
@@ -629,7 +845,7 @@ class CronometroControl(ft.UserControl):
             content=ft.Text("Deseja realmente parar o cronômetro?"),
             actions=[
                 ft.TextButton("Cancelar", on_click=lambda e: self.fechar_dialogo(e, dialog)),
-                ft.TextButton("Confirmar", on_click=lambda e: self.parar(e))
+                ft.TextButton("Confirmar", on_click=self.parar)
             ],
             actions_alignment=ft.MainAxisAlignment.END
         )
@@ -638,54 +854,19 @@ class CronometroControl(ft.UserControl):
         self.page.update()
 
     def parar(self, e):
-        try:
-            self.cronometro.parar()
-            self.page.show_snack_bar(
-                ft.SnackBar(content=ft.Text("Cronômetro parado"), open=True)
-            )
-            self.contador_tempo.value = f"{int(self.tempo_configurado):02}:00"
-            self.contador_tempo.color = self.text_color
-            self.contador_tempo.update()
-            self.barra_progresso_interna.width = 0
-            self.barra_progresso_interna.update()
-            self.barra_indicador.left = 0
-            self.barra_indicador.update()
-            self.som_fim_tocado = False
-            self.stop_progress_timer = True
-            self.parar_animacao_pulso()
-        except Exception as ex:
-            self.page.show_snack_bar(
-                ft.SnackBar(content=ft.Text(f"Erro ao parar: {str(ex)}"), open=True)
-            )
-        self.page.update()
+        self.enviar("parar")
 
     def retomar(self, e):
-        try:
-            self.cronometro.iniciar()
-            self.page.show_snack_bar(
-                ft.SnackBar(content=ft.Text("Cronômetro retomado"), open=True)
-            )
-            self.stop_progress_timer = True
-            time.sleep(0.05)
-            self.stop_progress_timer = False
-            self.start_progress_timer()
-        except Exception as ex:
-            self.page.show_snack_bar(
-                ft.SnackBar(content=ft.Text(f"Erro ao retomar: {str(ex)}"), open=True)
-            )
-        self.page.update()
+        self.enviar("retomar")
 
     def handle_key_event(self, e: ft.KeyboardEvent):
-        actions = {"enter": self.iniciar, " ": self.pausar, "r": self.reiniciar, "c": self.retomar}
-        if e.key.lower() in actions:
-            actions[e.key.lower()](e)
+        comando = self.ATALHOS.get(e.key.lower())
+        if comando:
+            # Só enfileira: o evento de teclado retorna na hora
+            self.enviar(comando, inicio=time.monotonic())
 
     def toggle_theme(self, e):
-        self.theme = "Claro" if self.theme == "Escuro" else "Escuro"
-        self.apply_theme()
-        self.page.clean()
-        self.page.add(self.build())
-        self.page.update()
+        self.enviar("alternar_tema")
 
     def toggle_full_screen(self, e):
         self.page.window.full_screen = not self.page.window.full_screen
@@ -693,20 +874,133 @@ class CronometroControl(ft.UserControl):
 
     def toggle_minimal_mode(self, e):
         """Alterna entre o modo completo e o modo minimalista."""
-        self.minimal_mode = not self.minimal_mode
-        self.page.clean()
-        self.page.add(self.build())
-        self.page.update()
+        self.enviar("alternar_modo")
 
     def voltar_menu(self, e):
-        if self.cronometro.em_andamento:
-            self.cronometro.parar()
-        self.stop_data_timer = True
-        self.stop_progress_timer = True
-        self.page.overlay.clear()
-        from menu_principal import mostrar_menu
-        mostrar_menu(self.page, self.usuario)
-
-    def voltar(self):
-        if self.on_voltar:
-            self.on_voltar()
+        # O roteador descarta esta tela (contagem, áudios, atalhos e inscrições)
+        roteador_da_pagina(self.page).ir("/menu")
+
+
+def mostrar_cronometro(page: ft.Page):
+    """Exibe a tela do cronômetro."""
+    roteador_da_pagina(page).ir("/cronometro")
+
+
+@rota("/cronometro", manter=False)
+def criar_tela_cronometro(page, usuario):
+    # A contagem pertence à visita: a tela não fica em cache
+    return CronometroControl(page, usuario).tela
+
+
+if __name__ == "__main__":
+    # Numa ft.Page de verdade sem cliente (o diff e a serialização do
+    # page.update() são os do Flet; o áudio vai à saída nula):
+    # 1. do atalho de teclado ao primeiro quadro enviado (Enter, Espaço, C e R),
+    #    com o agendador da página rodando na sua thread;
+    # 2. tempo, mensagens e bytes por alternância (tema, modo minimalista e
+    #    tamanho): árvore retida x o antigo page.clean() + build()
+    import asyncio
+    import json
+    import threading
+    import types
+
+    from flet_core.connection import Connection
+    from flet_core.protocol import CommandEncoder, PageCommandResponsePayload, PageCommandsBatchResponsePayload
+
+    from audio import CHAVE_SESSAO, SinaisSonoros, criar_saida
+
+    class ConexaoMedida(Connection):
+        """Conexão sem cliente: responde na hora e anota (instante, bytes, comandos) de cada lote."""
+
+        def __init__(self):
+            super().__init__()
+            self.lotes = []
+            self.novo_lote = threading.Event()
+            self._ids = 0
+
+        def send_command(self, session_id, command):
+            return PageCommandResponsePayload(result="", error="")
+
+        def send_commands(self, session_id, commands):
+            self.lotes.append((time.monotonic(), len(json.dumps(commands, cls=CommandEncoder)), commands))
+            self.novo_lote.set()
+            # Cada "add" devolve os ids dos controles criados, como o servidor do Flet
+            ids = []
+            for comando in commands:
+                if comando.name == "add":
+                    ids.append(" ".join(f"_{self._ids + i}" for i in range(len(comando.commands))))
+                    self._ids += len(comando.commands)
+            return PageCommandsBatchResponsePayload(results=ids, error="")
+
+    def medir_atalhos(conexao, pagina, rodadas=50):
+        latencias = {tecla: [] for tecla in ("Enter", " ", "C", "R")}
+        for _ in range(rodadas):
+            for tecla, lista in latencias.items():
+                enviados = len(conexao.lotes)
+                inicio = time.monotonic()
+                pagina.on_keyboard_event(types.SimpleNamespace(key=tecla))
+                # O quadro do comando é o primeiro lote com um controle novo (a
+                # SnackBar da mensagem); os ticks só alteram controles existentes
+                while True:
+                    conexao.novo_lote.clear()
+                    quadro = next((instante for instante, _, comandos in conexao.lotes[enviados:]
+                                   if any(c.name == "add" for c in comandos)), None)
+                    if quadro is not None:
+                        break
+                    if not conexao.novo_lote.wait(1):
+                        raise RuntimeError(f"Nenhum quadro após a tecla {tecla!r}")
+                lista.append(quadro - inicio)
+                time.sleep(0.02)
+        print("Atalho -> primeiro quadro enviado:")
+        for tecla, lista in latencias.items():
+            lista.sort()
+            print(f"  {tecla!r:>7}: mediana {1000 * lista[len(lista) // 2]:.2f} ms  "
+                  f"p95 {1000 * lista[int(len(lista) * 0.95)]:.2f} ms  máxima {1000 * lista[-1]:.2f} ms")
+
+    # Alternância -> (comando na árvore retida, a mesma mudança feita à mão antes de reconstruir)
+    ALTERNANCIAS = {
+        "tema": ("alternar_tema", lambda c: setattr(c, "theme", "Claro" if c.theme == "Escuro" else "Escuro")),
+        "modo": ("alternar_modo", lambda c: setattr(c, "minimal_mode", not c.minimal_mode)),
+        "tamanho": ("redimensionar", lambda c: None),  # criar_layout já relê o tamanho da janela
+    }
+
+    def medir_alternancias(conexao, controle, vezes=200):
+        print(f"Por alternância ({vezes} de cada):")
+        for nome, (comando, mudar) in ALTERNANCIAS.items():
+            for caminho in ("retida", "reconstruída"):
+                controle.atualizador.zerar_instrumentacao()
+                enviados = len(conexao.lotes)
+                inicio = time.perf_counter()
+                for _ in range(vezes):
+                    if nome == "tamanho":
+                        # O cliente avisou um novo tamanho de janela
+                        controle.page.window.width = 2800 - controle.page.window.width
+                    if caminho == "retida":
+                        controle.processar(comando)
+                    else:
+                        # Como antes: troca a árvore inteira por uma nova
+                        mudar(controle)
+                        controle.layout, controle.botoes = None, []
+                        controle.tela.view.controls[:] = [controle.build()]
+                        controle.page.update()
+                decorrido = time.perf_counter() - inicio
+                lotes = conexao.lotes[enviados:]
+                linha = (f"  {nome:>7} {caminho:>12}: {1000 * decorrido / vezes:.2f} ms  "
+                         f"{len(lotes) / vezes:.1f} mensagens  {sum(b for _, b, _ in lotes) / vezes:.0f} bytes")
+                if caminho == "retida":
+                    linha += (f"  (atualizador: {controle.atualizador.mensagens_enviadas / vezes:.1f} mensagens, "
+                              f"{controle.atualizador.bytes_estimados / vezes:.0f} bytes estimados)")
+                print(linha)
+
+    conexao = ConexaoMedida()
+    pagina = ft.Page(conexao, "medicao", loop=asyncio.new_event_loop())
+    pagina.window.width, pagina.window.height = 1600, 900
+    agendador = agendador_da_pagina(pagina)
+    pagina.session.set(CHAVE_SESSAO, SinaisSonoros(pagina, agendador, criar_saida(pagina, tipo="nula")))
+    roteador_da_pagina(pagina).usuario = "medicao"
+    mostrar_cronometro(pagina)
+
+    medir_atalhos(conexao, pagina)
+    # Sem agendador, nenhum tick ou relógio entra nas medidas das alternâncias
+    agendador.descartar()
+    medir_alternancias(conexao, pagina.on_keyboard_event.__self__)
@@ -0,0 +1,97 @@
+import threading
+from datetime import datetime, timezone, timedelta
+
+from agendador import agendador_da_pagina
+
+CHAVE_SESSAO = "data_hora"
+FUSO_HORARIO = timezone(timedelta(hours=-3))
+
+
+class PublicadorDataHora:
+    """
+    Relógio de parede compartilhado pelas telas da página.
+
+    Uma única tarefa repetida no agendador formata a linha de data/hora
+    uma vez por segundo, alinhada à virada do segundo, e a envia a todos
+    os ft.Text inscritos. A parte da data ("%d de %B de %Y") só é
+    formatada de novo quando o dia muda; a hora é montada direto dos campos.
+
+    A tarefa só existe enquanto houver inscritos.
+    """
+
+    # Acorda um pouco depois da virada, e não um instante antes
+    MARGEM = 0.005
+
+    def __init__(self, agendador, fuso=FUSO_HORARIO):
+        self.agendador = agendador
+        self.fuso = fuso
+        self._inscritos = {}  # id(texto) -> (texto, atualizador ou None)
+        self._trava = threading.Lock()
+        self._tarefa = None
+        self._dia = None
+        self._prefixo = ""
+
+        # Instrumentação
+        self.publicacoes = 0
+        self.datas_formatadas = 0
+
+    def agora(self):
+        return datetime.now(self.fuso)
+
+    def formatar(self, instante):
+        if instante.date() != self._dia:
+            self._dia = instante.date()
+            self._prefixo = instante.strftime("%d de %B de %Y, ")
+            self.datas_formatadas += 1
+        return f"{self._prefixo}{instante.hour:02}:{instante.minute:02}:{instante.second:02}"
+
+    def texto_atual(self):
+        return self.formatar(self.agora())
+
+    def inscrever(self, texto, atualizador=None):
+        """
+        Passa a atualizar texto.value a cada segundo.
+
+        Com um AtualizadorControles, o envio passa por ele (e entra no quadro
+        corrente, se houver); sem ele, é feito com texto.update().
+        """
+        texto.value = self.texto_atual()
+        with self._trava:
+            self._inscritos[id(texto)] = (texto, atualizador)
+            if self._tarefa is None:
+                self._tarefa = self.agendador.agendar_repetido(
+                    1.0, self._publicar, atraso=self._ate_proximo_segundo()
+                )
+
+    def cancelar_inscricao(self, texto):
+        with self._trava:
+            self._inscritos.pop(id(texto), None)
+            if not self._inscritos and self._tarefa is not None:
+                self._tarefa.cancelar()
+                self._tarefa = None
+
+    def _ate_proximo_segundo(self):
+        return 1 - self.agora().microsecond / 1_000_000 + self.MARGEM
+
+    def _publicar(self):
+        valor = self.texto_atual()
+        with self._trava:
+            inscritos = list(self._inscritos.values())
+        for texto, atualizador in inscritos:
+            if atualizador is not None:
+                atualizador.definir(texto, value=valor)
+            else:
+                texto.value = valor
+                texto.update()
+        self.publicacoes += 1
+        # Próxima execução na próxima virada de segundo
+        return self._ate_proximo_segundo()
+
+
+def publicador_data_hora(page):
+    """Retorna o relógio de parede da página, criando-o na primeira chamada."""
+    publicador = page.session.get(CHAVE_SESSAO)
+    if publicador is None:
+        publicador = PublicadorDataHora(agendador_da_pagina(page))
+        page.session.set(CHAVE_SESSAO, publicador)
+    return publicador
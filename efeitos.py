@@ -0,0 +1,47 @@
+import flet as ft
+
+
+class EfeitoPulso:
+    """
+    Efeito de pulso/alerta declarativo.
+
+    Em vez de uma thread alternando opacidade e escala, uma única mudança de
+    estado envia o alvo junto com animate_opacity/animate_scale e o cliente
+    anima sozinho (a curva elástica dá o "pulo" do alerta). O custo no
+    servidor é uma mensagem para ativar e outra para desativar.
+    """
+
+    def __init__(self, atualizador, controle, escala=1.05, opacidade=1.0, duracao=1200, curva="elasticOut"):
+        self.atualizador = atualizador
+        self.controle = controle
+        self.escala = escala
+        self.opacidade = opacidade
+        self.animacao = ft.animation.Animation(duracao, curva)
+        # Animações originais, restauradas ao desativar
+        self.animacao_escala_original = controle.animate_scale
+        self.animacao_opacidade_original = controle.animate_opacity
+        self.ativo = False
+
+    def ativar(self):
+        if self.ativo:
+            return
+        self.ativo = True
+        self.atualizador.definir(
+            self.controle,
+            animate_scale=self.animacao,
+            animate_opacity=self.animacao,
+            scale=self.escala,
+            opacity=self.opacidade
+        )
+
+    def desativar(self):
+        if not self.ativo:
+            return
+        self.ativo = False
+        self.atualizador.definir(
+            self.controle,
+            animate_scale=self.animacao_escala_original,
+            animate_opacity=self.animacao_opacidade_original,
+            scale=1,
+            opacity=1
+        )
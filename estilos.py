@@ -0,0 +1,268 @@
+import colorsys
+import threading
+
+import flet as ft
+
+_FABRICAS = {}  # nome -> (fábrica, por_tema)
+_estilos = {}  # (nome, tema) -> objeto
+_trava = threading.Lock()
+_contadores = {"criados": 0, "reutilizados": 0}
+
+
+def estilo(nome, por_tema=False):
+    """
+    Registra a fábrica de um estilo compartilhado.
+
+    A fábrica recebe o tema ("Claro"/"Escuro") se por_tema=True e não
+    recebe nada caso contrário. Ver obter_estilo.
+    """
+    def registrar(fabrica):
+        _FABRICAS[nome] = (fabrica, por_tema)
+        return fabrica
+    return registrar
+
+
+def obter_estilo(nome, tema=None):
+    """
+    Retorna o objeto de estilo (sombra, ButtonStyle, gradiente...) 'nome'.
+
+    Cada estilo é criado uma única vez por processo (e por tema, nos
+    estilos por tema) e o mesmo objeto é reaproveitado por todos os
+    controles de todas as telas e páginas; por isso ele não deve ser
+    alterado depois de obtido.
+
+    Atenção com ElevatedButton: ao ser enviado, ele mistura seus próprios
+    color/bgcolor/elevation ao style (a 0.24 preenche os campos vazios, a
+    0.25 sobrescreve os do estilo). Por isso os ButtonStyle de botões
+    elevados já trazem essas cores, e os botões não as recebem.
+    """
+    fabrica, por_tema = _FABRICAS[nome]
+    chave = (nome, tema if por_tema else None)
+    objeto = _estilos.get(chave)
+    if objeto is not None:
+        _contadores["reutilizados"] += 1
+        return objeto
+    with _trava:
+        objeto = _estilos.get(chave)
+        if objeto is None:
+            objeto = fabrica(tema) if por_tema else fabrica()
+            _estilos[chave] = objeto
+            _contadores["criados"] += 1
+    return objeto
+
+
+def contar_estilos():
+    """Retorna (estilos criados, reutilizações) desde o início do processo."""
+    return _contadores["criados"], _contadores["reutilizados"]
+
+
+def _sombra(espalhamento, desfoque, cor, x, y):
+    return ft.BoxShadow(spread_radius=espalhamento, blur_radius=desfoque, color=cor, offset=ft.Offset(x, y))
+
+
+# =============================================================================
+#                  Rampa de cores da barra de progresso
+# =============================================================================
+
+# Matiz do verde (0% da contagem) ao vermelho (100%), com saturação e
+# luminosidade fixas; um passo por ponto percentual.
+MATIZ_INICIAL = 130
+MATIZ_FINAL = 0
+PASSOS_RAMPA = 100
+
+
+def _cor_rampa(fracao, saturacao=0.9, luminosidade=0.5):
+    matiz = (MATIZ_INICIAL + (MATIZ_FINAL - MATIZ_INICIAL) * fracao) / 360
+    r, g, b = colorsys.hls_to_rgb(matiz, luminosidade, saturacao)
+    return f"#{round(r * 255):02x}{round(g * 255):02x}{round(b * 255):02x}"
+
+
+# Tabela pré-calculada: RAMPA_PROGRESSO[p] é a cor com p% da contagem decorrida
+RAMPA_PROGRESSO = tuple(_cor_rampa(p / PASSOS_RAMPA) for p in range(PASSOS_RAMPA + 1))
+
+
+def gradiente_rampa(ate, paradas=5):
+    """
+    Gradiente horizontal da barra de progresso, do início da rampa até a
+    fração 'ate', com 'paradas' cores consultadas em RAMPA_PROGRESSO.
+
+    Os gradientes são compartilhados como os demais estilos (um por 'ate').
+    """
+    chave = f"gradiente_rampa:{ate}:{paradas}"
+    if chave not in _FABRICAS:
+        fim = round(ate * PASSOS_RAMPA)
+        estilo(chave)(lambda: ft.LinearGradient(
+            begin=ft.alignment.center_left,
+            end=ft.alignment.center_right,
+            colors=[RAMPA_PROGRESSO[fim * i // (paradas - 1)] for i in range(paradas)],
+        ))
+    return obter_estilo(chave)
+
+
+# =============================================================================
+#                                Cronômetro
+# =============================================================================
+
+@estilo("fundo_cronometro", por_tema=True)
+def _fundo_cronometro(tema):
+    if tema == "Escuro":
+        cores = [ft.colors.BLUE_GREY_900, ft.colors.BLUE_GREY_700]
+    else:
+        cores = [ft.colors.LIGHT_BLUE_100, ft.colors.WHITE]
+    return ft.LinearGradient(begin=ft.Alignment(0, -1), end=ft.Alignment(0, 1), colors=cores)
+
+
+@estilo("botao_cronometro", por_tema=True)
+def _botao_cronometro(tema):
+    if tema == "Escuro":
+        fundo, texto = ft.colors.BLUE_GREY_700, ft.colors.WHITE
+    else:
+        fundo, texto = ft.colors.BLUE_GREY_300, ft.colors.BLACK
+    return ft.ButtonStyle(
+        color=texto,
+        bgcolor=fundo,
+        shape=ft.RoundedRectangleBorder(radius=20),
+        padding=ft.padding.symmetric(horizontal=10, vertical=8),
+        overlay_color=ft.colors.TRANSPARENT
+    )
+
+
+@estilo("sombra_botao_cronometro")
+def _sombra_botao_cronometro():
+    return _sombra(4, 25, ft.colors.BLACK26, 2, 4)
+
+
+@estilo("sombra_barra")
+def _sombra_barra():
+    return _sombra(1, 15, ft.colors.BLACK54, 0, 3)
+
+
+@estilo("sombra_indicador")
+def _sombra_indicador():
+    return _sombra(2, 15, ft.colors.BLACK54, 0, 3)
+
+
+@estilo("sombra_caixa_contador")
+def _sombra_caixa_contador():
+    return _sombra(5, 20, ft.colors.BLACK26, 0, 4)
+
+
+@estilo("sombra_cronometro")
+def _sombra_cronometro():
+    return _sombra(5, 25, ft.colors.BLACK26, 2, 4)
+
+
+# =============================================================================
+#                             Demais telas
+# =============================================================================
+
+@estilo("botao_menu")
+def _botao_menu():
+    return ft.ButtonStyle(
+        color=ft.colors.WHITE,
+        bgcolor=ft.colors.BLUE_GREY_700,
+        shape=ft.RoundedRectangleBorder(radius=25),
+        padding=ft.padding.symmetric(horizontal=25, vertical=18),
+        elevation=6,
+        overlay_color=ft.colors.WHITE10,
+        animation_duration=300,
+    )
+
+
+@estilo("sombra_botao_menu")
+def _sombra_botao_menu():
+    return _sombra(5, 15, ft.colors.BLACK12, 2, 5)
+
+
+@estilo("sombra_menu")
+def _sombra_menu():
+    return _sombra(10, 25, ft.colors.BLACK26, 4, 8)
+
+
+@estilo("botao_login")
+def _botao_login():
+    return ft.ButtonStyle(
+        color=ft.colors.WHITE,
+        bgcolor=ft.colors.BLUE_ACCENT,
+        shape=ft.RoundedRectangleBorder(radius=15),
+        elevation=10,
+        overlay_color=ft.colors.LIGHT_BLUE_200,
+        animation_duration=300,
+    )
+
+
+@estilo("sombra_login")
+def _sombra_login():
+    return _sombra(12, 30, ft.colors.BLACK26, 2, 5)
+
+
+@estilo("sombra_configuracoes")
+def _sombra_configuracoes():
+    return _sombra(2, 15, ft.colors.BLACK, 2, 2)
+
+
+@estilo("botao_usuarios")
+def _botao_usuarios():
+    return ft.ButtonStyle(
+        color=ft.colors.WHITE,
+        bgcolor=ft.colors.BLUE_GREY_700,
+        shape=ft.RoundedRectangleBorder(radius=20),
+        padding=ft.padding.symmetric(horizontal=20, vertical=15)
+    )
+
+
+@estilo("botao_excluir")
+def _botao_excluir():
+    return ft.ButtonStyle(bgcolor=ft.colors.RED_300)
+
+
+@estilo("sombra_usuarios")
+def _sombra_usuarios():
+    return _sombra(2, 15, ft.colors.BLACK26, 2, 2)
+
+
+@estilo("cartao_usuario_padding")
+def _cartao_usuario_padding():
+    return ft.Padding(10, 10, 10, 10)
+
+
+@estilo("cartao_usuario_margem")
+def _cartao_usuario_margem():
+    return ft.margin.symmetric(vertical=5)
+
+
+if __name__ == "__main__":
+    # Alocações e tempo para montar os estilos de 1000 botões: por botão x registro
+    import time
+    import tracemalloc
+
+    def montar_por_botao():
+        return [
+            (
+                ft.ButtonStyle(
+                    shape=ft.RoundedRectangleBorder(radius=20),
+                    padding=ft.padding.symmetric(horizontal=10, vertical=8),
+                    overlay_color=ft.colors.TRANSPARENT
+                ),
+                _sombra(4, 25, ft.colors.BLACK26, 2, 4),
+            )
+            for _ in range(1000)
+        ]
+
+    def montar_pelo_registro():
+        return [
+            (obter_estilo("botao_cronometro", "Claro"), obter_estilo("sombra_botao_cronometro"))
+            for _ in range(1000)
+        ]
+
+    for nome, montar in (("por botão", montar_por_botao), ("registro", montar_pelo_registro)):
+        tracemalloc.start()
+        inicio = time.perf_counter()
+        estilos = montar()
+        decorrido = time.perf_counter() - inicio
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        distintos = len({id(objeto) for par in estilos for objeto in par})
+        print(f"{nome:>10}: {1000 * decorrido:.2f} ms  pico {pico / 1024:.1f} KiB  "
+              f"{distintos} objetos distintos")
+    print("estilos criados/reutilizados:", contar_estilos())
@@ -1,9 +1,11 @@
 import flet as ft
-import sqlite3
 import os
 import json
 from datetime import datetime
-from config import RUTA_LOGO, DATABASE_PATH
+from config import RUTA_LOGO
+from banco import banco_do_processo
+from telas import Tela, rota, roteador_da_pagina
+from estilos import obter_estilo
 
 # Caminho para o arquivo de configurações locais
 USER_PREFS_PATH = os.path.join(os.getcwd(), "user_prefs.json")
@@ -31,17 +33,19 @@ def limpar_usuario_lembrado():
 
 
 def login_page(page: ft.Page):
-    from menu_principal import mostrar_menu
+    roteador_da_pagina(page).ir("/login")
+
 
-    page.theme_mode = "light"
+@rota("/login")
+def criar_tela_login(page: ft.Page, _usuario=None):
+    from menu_principal import mostrar_menu
 
     def aplicar_tema():
-        page.bgcolor = ft.colors.WHITE
+        page.theme_mode = "light"
         for control in [usuario, senha]:
             control.border_color = ft.colors.BLUE_GREY_300
             control.color = ft.colors.BLACK
             control.bgcolor = ft.colors.BLUE_GREY_50
-        page.update()
 
     def exibir_mensagem(texto, sucesso=True):
         cor = ft.colors.GREEN if sucesso else ft.colors.RED
@@ -62,14 +66,10 @@ def login_page(page: ft.Page):
         if not usuario_input or not senha_input:
             return False, "Preencha todos os campos.", None
 
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
-        cursor.execute(
+        user = banco_do_processo().consultar_um(
             "SELECT usuario, senha, data_expiracao FROM usuarios WHERE usuario = ? AND senha = ?",
             (usuario_input, senha_input),
         )
-        user = cursor.fetchone()
-        conn.close()
 
         if user:
             try:
@@ -146,53 +146,44 @@ def login_page(page: ft.Page):
         on_click=login,
         width=400,
         height=55,
-        bgcolor=ft.colors.BLUE_ACCENT,
-        color=ft.colors.WHITE,
-        style=ft.ButtonStyle(
-            shape=ft.RoundedRectangleBorder(radius=15),
-            elevation=10,
-            overlay_color=ft.colors.LIGHT_BLUE_200,
-            animation_duration=300,
-        ),
+        style=obter_estilo("botao_login"),
     )
 
     # Layout principal
-    page.clean()
-    page.add(
-        ft.Container(
-            content=ft.Column(
-                controls=[
-                    ft.Image(src=RUTA_LOGO, width=300, height=300, opacity=0.9),
-                    ft.Text(
-                        "Bem-vindo!",
-                        size=36,
-                        weight="bold",
-                        color=ft.colors.BLUE_GREY_900,
-                        text_align="center",
-                    ),
-                    usuario,
-                    senha,
-                    ft.Row(
-                        controls=[lembrar_senha],
-                        alignment=ft.MainAxisAlignment.CENTER,
-                    ),
-                    login_button,
-                ],
-                alignment=ft.MainAxisAlignment.CENTER,
-                horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-                spacing=20,
-                expand=True,
-            ),
-            padding=50,
-            border_radius=30,
-            shadow=ft.BoxShadow(
-                spread_radius=12,
-                blur_radius=30,
-                color=ft.colors.BLACK26,
-                offset=ft.Offset(2, 5),
-            ),
-            alignment=ft.alignment.center,
-        )
+    layout = ft.Container(
+        content=ft.Column(
+            controls=[
+                ft.Image(src=RUTA_LOGO, width=300, height=300, opacity=0.9),
+                ft.Text(
+                    "Bem-vindo!",
+                    size=36,
+                    weight="bold",
+                    color=ft.colors.BLUE_GREY_900,
+                    text_align="center",
+                ),
+                usuario,
+                senha,
+                ft.Row(
+                    controls=[lembrar_senha],
+                    alignment=ft.MainAxisAlignment.CENTER,
+                ),
+                login_button,
+            ],
+            alignment=ft.MainAxisAlignment.CENTER,
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+            spacing=20,
+            expand=True,
+        ),
+        padding=50,
+        border_radius=30,
+        shadow=obter_estilo("sombra_login"),
+        alignment=ft.alignment.center,
     )
 
-    aplicar_tema()
+    tela = Tela(
+        page,
+        "login",
+        view=ft.View("/login", controls=[layout], bgcolor=ft.colors.WHITE)
+    )
+    tela.ao_montar(aplicar_tema)
+    return tela
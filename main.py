@@ -4,6 +4,10 @@ from atualizador import Atualizador
 import threading
 import time
 from config import VERSAO_ATUAL
+from agendador import descartar_agendador
+from telas import descartar_roteador
+from banco import fechar_banco
+from migracoes import migrar
 
 def iniciar_verificador_atualizacoes(page):
     def verificar():
@@ -22,11 +26,18 @@ def iniciar_verificador_atualizacoes(page):
     thread = threading.Thread(target=verificar, daemon=True)
     thread.start()
 
+def encerrar_sessao(page):
+    descartar_roteador(page)
+    descartar_agendador(page)
+
 def main(page: ft.Page):
     # Configurações básicas
     page.title = f"Pomodoro Timer v{VERSAO_ATUAL}"
     page.window_full_screen = True
     page.theme_mode = ft.ThemeMode.DARK
+
+    # Libera as telas e o laço de agendamento da página ao encerrar a sessão
+    page.on_close = lambda e: encerrar_sessao(page)
     
     # Inicia verificador de atualizações
     iniciar_verificador_atualizacoes(page)
@@ -35,4 +46,8 @@ def main(page: ft.Page):
     login_page(page)
 
 if __name__ == "__main__":
-    ft.app(target=main, assets_dir="assets")
\ No newline at end of file
+    # Cria/atualiza o esquema do banco uma vez, antes da primeira sessão
+    migrar()
+    ft.app(target=main, assets_dir="assets")
+    # A conexão com o banco é do processo, e não de cada sessão
+    fechar_banco()
\ No newline at end of file
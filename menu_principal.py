@@ -1,10 +1,10 @@
 import flet as ft
-import threading
-import time
 import locale
 from config import RUTA_LOGO
-from datetime import datetime, timezone, timedelta
-from cronometro_app import CronometroControl
+from cronometro_app import mostrar_cronometro
+from renderizacao import AtualizadorControles
+from telas import Tela, rota, roteador_da_pagina
+from estilos import obter_estilo
 from verify_license import obter_validade_serial
 from configuracoes import configuracoes_page
 from usuarios import gerenciar_usuarios
@@ -13,42 +13,46 @@ locale.setlocale(locale.LC_TIME, 'pt_BR.UTF-8')
 
 def mostrar_menu(page: ft.Page, usuario):
     """Função principal que exibe o menu do aplicativo."""
+    roteador_da_pagina(page).ir("/menu", usuario)
 
-    page.theme_mode = "light"
-    page.bgcolor = None
-    page.title = "Menu Principal"
-    page.vertical_alignment = ft.MainAxisAlignment.CENTER
-    page.horizontal_alignment = ft.CrossAxisAlignment.CENTER
-    page.spacing = 0
 
-    page.theme = ft.Theme(
-        color_scheme_seed=ft.colors.BLUE_GREY,
-        visual_density=ft.VisualDensity.COMFORTABLE,
-    )
-    page.update()
+@rota("/menu")
+def criar_tela_menu(page: ft.Page, usuario):
+    """Monta a tela do menu uma única vez; ao voltar a ela, só o que muda é atualizado."""
 
-    def obter_data_hora():
-        now = datetime.now(timezone(timedelta(hours=-3)))
-        return now.strftime("%d de %B de %Y, %H:%M:%S")
+    def preparar_pagina():
+        page.theme_mode = "light"
+        page.title = "Menu Principal"
+        page.theme = ft.Theme(
+            color_scheme_seed=ft.colors.BLUE_GREY,
+            visual_density=ft.VisualDensity.COMFORTABLE,
+        )
 
-    def atualizar_data_hora():
-        while True:
-            time.sleep(1)
-            data_hora.value = obter_data_hora()
-            data_hora.update()
-            page.update()
+    # Agrupa as alterações de cada evento em um único envio ao cliente
+    atualizador = AtualizadorControles(page)
 
     def iniciar(e):
-        page.clean()
-        cronometro_control = CronometroControl(page, usuario, on_voltar=lambda: mostrar_menu(page, usuario))
-        page.add(cronometro_control)
+        mostrar_cronometro(page)
+
+    def abrir_configuracoes(e):
+        configuracoes_page(page, usuario)
+
+    def abrir_usuarios(e):
+        gerenciar_usuarios(page, usuario)
 
     def sair(e):
         page.window_close()
 
-    def handle_resize(e):
+    def handle_resize():
+        with atualizador.quadro():
+            ajustar_layout()
+            atualizador.marcar(main_container)
+
+    def ao_mostrar():
+        # A janela pode ter mudado de tamanho e a licença renovada enquanto a tela estava oculta
+        preparar_pagina()
+        validade_texto.value = f"Validade: {obter_validade_serial(usuario)}"
         ajustar_layout()
-        page.update()
 
     def ajustar_layout():
         largura_janela = page.window.width
@@ -65,17 +69,13 @@ def mostrar_menu(page: ft.Page, usuario):
             btn.content.width = button_width
             btn.content.height = button_height
 
-        main_container.update()
-
-    validade_serial = obter_validade_serial(usuario)
+    # O valor vem do relógio de parede ao montar a tela
     data_hora = ft.Text(
-        value=obter_data_hora(),
         size=22,
         color=ft.colors.BLUE_GREY_900,
         weight="bold"
     )
     validade_texto = ft.Text(
-        value=f"Validade: {validade_serial}",
         size=18,
         color=ft.colors.BLUE_GREY_900,
         weight="bold",
@@ -105,29 +105,16 @@ def mostrar_menu(page: ft.Page, usuario):
                 text=text,
                 icon=icon,
                 on_click=on_click,
-                bgcolor=ft.colors.BLUE_GREY_700,
-                color=ft.colors.WHITE,
-                style=ft.ButtonStyle(
-                    shape=ft.RoundedRectangleBorder(radius=25),
-                    padding=ft.padding.symmetric(horizontal=25, vertical=18),
-                    elevation=6,
-                    overlay_color=ft.colors.WHITE10,
-                    animation_duration=300,
-                ),
+                style=obter_estilo("botao_menu"),
                 tooltip=text
             ),
-            shadow=ft.BoxShadow(
-                spread_radius=5,
-                blur_radius=15,
-                color=ft.colors.BLACK12,
-                offset=ft.Offset(2, 5),
-            ),
+            shadow=obter_estilo("sombra_botao_menu"),
         )
 
     buttons = [
         create_button("Iniciar Cronômetro", ft.icons.PLAY_ARROW, iniciar),
-        create_button("Configurações", ft.icons.SETTINGS, lambda e: configuracoes_page(page)),
-        create_button("Gerenciar Usuários", ft.icons.PERSON, lambda e: gerenciar_usuarios(page, usuario)),
+        create_button("Configurações", ft.icons.SETTINGS, abrir_configuracoes),
+        create_button("Gerenciar Usuários", ft.icons.PERSON, abrir_usuarios),
         create_button("Sair", ft.icons.EXIT_TO_APP, sair)
     ]
 
@@ -162,21 +149,26 @@ def mostrar_menu(page: ft.Page, usuario):
         bgcolor=ft.colors.WHITE,
         border_radius=35,
         padding=40,
-        shadow=ft.BoxShadow(
-            spread_radius=10,
-            blur_radius=25,
-            color=ft.colors.BLACK26,
-            offset=ft.Offset(4, 8),
-        ),
+        shadow=obter_estilo("sombra_menu"),
         alignment=ft.alignment.center,
         width=900,
         height=600,
     )
 
-    page.clean()
-    page.add(main_container)
-
-    threading.Thread(target=atualizar_data_hora, daemon=True).start()
-    page.on_resize = handle_resize
-    ajustar_layout()
-    page.update()
+    tela = Tela(
+        page,
+        "menu",
+        view=ft.View(
+            "/menu",
+            controls=[main_container],
+            vertical_alignment=ft.MainAxisAlignment.CENTER,
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+            spacing=0
+        )
+    )
+    tela.ao_montar(ao_mostrar)
+    # Relógio e redimensionamento ficam presos à tela enquanto ela está montada
+    tela.data_hora(data_hora, atualizador)
+    # O serviço junta as rajadas de on_resize e chama handle_resize uma vez por rajada
+    tela.redimensionamento(handle_resize)
+    return tela
@@ -0,0 +1,200 @@
+import logging
+import sqlite3
+
+from banco import banco_do_processo
+
+
+def _criar_tabela_usuarios(cursor):
+    """Tabela de usuários, completando as colunas que faltem em bancos antigos."""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS usuarios (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            usuario TEXT NOT NULL,
+            senha TEXT NOT NULL,
+            admin INTEGER DEFAULT 0,  -- Adiciona a coluna admin para verificar privilégios
+            data_expiracao TEXT,
+            serial TEXT  -- Adiciona a coluna serial para gerenciar a ativação da licença
+        )
+    ''')
+
+    # Bancos criados antes dessas colunas existirem
+    cursor.execute("PRAGMA table_info(usuarios)")
+    columns = [column[1] for column in cursor.fetchall()]
+
+    if "admin" not in columns:
+        cursor.execute("ALTER TABLE usuarios ADD COLUMN admin INTEGER DEFAULT 0")
+
+    if "data_expiracao" not in columns:
+        cursor.execute("ALTER TABLE usuarios ADD COLUMN data_expiracao TEXT")
+
+    if "serial" not in columns:
+        cursor.execute("ALTER TABLE usuarios ADD COLUMN serial TEXT")
+
+
+def criar_indices_usuarios(cursor):
+    """
+    Índices da busca por usuário (login e validade) e por data de expiração.
+
+    O índice de usuario é único: além de evitar a varredura da tabela
+    inteira, impede cadastrar o mesmo nome duas vezes.
+    """
+    renomear_usuarios_duplicados(cursor)
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_usuarios_usuario ON usuarios (usuario)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_usuarios_data_expiracao ON usuarios (data_expiracao)")
+
+
+def renomear_usuarios_duplicados(cursor):
+    """
+    Prepara a tabela para o índice único em usuario.
+
+    A comparação é a mesma do login (sensível a maiúsculas: "Ana" e "ana"
+    continuam sendo usuários distintos). Em cada nome repetido, o cadastro
+    mais antigo (menor id) mantém o nome e os demais são renomeados para
+    "nome#id", sem apagar nenhum dado.
+    """
+    cursor.execute("""
+        SELECT id, usuario FROM usuarios
+        WHERE usuario IN (SELECT usuario FROM usuarios GROUP BY usuario HAVING COUNT(*) > 1)
+          AND id NOT IN (SELECT MIN(id) FROM usuarios GROUP BY usuario)
+    """)
+    for usuario_id, usuario in cursor.fetchall():
+        novo_nome = f"{usuario}#{usuario_id}"
+        while cursor.execute("SELECT 1 FROM usuarios WHERE usuario = ?", (novo_nome,)).fetchone():
+            novo_nome += f"#{usuario_id}"
+        cursor.execute("UPDATE usuarios SET usuario = ? WHERE id = ?", (novo_nome, usuario_id))
+        logging.warning("Usuário duplicado '%s' (id %s) renomeado para '%s'", usuario, usuario_id, novo_nome)
+
+
+def criar_busca_usuarios(cursor):
+    """
+    Índice FTS5 de trigramas sobre usuarios.usuario, para buscar qualquer
+    trecho do nome (LIKE '%x%' nunca usa índice e sempre varre a tabela).
+
+    É uma tabela de conteúdo externo, mantida em dia por gatilhos. Exige
+    SQLite 3.34+ com FTS5; sem isso a busca continua com LIKE. Retorna True
+    se o índice está disponível.
+    """
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'usuarios_busca'")
+    existia = cursor.fetchone() is not None
+    try:
+        cursor.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS usuarios_busca
+            USING fts5(usuario, content='usuarios', content_rowid='id', tokenize='trigram')
+        """)
+    except sqlite3.OperationalError:
+        logging.warning("SQLite sem FTS5/trigram: a busca de usuários usará LIKE")
+        return False
+
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS usuarios_busca_insercao AFTER INSERT ON usuarios BEGIN
+            INSERT INTO usuarios_busca (rowid, usuario) VALUES (new.id, new.usuario);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS usuarios_busca_exclusao AFTER DELETE ON usuarios BEGIN
+            INSERT INTO usuarios_busca (usuarios_busca, rowid, usuario) VALUES ('delete', old.id, old.usuario);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS usuarios_busca_alteracao AFTER UPDATE OF usuario ON usuarios BEGIN
+            INSERT INTO usuarios_busca (usuarios_busca, rowid, usuario) VALUES ('delete', old.id, old.usuario);
+            INSERT INTO usuarios_busca (rowid, usuario) VALUES (new.id, new.usuario);
+        END
+    """)
+    if not existia:
+        # Indexa os usuários que já estavam cadastrados
+        cursor.execute("INSERT INTO usuarios_busca (usuarios_busca) VALUES ('rebuild')")
+    return True
+
+
+# Migrações em ordem: depois de aplicar MIGRACOES[i], o banco fica na versão i + 1
+# (PRAGMA user_version). Só acrescente no fim; nunca altere uma já publicada.
+# A primeira é idempotente porque bancos anteriores ao versionamento (versão 0)
+# podem estar em qualquer um dos esquemas antigos.
+MIGRACOES = (
+    _criar_tabela_usuarios,
+    criar_indices_usuarios,
+    criar_busca_usuarios,
+)
+
+
+def versao_do_esquema(banco):
+    return banco.consultar_um("PRAGMA user_version")[0]
+
+
+def migrar(banco=None):
+    """
+    Leva o esquema do banco à versão atual (len(MIGRACOES)) e a retorna.
+
+    Com o esquema em dia, o custo é uma leitura de PRAGMA user_version.
+    As migrações pendentes rodam numa única transação, junto com a nova
+    versão: ou todas são aplicadas, ou nenhuma.
+    """
+    banco = banco or banco_do_processo()
+    versao = versao_do_esquema(banco)
+    if versao >= len(MIGRACOES):
+        return versao
+
+    with banco.transacao():
+        cursor = banco.conexao.cursor()
+        for indice in range(versao, len(MIGRACOES)):
+            MIGRACOES[indice](cursor)
+        # PRAGMA não aceita parâmetros; a versão é um inteiro nosso
+        cursor.execute(f"PRAGMA user_version = {len(MIGRACOES)}")
+    logging.info("Esquema do banco migrado da versão %s para %s", versao, len(MIGRACOES))
+    return len(MIGRACOES)
+
+
+if __name__ == "__main__":
+    # Partida a frio: verificação antiga (a cada import do config) x migrar() com o esquema em dia
+    import os
+    import tempfile
+    import time
+
+    from banco import Banco
+
+    caminho = os.path.join(tempfile.mkdtemp(), "bench.db")
+    banco = Banco(caminho)
+    inicio = time.perf_counter()
+    migrar(banco)
+    print(f"banco novo, todas as migrações: {1000 * (time.perf_counter() - inicio):.2f} ms")
+    with banco.transacao():
+        banco.conexao.executemany(
+            "INSERT INTO usuarios (usuario, senha, data_expiracao) VALUES (?, ?, '2030-01-01')",
+            ((f"usuario{i}", f"senha{i}") for i in range(50000)),
+        )
+    banco.fechar()
+
+    def verificacao_antiga():
+        # Como o import do config fazia: conecta, CREATE IF NOT EXISTS, table_info e índices
+        conn = sqlite3.connect(caminho)
+        cursor = conn.cursor()
+        for passo in MIGRACOES:
+            passo(cursor)
+        conn.commit()
+        conn.close()
+
+    def migracao_em_dia():
+        migrar(Banco(caminho))
+
+    consulta = "SELECT usuario, senha, data_expiracao FROM usuarios WHERE usuario = ? AND senha = ?"
+    for nome, partida in (("verificação antiga", verificacao_antiga), ("migrar() em dia", migracao_em_dia)):
+        tempos = []
+        for _ in range(20):
+            inicio = time.perf_counter()
+            partida()
+            tempos.append(time.perf_counter() - inicio)
+        tempos.sort()
+        print(f"{nome:>18}: partida {1000 * tempos[10]:.2f} ms (mediana de 20, 50 mil usuários)")
+
+    # Primeira consulta depois da partida: conexão nova x a que o migrar() já abriu
+    conn = sqlite3.connect(caminho)
+    inicio = time.perf_counter()
+    conn.execute(consulta, ("usuario42", "senha42")).fetchone()
+    print(f"primeira consulta, conexão nova: {1000 * (time.perf_counter() - inicio):.3f} ms")
+    conn.close()
+    banco = Banco(caminho)
+    migrar(banco)
+    inicio = time.perf_counter()
+    banco.consultar_um(consulta, ("usuario42", "senha42"))
+    print(f"primeira consulta após migrar(): {1000 * (time.perf_counter() - inicio):.3f} ms")
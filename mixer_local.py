@@ -0,0 +1,299 @@
+import logging
+import sys
+import threading
+import time
+import wave
+from array import array
+from collections import deque
+
+_mixer = None
+_trava_mixer = threading.Lock()
+
+
+def decodificar_wav(caminho, taxa, canais):
+    """
+    Decodifica um WAV PCM (8 ou 16 bits) para amostras int16 intercaladas,
+    convertidas para 'taxa' e 'canais'.
+
+    Lança wave.Error se o arquivo não for um WAV (RIFF).
+    """
+    with wave.open(caminho, "rb") as arquivo:
+        largura = arquivo.getsampwidth()
+        canais_origem = arquivo.getnchannels()
+        taxa_origem = arquivo.getframerate()
+        dados = arquivo.readframes(arquivo.getnframes())
+
+    if largura == 2:
+        amostras = array("h", dados)
+        if sys.byteorder == "big":
+            amostras.byteswap()
+    elif largura == 1:
+        amostras = array("h", ((b - 128) << 8 for b in dados))
+    else:
+        raise ValueError(f"WAV de {8 * largura} bits não suportado: {caminho}")
+
+    # Converte para mono e depois para o número de canais de saída
+    if canais_origem > 1:
+        amostras = array("h", (
+            sum(amostras[i:i + canais_origem]) // canais_origem
+            for i in range(0, len(amostras), canais_origem)
+        ))
+    if taxa_origem != taxa:
+        total = len(amostras) * taxa // taxa_origem
+        amostras = array("h", (amostras[i * taxa_origem // taxa] for i in range(total)))
+    if canais > 1:
+        amostras = array("h", (a for a in amostras for _ in range(canais)))
+    return amostras
+
+
+class SaidaNula:
+    """
+    Saída sem dispositivo de áudio (testes e máquinas sem som).
+
+    Consome os blocos no ritmo real de reprodução (ou na hora, com
+    tempo_real=False) e conta o que foi escrito.
+    """
+
+    # Duração (s) do silêncio que substitui os sons que a saída nula não decodifica
+    DURACAO_SILENCIO = 0.5
+
+    def __init__(self, taxa=44100, canais=2, tempo_real=True):
+        self.taxa = taxa
+        self.canais = canais
+        self.tempo_real = tempo_real
+        self._proximo = None
+        self.blocos_escritos = 0
+
+    def escrever(self, bloco):
+        self.blocos_escritos += 1
+        if not self.tempo_real:
+            return
+        agora = time.monotonic()
+        if self._proximo is None or self._proximo < agora:
+            # Saída ociosa: o bloco começa a "tocar" agora
+            self._proximo = agora
+        else:
+            time.sleep(self._proximo - agora)
+        self._proximo += len(bloco) / (self.taxa * self.canais)
+
+    def decodificar(self, caminho):
+        """Sem decodificador (ex.: MP3 com extensão .wav): o som vira um silêncio de duração fixa."""
+        return array("h", bytes(2 * int(self.taxa * self.DURACAO_SILENCIO) * self.canais))
+
+
+class SaidaPygame:
+    """
+    Saída pelo pygame.mixer (dependência opcional).
+
+    Os blocos já mixados vão para um único canal; cada bloco entra na fila
+    do canal assim que o anterior começa a tocar.
+    """
+
+    def __init__(self, taxa=44100, canais=2, quadro=256):
+        import pygame  # opcional: só é necessário com SAIDA_AUDIO = local
+
+        self.pygame = pygame
+        self.taxa = taxa
+        self.canais = canais
+        pygame.mixer.init(frequency=taxa, size=-16, channels=canais, buffer=quadro)
+        self.canal = pygame.mixer.Channel(0)
+        self.duracao_bloco = quadro / taxa
+
+    def decodificar(self, caminho):
+        """Decodifica qualquer formato suportado pelo SDL_mixer (ex.: MP3) no formato do mixer."""
+        return array("h", self.pygame.mixer.Sound(caminho).get_raw())
+
+    def escrever(self, bloco):
+        som = self.pygame.mixer.Sound(buffer=bloco.tobytes())
+        if not self.canal.get_busy():
+            self.canal.play(som)
+            return
+        while self.canal.get_queue() is not None:
+            time.sleep(self.duracao_bloco / 4)
+        self.canal.queue(som)
+
+
+class MixerLocal:
+    """
+    Mixer de áudio no próprio processo.
+
+    Os sons são decodificados para a memória uma única vez (carregar) e
+    uma thread dedicada soma as vozes ativas em blocos de 'quadro' amostras
+    por canal, entregando-os à saída. Disparar um som (tocar) só enfileira
+    a voz e acorda a thread, sem nenhuma ida e volta pelo websocket do
+    cliente Flet.
+
+    'latencias' guarda, para os últimos disparos, o tempo entre tocar() e a
+    entrega do primeiro bloco com a voz à saída.
+    """
+
+    def __init__(self, saida, taxa=44100, canais=2, quadro=256):
+        self.saida = saida
+        self.taxa = taxa
+        self.canais = canais
+        self.quadro = quadro
+        self._sons = {}
+        self._pendentes = deque()
+        self._vozes = []  # [amostras, posição, instante do disparo], só da thread do mixer
+        self._condicao = threading.Condition()
+        self._ativo = False
+        self._thread = None
+
+        # Instrumentação
+        self.latencias = deque(maxlen=100)
+        self.blocos_mixados = 0
+
+    def carregar(self, nome, origem):
+        """Carrega um som a partir de um arquivo ou de amostras int16 já decodificadas."""
+        if isinstance(origem, array):
+            self._sons[nome] = origem
+            return
+        try:
+            self._sons[nome] = decodificar_wav(origem, self.taxa, self.canais)
+        except wave.Error:
+            # Não é um WAV PCM (ex.: MP3 com extensão .wav): usa o decodificador da saída
+            decodificar = getattr(self.saida, "decodificar", None)
+            if decodificar is None:
+                raise ValueError(f"Formato de áudio não suportado sem pygame: {origem}")
+            self._sons[nome] = decodificar(origem)
+
+    def tocar(self, nome):
+        self._pendentes.append((self._sons[nome], time.monotonic()))
+        with self._condicao:
+            self._condicao.notify()
+
+    def preparar(self, nome):
+        # Os sons já estão decodificados na memória: nada a preparar
+        pass
+
+    def iniciar(self):
+        with self._condicao:
+            if self._ativo:
+                return
+            self._ativo = True
+            self._thread = threading.Thread(target=self._executar, name="mixer-local", daemon=True)
+        self._thread.start()
+
+    def parar(self):
+        with self._condicao:
+            self._ativo = False
+            self._condicao.notify()
+            thread = self._thread
+            self._thread = None
+        if thread and thread is not threading.current_thread():
+            thread.join()
+
+    def _executar(self):
+        tamanho = self.quadro * self.canais
+        while True:
+            with self._condicao:
+                while self._ativo and not self._vozes and not self._pendentes:
+                    self._condicao.wait()
+                if not self._ativo:
+                    return
+            novas = []
+            while self._pendentes:
+                amostras, instante = self._pendentes.popleft()
+                novas.append([amostras, 0, instante])
+            self._vozes.extend(novas)
+
+            try:
+                self.saida.escrever(self._mixar(tamanho))
+            except Exception:
+                logging.exception("Erro ao escrever na saída de áudio")
+            self.blocos_mixados += 1
+            agora = time.monotonic()
+            for voz in novas:
+                self.latencias.append(agora - voz[2])
+
+    def _mixar(self, tamanho):
+        """Soma o próximo bloco de cada voz ativa (com saturação em 16 bits)."""
+        if len(self._vozes) == 1:
+            voz = self._vozes[0]
+            bloco = voz[0][voz[1]:voz[1] + tamanho]
+            voz[1] += tamanho
+        else:
+            soma = [0] * tamanho
+            for voz in self._vozes:
+                trecho = voz[0][voz[1]:voz[1] + tamanho]
+                for i, amostra in enumerate(trecho):
+                    soma[i] += amostra
+                voz[1] += tamanho
+            bloco = array("h", (max(-32768, min(32767, v)) for v in soma))
+        self._vozes = [voz for voz in self._vozes if voz[1] < len(voz[0])]
+        if len(bloco) < tamanho:
+            bloco.extend(array("h", bytes(2 * (tamanho - len(bloco)))))
+        return bloco
+
+
+def mixer_do_processo(sons, nula=False):
+    """
+    Retorna o mixer local do processo (um só dispositivo de áudio para
+    todas as páginas), criando-o, carregando os sons e iniciando-o na
+    primeira chamada.
+    """
+    global _mixer
+    with _trava_mixer:
+        if _mixer is None:
+            saida = SaidaNula() if nula else SaidaPygame()
+            mixer = MixerLocal(saida)
+            for nome, caminho in sons.items():
+                mixer.carregar(nome, caminho)
+            mixer.iniciar()
+            _mixer = mixer
+        return _mixer
+
+
+if __name__ == "__main__":
+    # Latência do disparo: mixer local (até a entrega do bloco à saída nula) x
+    # players do Flet (até o comando sair para o websocket, sem cliente)
+    import asyncio
+    import math
+
+    import flet as ft
+    from flet_core.connection import Connection
+    from flet_core.protocol import PageCommandResponsePayload, PageCommandsBatchResponsePayload
+
+    from audio import PlayersFlet
+
+    def resumir(nome, latencias):
+        latencias = sorted(latencias)
+        print(f"{nome:>13}: {len(latencias)} disparos  mediana: {1000 * latencias[len(latencias) // 2]:.2f} ms  "
+              f"máxima: {1000 * latencias[-1]:.2f} ms")
+
+    class ConexaoMedida(Connection):
+        """Conexão sem cliente: anota o instante de cada comando enviado."""
+
+        def __init__(self):
+            super().__init__()
+            self.envios = []
+
+        def send_command(self, session_id, command):
+            self.envios.append(time.monotonic())
+            return PageCommandResponsePayload(result="", error="")
+
+        def send_commands(self, session_id, commands):
+            return PageCommandsBatchResponsePayload(results=[], error="")
+
+    mixer = MixerLocal(SaidaNula())
+    bipe = array("h", (
+        int(8000 * math.sin(2 * math.pi * 880 * i / 44100)) for i in range(4410) for _ in range(2)
+    ))
+    mixer.carregar("bipe", bipe)
+    mixer.iniciar()
+    for _ in range(50):
+        mixer.tocar("bipe")
+        time.sleep(0.05)
+    mixer.parar()
+    resumir("mixer local", mixer.latencias)
+
+    conexao = ConexaoMedida()
+    players = PlayersFlet(ft.Page(conexao, "medicao", loop=asyncio.new_event_loop()), {"bipe": "bipe.wav"})
+    latencias = []
+    for _ in range(50):
+        inicio = time.monotonic()
+        players.tocar("bipe")
+        latencias.append(conexao.envios[-1] - inicio)
+        time.sleep(0.05)
+    resumir("players Flet", latencias)
+    print("(no Flet ainda faltam o websocket até o cliente e o player do navegador/desktop)")
@@ -0,0 +1,138 @@
+import flet as ft
+
+
+class MostradorDigitos:
+    """
+    Contador MM:SS feito de células de largura fixa, uma por caractere.
+
+    Cada dígito é um ft.Text próprio dentro de um Container de largura
+    fixa, de modo que trocar um dígito não muda a largura da linha (sem
+    "tremida" horizontal com fontes proporcionais) e só os dígitos que
+    mudaram são enviados: na maior parte dos ticks, apenas o das unidades
+    de segundo; os minutos mudam uma vez por minuto.
+
+    'linha' é o controle a colocar no layout (e a receber escala, opacidade
+    e animações, como no EfeitoPulso).
+    """
+
+    # Largura das células em proporção ao tamanho da fonte
+    PROPORCAO_DIGITO = 0.62
+    PROPORCAO_SEPARADOR = 0.32
+
+    def __init__(self, atualizador, texto, tamanho, cor, peso="bold", **propriedades):
+        self.atualizador = atualizador
+        self.texto = texto
+        self.tamanho = tamanho
+        self.cor = cor
+        self.peso = peso
+        self.linha = ft.Row(
+            controls=[self._criar_celula(c) for c in texto],
+            spacing=0,
+            tight=True,
+            alignment=ft.MainAxisAlignment.CENTER,
+            **propriedades
+        )
+
+        # Instrumentação
+        self.digitos_enviados = 0
+        self.reconstrucoes = 0
+
+    def _largura(self, caractere):
+        proporcao = self.PROPORCAO_DIGITO if caractere.isdigit() else self.PROPORCAO_SEPARADOR
+        return self.tamanho * proporcao
+
+    def _criar_celula(self, caractere):
+        return ft.Container(
+            content=ft.Text(
+                value=caractere,
+                size=self.tamanho,
+                weight=self.peso,
+                color=self.cor,
+                text_align=ft.TextAlign.CENTER,
+            ),
+            width=self._largura(caractere),
+            alignment=ft.alignment.center,
+        )
+
+    def exibir(self, texto):
+        """Mostra o texto, enviando só as células cujo caractere mudou."""
+        anterior = self.texto
+        if texto == anterior:
+            return
+        self.texto = texto
+        if len(texto) != len(anterior) or any(
+            a.isdigit() != b.isdigit() for a, b in zip(texto, anterior)
+        ):
+            # Mudou o formato (ex.: passou de 99 para 100 minutos): remonta a linha
+            self.reconstrucoes += 1
+            for celula in self.linha.controls:
+                self.atualizador.esquecer(celula)
+                self.atualizador.esquecer(celula.content)
+            self.linha.controls = [self._criar_celula(c) for c in texto]
+            self.atualizador.marcar(self.linha)
+            return
+        for celula, a, b in zip(self.linha.controls, anterior, texto):
+            if a != b:
+                self.digitos_enviados += 1
+                self.atualizador.definir(celula.content, value=b)
+
+    def propriedades(self, tamanho=None, cor=None):
+        """
+        Pares (controle, propriedades) das células para um novo tamanho e/ou
+        cor, no formato aceito por CronometroControl.aplicar.
+        """
+        if tamanho is not None:
+            self.tamanho = tamanho
+        if cor is not None:
+            self.cor = cor
+        pares = []
+        for celula in self.linha.controls:
+            texto = {}
+            if tamanho is not None:
+                texto["size"] = tamanho
+                pares.append((celula, {"width": self._largura(celula.content.value)}))
+            if cor is not None:
+                texto["color"] = cor
+            pares.append((celula.content, texto))
+        return pares
+
+    def colorir(self, cor):
+        """Muda a cor de todos os dígitos (só as células de cor diferente são enviadas)."""
+        for controle, propriedades in self.propriedades(cor=cor):
+            self.atualizador.definir(controle, **propriedades)
+
+
+if __name__ == "__main__":
+    # Carga por tick de uma contagem de 10 minutos: um Text inteiro x células por dígito
+    from renderizacao import AtualizadorControles
+    from cronometro import TabelaQuadros
+
+    class PaginaMedida:
+        """Página que só conta os controles de cada envio."""
+
+        def __init__(self):
+            self.controles = 0
+
+        def update(self, *controles):
+            self.controles += len(controles)
+
+    quadros = TabelaQuadros(600, 1000)
+    textos = [quadros.quadro(s)[0] for s in range(600, -1, -1)]
+
+    pagina = PaginaMedida()
+    atualizador = AtualizadorControles(pagina)
+    texto_unico = ft.Text(value=textos[0])
+    for texto in textos[1:]:
+        atualizador.definir(texto_unico, value=texto)
+    print(f"Text único: {pagina.controles / 600:.2f} controles/tick  "
+          f"{atualizador.bytes_estimados / 600:.1f} bytes/tick")
+
+    pagina = PaginaMedida()
+    atualizador = AtualizadorControles(pagina)
+    mostrador = MostradorDigitos(atualizador, textos[0], 250, "white")
+    for texto in textos[1:]:
+        with atualizador.quadro():
+            mostrador.exibir(texto)
+    print(f"Dígitos:    {pagina.controles / 600:.2f} controles/tick  "
+          f"{atualizador.bytes_estimados / 600:.1f} bytes/tick  "
+          f"({mostrador.digitos_enviados} dígitos em 600 ticks)")
@@ -0,0 +1,89 @@
+import logging
+import threading
+
+from agendador import agendador_da_pagina
+
+CHAVE_SESSAO = "redimensionamento"
+
+
+class ServicoRedimensionamento:
+    """
+    Serviço de redimensionamento compartilhado pelas telas da página.
+
+    Arrastar a borda da janela gera dezenas de on_resize por segundo. O
+    serviço registra o único handler da página, junta a rajada e só chama
+    as telas inscritas quando os eventos param por 'espera' segundos — ou,
+    durante um arrasto contínuo, no máximo uma vez a cada 'espera_maxima'.
+
+    Os inscritos são chamados na thread do agendador da página, um após o
+    outro, e devem apenas recalcular as propriedades que dependem do tamanho
+    da janela (sem recriar controles).
+    """
+
+    def __init__(self, page, agendador, espera=0.1, espera_maxima=0.25):
+        self.page = page
+        self.agendador = agendador
+        self.espera = espera
+        self.espera_maxima = espera_maxima
+        self._inscritos = []
+        self._trava = threading.Lock()
+        self._primeiro_evento = None  # início da rajada pendente (None: nada pendente)
+        self._ultimo_evento = None
+
+        # Instrumentação
+        self.eventos_recebidos = 0
+        self.layouts_executados = 0
+
+        page.on_resize = self._ao_redimensionar
+
+    def inscrever(self, callback):
+        """Inscreve callback() para ser chamado após cada rajada de redimensionamento."""
+        with self._trava:
+            if callback not in self._inscritos:
+                self._inscritos.append(callback)
+        return callback
+
+    def cancelar_inscricao(self, callback):
+        with self._trava:
+            if callback in self._inscritos:
+                self._inscritos.remove(callback)
+
+    def _ao_redimensionar(self, e):
+        agora = self.agendador.relogio()
+        with self._trava:
+            self.eventos_recebidos += 1
+            self._ultimo_evento = agora
+            if self._primeiro_evento is not None:
+                # Já há uma verificação agendada para esta rajada
+                return
+            self._primeiro_evento = agora
+        self.agendador.agendar(self.espera, self._verificar)
+
+    def _verificar(self):
+        agora = self.agendador.relogio()
+        with self._trava:
+            parado_ha = agora - self._ultimo_evento
+            rajada_ha = agora - self._primeiro_evento
+            restante = min(self.espera - parado_ha, self.espera_maxima - rajada_ha)
+            if restante <= 0:
+                self._primeiro_evento = None
+                inscritos = list(self._inscritos)
+        if restante > 0:
+            self.agendador.agendar(restante, self._verificar)
+            return
+
+        self.layouts_executados += 1
+        for callback in inscritos:
+            try:
+                callback()
+            except Exception:
+                logging.exception("Erro ao ajustar layout")
+
+
+def servico_redimensionamento(page):
+    """Retorna o serviço de redimensionamento da página, criando-o na primeira chamada."""
+    servico = page.session.get(CHAVE_SESSAO)
+    if servico is None:
+        servico = ServicoRedimensionamento(page, agendador_da_pagina(page))
+        page.session.set(CHAVE_SESSAO, servico)
+    return servico
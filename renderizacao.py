@@ -0,0 +1,113 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+
+class AtualizadorControles:
+    """
+    Camada fina sobre os controles que só envia ao cliente o que mudou.
+
+    Guarda os últimos valores enviados de cada controle; se nenhuma das
+    propriedades informadas mudou, o update() não é chamado e a
+    atualização é contada como suprimida.
+
+    Dentro de um quadro (with atualizador.quadro():) os controles
+    alterados são apenas marcados e enviados juntos, em um único
+    page.update(), quando o quadro mais externo termina.
+    """
+
+    def __init__(self, page):
+        self.page = page
+        self._enviados = {}  # id(controle) -> (controle, {propriedade: valor})
+        self._local = threading.local()
+
+        # Instrumentação
+        self.atualizacoes_enviadas = 0
+        self.atualizacoes_suprimidas = 0
+        self.propriedades_suprimidas = 0
+        self.zerar_instrumentacao()
+
+    def definir(self, controle, **propriedades):
+        """
+        Aplica as propriedades ao controle e o atualiza se alguma mudou.
+
+        Retorna True se o controle foi enviado (ou marcado para envio).
+        """
+        _, ultimos = self._enviados.setdefault(id(controle), (controle, {}))
+        alteradas = {}
+        for nome, valor in propriedades.items():
+            if nome in ultimos and ultimos[nome] == valor:
+                self.propriedades_suprimidas += 1
+            else:
+                alteradas[nome] = valor
+
+        if not alteradas:
+            self.atualizacoes_suprimidas += 1
+            return False
+
+        for nome, valor in alteradas.items():
+            setattr(controle, nome, valor)
+        ultimos.update(alteradas)
+        self.atualizacoes_enviadas += 1
+        self.marcar(controle, len(json.dumps(alteradas, default=str)))
+        return True
+
+    def marcar(self, controle, tamanho=0):
+        """
+        Marca um controle (ou a própria página) como alterado.
+
+        Fora de um quadro, o envio é imediato.
+        """
+        pendentes = getattr(self._local, "pendentes", None)
+        if pendentes is None:
+            self._enviar([controle], tamanho)
+        else:
+            pendentes[id(controle)] = controle
+            self._local.tamanho += tamanho
+
+    @contextmanager
+    def quadro(self):
+        """Agrupa as alterações de um tick ou handler em um único envio."""
+        local = self._local
+        externo = getattr(local, "pendentes", None) is None
+        if externo:
+            local.pendentes = {}
+            local.tamanho = 0
+        try:
+            yield self
+        finally:
+            if externo:
+                controles = list(local.pendentes.values())
+                tamanho = local.tamanho
+                local.pendentes = None
+                self._enviar(controles, tamanho)
+
+    def _enviar(self, controles, tamanho):
+        if not controles:
+            return
+        if any(controle is self.page for controle in controles):
+            # page.update() já envia todas as alterações da árvore
+            self.page.update()
+        else:
+            self.page.update(*controles)
+        self.mensagens_enviadas += 1
+        self.bytes_estimados += tamanho
+
+    def esquecer(self, controle=None):
+        """Descarta os valores lembrados de um controle (ou de todos)."""
+        if controle is None:
+            self._enviados.clear()
+        else:
+            self._enviados.pop(id(controle), None)
+
+    def zerar_instrumentacao(self):
+        """Reinicia a contagem de mensagens e bytes enviados."""
+        self.mensagens_enviadas = 0
+        self.bytes_estimados = 0
+        self._inicio_instrumentacao = time.monotonic()
+
+    def taxas(self):
+        """Retorna (mensagens por segundo, bytes estimados por segundo) desde o último zerar."""
+        decorrido = max(time.monotonic() - self._inicio_instrumentacao, 1e-9)
+        return self.mensagens_enviadas / decorrido, self.bytes_estimados / decorrido
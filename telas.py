@@ -0,0 +1,262 @@
+import logging
+import weakref
+
+from data_hora import publicador_data_hora
+from redimensionamento import servico_redimensionamento
+
+CHAVE_SESSAO = "roteador"
+
+# Telas ainda referenciadas em algum lugar (para conferir vazamentos)
+_telas_vivas = weakref.WeakSet()
+# rota -> (fábrica, manter em cache)
+_ROTAS = {}
+
+
+class Tela:
+    """
+    Ciclo de vida de uma tela: montar -> desmontar -> descartar.
+
+    Tudo o que a tela prende na página (overlays, handlers, inscrições no
+    relógio e no redimensionamento, diálogos) é registrado como um recurso,
+    com uma função para ligar e outra para desligar. montar() liga os
+    recursos, desmontar() os desliga na ordem inversa e descartar()
+    desmonta e executa as finalizações registradas com ao_descartar().
+
+    A navegação é feita pelo Roteador; a tela só precisa preencher 'view'.
+    """
+
+    def __init__(self, page, nome="", view=None):
+        self.page = page
+        self.nome = nome
+        self.view = view
+        self.rota = None
+        self.montada = False
+        self.descartada = False
+        self._recursos = []  # (ligar, desligar)
+        self._finalizacoes = []
+        _telas_vivas.add(self)
+
+    def recurso(self, ligar, desligar):
+        """Registra um recurso; se a tela já estiver montada, ele é ligado na hora."""
+        self._recursos.append((ligar, desligar))
+        if self.montada and ligar is not None:
+            ligar()
+
+    def ao_montar(self, callback):
+        """Executa callback a cada montagem: na primeira exibição e ao voltar à tela."""
+        self.recurso(callback, None)
+        return callback
+
+    def ao_descartar(self, callback):
+        self._finalizacoes.append(callback)
+        return callback
+
+    def montar(self):
+        if self.montada or self.descartada:
+            return
+        self.montada = True
+        for ligar, _ in self._recursos:
+            if ligar is not None:
+                ligar()
+
+    def desmontar(self):
+        if not self.montada:
+            return
+        self.montada = False
+        for _, desligar in reversed(self._recursos):
+            self._executar(desligar)
+
+    def descartar(self):
+        if self.descartada:
+            return
+        self.desmontar()
+        self.descartada = True
+        for callback in self._finalizacoes:
+            self._executar(callback)
+        self._recursos.clear()
+        self._finalizacoes.clear()
+
+    def _executar(self, callback):
+        if callback is None:
+            return
+        try:
+            callback()
+        except Exception:
+            logging.exception("Erro ao liberar recurso da tela %s", self.nome)
+
+    # Recursos comuns
+
+    def overlay(self, *controles):
+        """Controles em page.overlay (áudios etc.), removidos ao desmontar."""
+        def ligar():
+            self.page.overlay.extend(controles)
+
+        def desligar():
+            for controle in controles:
+                if controle in self.page.overlay:
+                    self.page.overlay.remove(controle)
+        self.recurso(ligar, desligar)
+
+    def handler(self, evento, handler):
+        """Handler de evento da página (ex.: "on_keyboard_event"), desfeito ao desmontar."""
+        def desligar():
+            # Só desfaz se nenhuma outra tela tiver assumido o evento
+            if getattr(self.page, evento) == handler:
+                setattr(self.page, evento, None)
+        self.recurso(lambda: setattr(self.page, evento, handler), desligar)
+
+    def redimensionamento(self, callback):
+        servico = servico_redimensionamento(self.page)
+        self.recurso(lambda: servico.inscrever(callback), lambda: servico.cancelar_inscricao(callback))
+
+    def data_hora(self, texto, atualizador=None):
+        publicador = publicador_data_hora(self.page)
+        self.recurso(
+            lambda: publicador.inscrever(texto, atualizador),
+            lambda: publicador.cancelar_inscricao(texto)
+        )
+
+    def dialogos(self):
+        """Fecha, ao desmontar, o diálogo que a tela tiver deixado aberto."""
+        def desligar():
+            dialogo = getattr(self.page, "dialog", None)
+            if dialogo is not None and dialogo.open:
+                dialogo.open = False
+        self.recurso(None, desligar)
+
+
+def rota(caminho, manter=True):
+    """
+    Registra a fábrica de tela de uma rota: fabrica(page, usuario) -> Tela.
+
+    Com manter=False a tela não fica em cache e é descartada ao sair dela.
+    """
+    def registrar(fabrica):
+        _ROTAS[caminho] = (fabrica, manter)
+        return fabrica
+    return registrar
+
+
+class Roteador:
+    """
+    Navegação entre telas sobre a pilha page.views, com telas em cache.
+
+    A primeira visita a uma rota chama a fábrica; nas seguintes, a mesma
+    tela é reaproveitada. Ir para uma tela que já está na pilha (como
+    voltar ao menu) só retira as de cima: a View continua no cliente e a
+    tela é apenas remontada, religando os recursos e executando os
+    callbacks ao_montar, que atualizam o que pode ter mudado.
+
+    Telas cobertas por outra são desmontadas; telas retiradas da pilha são
+    desmontadas (se estiverem em cache) ou descartadas.
+    """
+
+    def __init__(self, page):
+        self.page = page
+        self.usuario = None
+        self._pilha = []
+        self._cache = {}
+
+        # Instrumentação
+        self.telas_criadas = 0
+        self.telas_reexibidas = 0
+
+        page.on_route_change = self._ao_mudar_rota
+        page.on_view_pop = self._ao_retirar_view
+
+    @property
+    def atual(self):
+        return self._pilha[-1] if self._pilha else None
+
+    def ir(self, caminho, usuario=None):
+        """Mostra a tela da rota, criando-a apenas se não estiver em cache."""
+        if usuario is not None and usuario != self.usuario:
+            # Outro usuário: nenhuma tela do anterior pode ser reaproveitada
+            self.limpar()
+            self.usuario = usuario
+
+        tela = self._cache.get(caminho)
+        if tela is None:
+            tela = next((t for t in self._pilha if t.rota == caminho), None)
+        if tela is None:
+            fabrica, manter = _ROTAS[caminho]
+            tela = fabrica(self.page, self.usuario)
+            tela.rota = caminho
+            self.telas_criadas += 1
+            if manter:
+                self._cache[caminho] = tela
+        else:
+            self.telas_reexibidas += 1
+
+        if tela is self.atual:
+            return tela
+        if tela in self._pilha:
+            # Volta: retira as telas de cima, a View de baixo já está no cliente
+            while self._pilha[-1] is not tela:
+                self._retirar()
+        else:
+            if self.atual is not None:
+                self.atual.desmontar()
+            else:
+                # Primeira tela: substitui a View inicial da página
+                self.page.views.clear()
+            self._pilha.append(tela)
+            self.page.views.append(tela.view)
+
+        self.page.route = caminho
+        tela.montar()
+        self.page.update()
+        return tela
+
+    def voltar(self):
+        """Volta para a tela de baixo na pilha."""
+        if len(self._pilha) > 1:
+            self.ir(self._pilha[-2].rota)
+
+    def _retirar(self):
+        tela = self._pilha.pop()
+        if tela.view in self.page.views:
+            self.page.views.remove(tela.view)
+        if self._cache.get(tela.rota) is tela:
+            tela.desmontar()
+        else:
+            tela.descartar()
+
+    def _ao_mudar_rota(self, e):
+        # Mudanças de rota vindas do cliente (ex.: voltar do navegador)
+        if e.route in _ROTAS and (self.atual is None or e.route != self.atual.rota):
+            self.ir(e.route)
+
+    def _ao_retirar_view(self, e):
+        self.voltar()
+
+    def limpar(self):
+        """Descarta todas as telas (da pilha e do cache)."""
+        while self._pilha:
+            self._pilha.pop().descartar()
+        for tela in self._cache.values():
+            tela.descartar()
+        self._cache.clear()
+        self.page.views.clear()
+
+
+def roteador_da_pagina(page):
+    """Retorna o roteador da página, criando-o na primeira chamada."""
+    roteador = page.session.get(CHAVE_SESSAO)
+    if roteador is None:
+        roteador = Roteador(page)
+        page.session.set(CHAVE_SESSAO, roteador)
+    return roteador
+
+
+def descartar_roteador(page):
+    """Descarta as telas da página (ao encerrar a sessão)."""
+    roteador = page.session.get(CHAVE_SESSAO)
+    if roteador is not None:
+        roteador.limpar()
+        page.session.remove(CHAVE_SESSAO)
+
+
+def contar_telas_vivas():
+    """Quantas telas ainda estão na memória; deve ficar estável ao navegar."""
+    return len(_telas_vivas)
@@ -0,0 +1,86 @@
+import os
+import sys
+import types
+
+import pytest
+
+# Os módulos do app ficam na raiz do repositório
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class SessaoFalsa:
+    def __init__(self):
+        self._valores = {}
+
+    def get(self, chave):
+        return self._valores.get(chave)
+
+    def set(self, chave, valor):
+        self._valores[chave] = valor
+
+    def remove(self, chave):
+        self._valores.pop(chave, None)
+
+    def contains_key(self, chave):
+        return chave in self._valores
+
+
+class PaginaFalsa:
+    """Página sem cliente: guarda os envios de update() em vez de mandá-los."""
+
+    def __init__(self):
+        self.session = SessaoFalsa()
+        self.window = types.SimpleNamespace(width=1600, height=900, full_screen=False)
+        self.overlay = []
+        self.views = []
+        self.controls = []
+        self.envios = []
+        self.route = "/"
+        self.title = ""
+        self.theme_mode = None
+        self.vertical_alignment = None
+        self.horizontal_alignment = None
+        self.dialog = None
+        self.snack_bar = None
+        self.on_keyboard_event = None
+        self.on_route_change = None
+        self.on_view_pop = None
+        self.on_resize = None
+
+    def update(self, *controles):
+        self.envios.append(controles)
+
+    def add(self, *controles):
+        self.controls.extend(controles)
+
+
+class SaidaGravada:
+    """Saída de áudio que só anota os sinais tocados."""
+
+    def __init__(self):
+        self.tocados = []
+
+    def tocar(self, nome):
+        self.tocados.append(nome)
+
+    def preparar(self, nome):
+        pass
+
+
+@pytest.fixture
+def pagina():
+    """
+    Página falsa com agendador parado sobre um RelogioVirtual e sinais
+    sonoros gravados: o teste avança o relógio e chama executar_vencidas().
+    """
+    pytest.importorskip("flet")
+    from agendador import Agendador, CHAVE_SESSAO as SESSAO_AGENDADOR
+    from audio import SinaisSonoros, CHAVE_SESSAO as SESSAO_SONS
+    from cronometro import RelogioVirtual
+
+    page = PaginaFalsa()
+    agendador = Agendador(relogio=RelogioVirtual())
+    page.session.set(SESSAO_AGENDADOR, agendador)
+    page.session.set(SESSAO_SONS, SinaisSonoros(page, agendador, SaidaGravada()))
+    yield page
+    agendador.descartar()
@@ -0,0 +1,218 @@
+import random
+
+import pytest
+
+pytest.importorskip("flet")
+
+from cronometro_app import CronometroControl  # noqa: E402
+
+ESTADOS = {"parado", "rodando", "pausado", "esgotado"}
+COMANDOS = (
+    "iniciar", "pausar", "retomar", "reiniciar", "parar", "definir_duracao",
+    "alternar_tema", "alternar_modo", "redimensionar", "tick", "evento",
+)
+# Passos do relógio entre comandos: rajadas de teclas, ticks e contagens inteiras
+PASSOS = (0, 0, 0.01, 0.3, 1.0, 7.0, 40.0)
+
+
+def conferir_invariantes(controle, sons, tocados_antes):
+    cronometro = controle.cronometro
+    assert controle.estado in ESTADOS
+    # Nenhuma ação falhou (processar transforma exceções em mensagem)
+    mensagem = controle.page.snack_bar.content.value if controle.page.snack_bar else ""
+    assert not mensagem.startswith("Erro"), mensagem
+
+    # O estado da máquina e o do Cronometro andam juntos
+    assert cronometro.em_andamento == (controle.estado in ("rodando", "esgotado"))
+    assert cronometro.em_pausa == (controle.estado == "pausado")
+    assert 0 <= cronometro.tempo_restante() <= cronometro.duracao
+
+    # Um único tick vivo, e só com a contagem rodando
+    tarefa = controle.tarefa_progresso
+    if tarefa is not None and not tarefa.cancelada:
+        assert controle.estado == "rodando"
+    if controle.estado in ("parado", "pausado"):
+        assert tarefa is None or tarefa.cancelada
+    if controle.estado == "parado":
+        assert not controle.pulsando
+
+    # O som de fim só toca quando a contagem chegou a zero, e uma vez
+    novos = sons.tocados[tocados_antes:]
+    if "fim" in novos:
+        assert novos.count("fim") == 1
+        assert cronometro.tempo_restante() == 0
+
+
+@pytest.mark.parametrize("semente", range(5))
+def test_comandos_aleatorios_mantem_invariantes(pagina, semente):
+    aleatorio = random.Random(semente)
+    controle = CronometroControl(pagina, "teste")
+    agendador = controle.agendador
+    relogio = agendador.relogio
+    sons = controle.sons.saida
+
+    enviados = 0
+    for _ in range(2000):
+        comando = aleatorio.choice(COMANDOS)
+        args = (aleatorio.choice((1, 2)),) if comando == "definir_duracao" else ()
+        tocados_antes = len(sons.tocados)
+        # Metade vai pela fila (como os handlers), metade direto (como os ticks)
+        if aleatorio.random() < 0.5:
+            controle.enviar(comando, *args)
+        else:
+            controle.processar(comando, *args)
+        enviados += 1
+        relogio.avancar(aleatorio.choice(PASSOS))
+        agendador.executar_vencidas()
+        conferir_invariantes(controle, sons, tocados_antes)
+
+    # Comandos internos (esgotar e o reinício automático) também passam pela tabela
+    assert controle.comandos_processados + controle.comandos_ignorados >= enviados
+
+
+def test_esgotar_toca_fim_e_reinicia_sozinho(pagina):
+    controle = CronometroControl(pagina, "teste")
+    agendador = controle.agendador
+    controle.processar("definir_duracao", 1)
+    controle.processar("iniciar")
+
+    agendador.relogio.avancar(60)
+    agendador.executar_vencidas()
+    assert controle.estado == "esgotado"
+    assert controle.sons.saida.tocados.count("fim") == 1
+
+    agendador.relogio.avancar(5)
+    agendador.executar_vencidas()
+    assert controle.estado == "parado"
+
+
+def test_parar_durante_a_pausa_volta_ao_inicio(pagina):
+    controle = CronometroControl(pagina, "teste")
+    agendador = controle.agendador
+    controle.processar("definir_duracao", 1)
+    controle.processar("iniciar")
+    agendador.relogio.avancar(20)
+    controle.processar("pausar")
+    controle.processar("parar")
+    controle.processar("iniciar")
+    # Uma nova contagem começa do zero, e não de onde a pausa parou
+    assert controle.cronometro.tempo_restante() == 60
+
+
+def test_alternar_tema_troca_o_estilo_dos_botoes(pagina):
+    from estilos import obter_estilo
+
+    controle = CronometroControl(pagina, "teste")
+    tema_inicial = controle.theme
+    controle.processar("alternar_tema")
+    assert controle.theme != tema_inicial
+
+    # Os botões são mantidos entre temas: a cor muda trocando o estilo inteiro
+    estilo = obter_estilo("botao_cronometro", controle.theme)
+    enviados = {id(c) for envio in pagina.envios for c in envio}
+    for botao, _, _ in controle.botoes:
+        assert botao.style is estilo
+        assert id(botao) in enviados
+
+
+def faixas_disparadas(controle, inicio):
+    """Faixas disparadas pela agenda e o instante de cada uma (segundos desde 'inicio')."""
+    return [
+        (limiar.args[0], round(instante - inicio, 3))
+        for limiar, _, instante in controle.eventos_disparados if limiar.acao == "faixa"
+    ]
+
+
+def iniciar(pagina, minutos):
+    controle = CronometroControl(pagina, "teste")
+    controle.processar("definir_duracao", minutos)
+    controle.processar("iniciar")
+    return controle
+
+
+def avancar(controle, segundos):
+    agendador = controle.agendador
+    agendador.relogio.avancar(segundos)
+    agendador.executar_vencidas()
+
+
+def test_avisos_descontam_a_pausa(pagina):
+    inicio = pagina.session.get("agendador").relogio()
+    controle = iniciar(pagina, 1)
+    avancar(controle, 20)
+    controle.processar("pausar")
+    avancar(controle, 100)
+    controle.processar("retomar")
+
+    # A faixa de 50% (30 s de contagem) vem 100 s depois, e nem um tick antes
+    avancar(controle, 9.9)
+    assert faixas_disparadas(controle, inicio) == [(0, 0)]
+    avancar(controle, 0.1)
+    assert faixas_disparadas(controle, inicio) == [(0, 0), (1, 130)]
+
+    avancar(controle, 60 * 0.9 - 30)
+    assert controle.pulsando
+    assert controle.sons.saida.tocados.count("alerta") == 1
+
+
+def test_encurtar_a_duracao_alem_do_decorrido_esgota(pagina):
+    controle = iniciar(pagina, 2)
+    avancar(controle, 90)
+    controle.processar("definir_duracao", 1)
+    avancar(controle, 0)
+    assert controle.estado == "esgotado"
+    assert controle.sons.saida.tocados.count("fim") == 1
+    assert controle.page.snack_bar.content.value == "Tempo esgotado!"
+
+    avancar(controle, 5)
+    assert controle.estado == "parado"
+
+
+def test_encurtar_durante_a_pausa_esgota_ao_retomar(pagina):
+    controle = iniciar(pagina, 2)
+    avancar(controle, 90)
+    controle.processar("pausar")
+    controle.processar("definir_duracao", 1)
+    controle.processar("retomar")
+    avancar(controle, 0)
+    assert controle.estado == "esgotado"
+
+
+def test_mudar_a_duracao_reaplica_faixa_e_pulso(pagina):
+    controle = iniciar(pagina, 2)
+    avancar(controle, 40)
+    assert controle.faixa_atual == 0
+
+    # 40 s de 1 min: 67% da contagem, na faixa de 50%
+    controle.processar("definir_duracao", 1)
+    assert controle.faixa_atual == 1
+    assert controle.barra_progresso_interna.gradient is controle.gradientes_faixas[1]
+    assert controle.mostrador.cor == controle.CORES_FAIXAS[1]
+    assert not controle.pulsando
+
+    avancar(controle, 15)
+    assert controle.faixa_atual == 3 and controle.pulsando
+
+    # De volta a 2 min: 55 s ficam antes da metade, e o pulso se apaga
+    controle.processar("definir_duracao", 2)
+    assert controle.faixa_atual == 0
+    assert controle.barra_progresso_interna.gradient is controle.gradientes_faixas[0]
+    assert not controle.pulsando
+    assert controle.estado == "rodando"
+
+
+@pytest.mark.parametrize("pausar", (False, True))
+def test_alternar_tema_na_contagem_mantem_o_contador_visivel(pagina, pausar):
+    controle = iniciar(pagina, 1)
+    assert controle.mostrador.cor == controle.CORES_FAIXAS[0]
+    avancar(controle, 10)
+    if pausar:
+        controle.processar("pausar")
+
+    for _ in range(2):
+        controle.processar("alternar_tema")
+        assert controle.mostrador.cor != controle.timer_background_color
+
+    controle.processar("parar")
+    controle.processar("alternar_tema")
+    assert controle.mostrador.cor == controle.text_color
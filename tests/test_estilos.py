@@ -0,0 +1,51 @@
+import ast
+from pathlib import Path
+
+import pytest
+
+ft = pytest.importorskip("flet")
+
+from estilos import _FABRICAS, obter_estilo  # noqa: E402
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+
+def botoes_elevados_com_estilo():
+    """(arquivo, linha, nome do estilo, argumentos do botão) de cada ElevatedButton com obter_estilo."""
+    for caminho in sorted(RAIZ.glob("*.py")):
+        for no in ast.walk(ast.parse(caminho.read_text(encoding="utf-8"))):
+            if not (isinstance(no, ast.Call) and isinstance(no.func, ast.Attribute)
+                    and no.func.attr == "ElevatedButton"):
+                continue
+            argumentos = {k.arg: k.value for k in no.keywords}
+            estilo = argumentos.get("style")
+            if (isinstance(estilo, ast.Call) and isinstance(estilo.func, ast.Name)
+                    and estilo.func.id == "obter_estilo"):
+                yield caminho.name, no.lineno, estilo.args[0].value, set(argumentos)
+
+
+BOTOES = list(botoes_elevados_com_estilo())
+
+
+def test_ha_botoes_com_estilo_compartilhado():
+    assert {nome for _, _, nome, _ in BOTOES} >= {"botao_cronometro", "botao_menu", "botao_login", "botao_usuarios"}
+
+
+@pytest.mark.parametrize("arquivo, linha, nome, argumentos", BOTOES)
+def test_botao_com_estilo_compartilhado_nao_passa_cores(arquivo, linha, nome, argumentos):
+    # O ElevatedButton mistura color/bgcolor no style ao ser enviado (e a
+    # regra muda entre versões do Flet): as cores ficam só no estilo
+    assert not argumentos & {"color", "bgcolor"}, f"{arquivo}:{linha}"
+
+    por_tema = _FABRICAS[nome][1]
+    for tema in ("Claro", "Escuro") if por_tema else (None,):
+        estilo = obter_estilo(nome, tema)
+        assert estilo.color is not None and estilo.bgcolor is not None
+
+
+def test_temas_do_cronometro_tem_estilos_proprios():
+    claro = obter_estilo("botao_cronometro", "Claro")
+    escuro = obter_estilo("botao_cronometro", "Escuro")
+    assert claro is not escuro
+    assert claro.bgcolor != escuro.bgcolor
+    assert claro.color != escuro.color
@@ -0,0 +1,17 @@
+from pathlib import Path
+
+from mixer_local import MixerLocal, SaidaNula
+
+ASSETS = Path(__file__).resolve().parent.parent / "assets"
+
+
+def test_saida_nula_carrega_sons_que_nao_decodifica():
+    # Os .wav do projeto são MP3: sem pygame, a saída nula os troca por silêncio
+    saida = SaidaNula(tempo_real=False)
+    mixer = MixerLocal(saida)
+    for caminho in sorted(ASSETS.glob("*.wav")):
+        mixer.carregar(caminho.stem, str(caminho))
+
+    silencio = mixer._sons["end_sound"]
+    assert len(silencio) == int(saida.taxa * SaidaNula.DURACAO_SILENCIO) * saida.canais
+    assert not any(silencio)
@@ -0,0 +1,61 @@
+import gc
+import threading
+
+import pytest
+
+ft = pytest.importorskip("flet")
+
+from cronometro_app import mostrar_cronometro  # noqa: E402
+from data_hora import publicador_data_hora  # noqa: E402
+from redimensionamento import servico_redimensionamento  # noqa: E402
+from telas import Tela, contar_telas_vivas, rota, roteador_da_pagina  # noqa: E402
+
+NAVEGACOES = 1000
+
+# CronometroControl ainda é um UserControl (aviso do Flet a cada criação)
+pytestmark = pytest.mark.filterwarnings("ignore::DeprecationWarning")
+
+
+@rota("/teste_base")
+def criar_tela_base(page, usuario):
+    tela = Tela(page, "base", view=ft.View("/teste_base", controls=[ft.Text("base")]))
+    # Como o menu: relógio e redimensionamento enquanto está à mostra
+    tela.data_hora(ft.Text())
+    tela.redimensionamento(lambda: None)
+    return tela
+
+
+def medir(page):
+    gc.collect()
+    return {
+        "threads": threading.active_count(),
+        "overlays": len(page.overlay),
+        "views": len(page.views),
+        "telas vivas": contar_telas_vivas(),
+        "inscritos no relógio": len(publicador_data_hora(page)._inscritos),
+        "inscritos no redimensionamento": len(servico_redimensionamento(page)._inscritos),
+    }
+
+
+def test_navegar_mil_vezes_nao_acumula_recursos(pagina):
+    agendador = pagina.session.get("agendador")
+    roteador = roteador_da_pagina(pagina)
+
+    def ida_e_volta():
+        mostrar_cronometro(pagina)
+        assert isinstance(roteador.atual.view.controls[0], ft.Control)
+        roteador.voltar()
+        # O encerramento da contagem é um comando enfileirado no agendador
+        agendador.relogio.avancar(1)
+        agendador.executar_vencidas()
+
+    roteador.ir("/teste_base", "teste")
+    ida_e_volta()
+    inicial = medir(pagina)
+
+    for _ in range(NAVEGACOES):
+        ida_e_volta()
+
+    assert medir(pagina) == inicial
+    assert roteador.telas_criadas == NAVEGACOES + 2
+    assert pagina.on_keyboard_event is None
@@ -0,0 +1,107 @@
+import types
+
+import pytest
+
+ft = pytest.importorskip("flet")
+
+import banco as modulo_banco  # noqa: E402
+from banco import Banco  # noqa: E402
+from migracoes import migrar  # noqa: E402
+from telas import roteador_da_pagina  # noqa: E402
+from usuarios import TAMANHO_PAGINA, gerenciar_usuarios  # noqa: E402
+
+USUARIOS = 300
+
+
+@pytest.fixture
+def banco(tmp_path, monkeypatch):
+    """Banco do processo num arquivo temporário, com USUARIOS cadastrados."""
+    banco = Banco(str(tmp_path / "usuarios.db"))
+    migrar(banco)
+    with banco.transacao():
+        banco.conexao.executemany(
+            "INSERT INTO usuarios (usuario, senha, data_expiracao) VALUES (?, ?, '2030-01-01')",
+            ((f"usuario{i}", "senha") for i in range(USUARIOS)),
+        )
+    monkeypatch.setattr(modulo_banco, "_banco", banco)
+    yield banco
+    banco.fechar()
+
+
+@pytest.fixture
+def lista(pagina, banco, monkeypatch):
+    """ListView da tela de usuários, já montada na página falsa."""
+    # Sem cliente, control.update() só é anotado na página
+    monkeypatch.setattr(ft.Control, "update", lambda controle: pagina.update(controle))
+    gerenciar_usuarios(pagina, "admin")
+    tela = roteador_da_pagina(pagina).atual
+    return next(c for c in tela.view.controls[0].content.controls if isinstance(c, ft.ListView))
+
+
+def buscar(pagina, texto):
+    tela = roteador_da_pagina(pagina).atual
+    campo = next(
+        c for linha in tela.view.controls[0].content.controls if isinstance(linha, ft.Row)
+        for c in linha.controls if isinstance(c, ft.TextField)
+    )
+    campo.value = texto
+    campo.on_submit(None)
+    executar(pagina)
+
+
+def nomes(lista):
+    return sorted(c.content.controls[0].value.split(" | ")[1].removeprefix("Usuário: ") for c in lista.controls)
+
+
+def rolar_ate_o_fim(lista):
+    lista.on_scroll(types.SimpleNamespace(max_scroll_extent=1000, pixels=900))
+
+
+def executar(pagina):
+    pagina.session.get("agendador").executar_vencidas()
+
+
+def test_rajada_de_rolagem_carrega_uma_pagina(pagina, lista):
+    assert len(lista.controls) == TAMANHO_PAGINA
+    for _ in range(5):
+        rolar_ate_o_fim(lista)
+    executar(pagina)
+    assert len(lista.controls) == 2 * TAMANHO_PAGINA
+
+    # Depois que a página chega, a próxima rolagem pede a seguinte
+    rolar_ate_o_fim(lista)
+    executar(pagina)
+    assert len(lista.controls) == 3 * TAMANHO_PAGINA
+
+
+def test_avisos_respeitam_o_filtro_da_busca(pagina, banco, lista):
+    buscar(pagina, "usuario12")
+    esperados = ["usuario12"] + [f"usuario12{i}" for i in range(10)]
+    assert nomes(lista) == esperados
+
+    banco.executar("INSERT INTO usuarios (usuario, senha) VALUES ('zeca', 'x')")
+    banco.executar("INSERT INTO usuarios (usuario, senha) VALUES ('usuario12x', 'x')")
+    banco.executar("UPDATE usuarios SET usuario = 'ana' WHERE usuario = 'usuario120'")
+    executar(pagina)
+    assert nomes(lista) == sorted(set(esperados) - {"usuario120"} | {"usuario12x"})
+
+
+def test_avisos_alteram_a_lista_na_thread_do_agendador(pagina, banco, lista):
+    buscar(pagina, "")
+    banco.executar("DELETE FROM usuarios WHERE usuario = 'usuario0'")
+    # O aviso só enfileira; a lista muda quando o agendador o executa
+    assert "usuario0" in nomes(lista)
+    executar(pagina)
+    assert "usuario0" not in nomes(lista)
+
+
+def test_avisos_respeitam_o_filtro_curto(pagina, banco, lista):
+    # Com menos de 3 letras a busca não usa o índice de trigramas, e sim LIKE
+    buscar(pagina, "99")
+    assert nomes(lista) == ["usuario199", "usuario299", "usuario99"]
+
+    banco.executar("INSERT INTO usuarios (usuario, senha) VALUES ('ze99', 'x')")
+    banco.executar("UPDATE usuarios SET usuario = 'ana' WHERE usuario = 'usuario199'")
+    banco.executar("UPDATE usuarios SET usuario = 'usuario990' WHERE usuario = 'usuario1'")
+    executar(pagina)
+    assert nomes(lista) == ["usuario299", "usuario99", "usuario990", "ze99"]
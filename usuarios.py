@@ -1,93 +1,336 @@
 import flet as ft
 import sqlite3
-import os
-import sys
 from datetime import datetime, timedelta
 from config import resource_path
+from banco import banco_do_processo
+from agendador import agendador_da_pagina, TokenCancelamento
 from serial_utils import gerar_serial, salvar_serial
+from telas import Tela, rota, roteador_da_pagina
+from estilos import obter_estilo
 
 # Atualizando caminho do arquivo private_key.pem usando o resource_path
 PRIVATE_KEY_PATH = resource_path("private_key.pem")
 
-def get_database_path():
-    if hasattr(sys, '_MEIPASS'):
-        # Quando for executado como um executável compilado
-        return os.path.join(sys._MEIPASS, 'database.db')
-    else:
-        # Quando estiver rodando no ambiente de desenvolvimento
-        return os.path.join(os.path.abspath("."), 'database.db')
+# Usuários carregados por vez (a próxima página vem ao rolar até o fim da lista)
+TAMANHO_PAGINA = 50
+# Pausa na digitação (s) que dispara a busca
+ESPERA_BUSCA = 0.25
+# Distância (px) do fim da lista a partir da qual a próxima página é carregada
+MARGEM_ROLAGEM = 300
 
-DATABASE_PATH = get_database_path()
 
-def gerenciar_usuarios(page: ft.Page, usuario_logado):
-    """Função para exibir e gerenciar os usuários cadastrados no sistema."""
-    
-    # Ajustes da página (fundo branco, centralizado)
-    page.title = "Gerenciamento de Usuários"
-    page.vertical_alignment = ft.MainAxisAlignment.CENTER
-    page.horizontal_alignment = ft.CrossAxisAlignment.CENTER
-    page.bgcolor = ft.colors.WHITE
+def frase_busca(texto):
+    """Texto como uma frase do FTS5 (entre aspas): busca o trecho literal, sem operadores."""
+    return '"' + texto.replace('"', '""') + '"'
+
+
+class LinhaUsuario:
+    """Linha da lista de usuários: os dados exibidos, o cartão e o texto que os mostra."""
+
+    __slots__ = ("dados", "cartao", "info")
+
+    def __init__(self, cartao, info):
+        self.dados = None
+        self.cartao = cartao
+        self.info = info
+
+
+def verificar_status_licenca(data_expiracao):
+    """Verifica se a licença está ativa ou expirada."""
+    if data_expiracao:
+        try:
+            validade = datetime.strptime(data_expiracao, '%Y-%m-%d')
+            if datetime.now() > validade:
+                return "Expirado"
+            else:
+                return "Ativo"
+        except ValueError:
+            return "Data Inválida"
+    return "Sem Licença"
+
+
+def preencher_linha(linha, u):
+    """Escreve no cartão da linha os dados 'u' (id, usuário, expiração, admin, serial)."""
+    usuario_id, nome_user, data_exp, is_admin, serial_ = u
+    status_licenca = verificar_status_licenca(data_exp)
+    admin_text = "Sim" if is_admin else "Não"
+    serial_texto = serial_ if serial_ else "Nenhum"
+    linha.dados = tuple(u)
+    linha.info.value = (
+        f"ID: {usuario_id} | Usuário: {nome_user} | Licença: {status_licenca} | Admin: {admin_text}"
+    )
+    linha.info.tooltip = f"Serial: {serial_texto}"
+
+
+class ListaUsuarios:
+    """
+    Modelo da lista de usuários da tela: as linhas carregadas (chaveadas
+    pelo id), o filtro da busca e a paginação, sobre um ListView.
+
+    A lista é paginada por chave: só a primeira página é consultada e
+    montada ao recarregar, e as seguintes ao rolar até o fim. Buscas,
+    páginas e avisos do banco rodam todos na thread do agendador da
+    página, um de cada vez; assim uma busca antiga nunca sobrescreve o
+    resultado da nova.
+
+    'criar_linha(u)' é da tela (os botões de cada linha abrem os seus
+    diálogos) e retorna uma LinhaUsuario já preenchida.
+    """
+
+    def __init__(self, page, criar_linha):
+        self.banco = banco_do_processo()
+        self.agendador = agendador_da_pagina(page)
+        self.busca_indexada = (
+            self.banco.consultar_um("SELECT 1 FROM sqlite_master WHERE name = 'usuarios_busca'") is not None
+        )
+        self.criar_linha = criar_linha
+        self.linhas = {}  # usuario_id -> LinhaUsuario, só das linhas carregadas
+        self.filtro = None
+        self.ultimo_id = 0
+        self.fim = True
+        self.token_busca = TokenCancelamento()
+        self.pagina_pendente = None  # carga da próxima página já agendada (ver ao_rolar)
+        # ListView: o cliente só desenha as linhas visíveis, e o servidor só monta as páginas já roladas
+        self.lista = ft.ListView(
+            controls=[],
+            spacing=5,
+            height=420,
+            on_scroll=self.ao_rolar,
+            on_scroll_interval=100
+        )
 
     # =========================================================================
-    #                          Funções de Banco e Lógica
+    #                               Consultas
+    # =========================================================================
+
+    def usa_indice(self, filtro_nome):
+        """Trechos de 3 ou mais letras usam o índice de trigramas; os menores, que ele não cobre, LIKE."""
+        return self.busca_indexada and len(filtro_nome) >= 3
+
+    def carregar_usuarios(self, filtro_nome=None, apos_id=0, limite=TAMANHO_PAGINA):
+        """
+        Carrega a página de usuários (em ordem de id) seguinte a 'apos_id'.
+
+        A paginação é por chave (id > último id carregado), e não por
+        OFFSET, e custa o mesmo em qualquer ponto da lista. Com
+        'filtro_nome', a busca usa o índice de trigramas (usuarios_busca,
+        ver migracoes.criar_busca_usuarios) ou LIKE, que para assim que a
+        página enche (ver usa_indice).
+        """
+        if not filtro_nome:
+            return self.banco.consultar("""
+                SELECT id, usuario, data_expiracao, admin, serial
+                FROM usuarios
+                WHERE id > ?
+                ORDER BY id LIMIT ?
+            """, (apos_id, limite))
+        if self.usa_indice(filtro_nome):
+            return self.banco.consultar("""
+                SELECT u.id, u.usuario, u.data_expiracao, u.admin, u.serial
+                FROM usuarios_busca b JOIN usuarios u ON u.id = b.rowid
+                WHERE usuarios_busca MATCH ? AND b.rowid > ?
+                ORDER BY b.rowid LIMIT ?
+            """, (frase_busca(filtro_nome), apos_id, limite))
+        return self.banco.consultar("""
+            SELECT id, usuario, data_expiracao, admin, serial 
+            FROM usuarios 
+            WHERE usuario LIKE ? AND id > ?
+            ORDER BY id LIMIT ?
+        """, (f"%{filtro_nome}%", apos_id, limite))
+
+    def carregar_usuario(self, usuario_id):
+        """Carrega um único usuário (None se não existir mais)."""
+        return self.banco.consultar_um(
+            "SELECT id, usuario, data_expiracao, admin, serial FROM usuarios WHERE id = ?",
+            (usuario_id,)
+        )
+
+    def corresponde_ao_filtro(self, usuario_id):
+        """Indica se o usuário entra na lista com o filtro atual (mesmo critério da busca, só para o seu id)."""
+        if not self.filtro:
+            return True
+        if self.usa_indice(self.filtro):
+            encontrado = self.banco.consultar_um(
+                "SELECT 1 FROM usuarios_busca WHERE usuarios_busca MATCH ? AND rowid = ?",
+                (frase_busca(self.filtro), usuario_id)
+            )
+        else:
+            encontrado = self.banco.consultar_um(
+                "SELECT 1 FROM usuarios WHERE id = ? AND usuario LIKE ?",
+                (usuario_id, f"%{self.filtro}%")
+            )
+        return encontrado is not None
+
+    # =========================================================================
+    #                          Busca e paginação
+    # =========================================================================
+
+    def agendar_busca(self, filtro, espera):
+        """Agenda a busca de 'filtro', cancelando a que ainda estiver pendente."""
+        self.token_busca.cancelar()
+        self.token_busca = TokenCancelamento()
+        self.agendador.agendar(espera, self.buscar, filtro, token=self.token_busca)
+
+    def buscar(self, filtro):
+        self.recarregar(filtro)
+        self.lista.update()
+
+    def recarregar(self, filtro=None):
+        """Recarrega a lista, a partir da primeira página, com base no filtro de pesquisa."""
+        self.filtro = filtro or None
+        usuarios_ = self.carregar_usuarios(filtro_nome=self.filtro)
+        ids = {u[0] for u in usuarios_}
+        for usuario_id in list(self.linhas):
+            if usuario_id not in ids:
+                del self.linhas[usuario_id]
+        # Linhas cujos dados não mudaram são reaproveitadas (e não reenviadas)
+        self.lista.controls = [self.obter_linha(u) for u in usuarios_]
+        self.ultimo_id = usuarios_[-1][0] if usuarios_ else 0
+        self.fim = len(usuarios_) < TAMANHO_PAGINA
+
+    def carregar_proxima_pagina(self):
+        """Acrescenta a próxima página do filtro atual ao fim da lista."""
+        self.pagina_pendente = None
+        if self.fim:
+            return
+        usuarios_ = self.carregar_usuarios(filtro_nome=self.filtro, apos_id=self.ultimo_id)
+        self.lista.controls.extend(self.obter_linha(u) for u in usuarios_)
+        if usuarios_:
+            self.ultimo_id = usuarios_[-1][0]
+        self.fim = len(usuarios_) < TAMANHO_PAGINA
+        self.lista.update()
+
+    def ao_rolar(self, e):
+        if e.max_scroll_extent is None or e.max_scroll_extent - e.pixels >= MARGEM_ROLAGEM or self.fim:
+            return
+        # Os eventos de rolagem continuam chegando até a página carregar: uma por vez
+        if self.pagina_pendente is None or self.pagina_pendente.cancelada:
+            self.pagina_pendente = self.agendador.agendar(0, self.carregar_proxima_pagina, token=self.token_busca)
+
+    # =========================================================================
+    #                                 Linhas
+    # =========================================================================
+
+    def obter_linha(self, u):
+        """Retorna o cartão do usuário, criando-o na primeira vez e corrigindo o texto se os dados mudaram."""
+        linha = self.linhas.get(u[0])
+        if linha is None:
+            linha = self.criar_linha(u)
+            self.linhas[u[0]] = linha
+        elif linha.dados != tuple(u):
+            preencher_linha(linha, u)
+        return linha.cartao
+
+    def atualizar_linha(self, usuario_id):
+        """
+        Recarrega um único usuário e corrige (ou acrescenta) a sua linha.
+
+        Uma linha existente é corrigida no lugar, sem procurar sua posição
+        na lista: o custo é o mesmo com 10 ou com 10 mil usuários. Usuários
+        que não passam no filtro da busca atual saem da lista (ou não entram).
+        """
+        u = self.carregar_usuario(usuario_id)
+        if u is None or not self.corresponde_ao_filtro(usuario_id):
+            self.remover_linha(usuario_id)
+            return
+        linha = self.linhas.get(usuario_id)
+        if linha is not None:
+            preencher_linha(linha, u)
+            linha.info.update()
+            return
+        if not self.fim:
+            # Ainda há páginas por carregar: a linha aparece quando a lista chegar nela
+            return
+        self.lista.controls.append(self.obter_linha(u))
+        self.ultimo_id = max(self.ultimo_id, usuario_id)
+        self.lista.update()
+
+    def remover_linha(self, usuario_id):
+        linha = self.linhas.pop(usuario_id, None)
+        if linha is not None:
+            self.lista.controls.remove(linha.cartao)
+            self.lista.update()
+
+    # =========================================================================
+    #                           Avisos do banco
     # =========================================================================
-    def carregar_usuarios(filtro_nome=None):
+
+    def ligar(self):
+        """Com a tela à vista: passa a receber os avisos do banco, com um token de busca novo."""
+        self.token_busca = TokenCancelamento()
+        self.banco.observar("usuarios", self.ao_alterar_usuario)
+
+    def desligar(self):
+        """Fora de vista: buscas, páginas e avisos ainda pendentes não rodam mais."""
+        self.banco.deixar_de_observar("usuarios", self.ao_alterar_usuario)
+        self.token_busca.cancelar()
+
+    def ao_alterar_usuario(self, operacao, usuario_id):
         """
-        Carrega todos os usuários do banco de dados.
-        Se 'filtro_nome' for fornecido, faz uma busca pelo nome do usuário.
+        Aviso do banco (Banco.observar) para cada usuário inserido, alterado
+        ou excluído, venha a alteração desta tela ou de outro lugar do app.
+
+        O aviso chega na thread que fez a alteração; a lista só é mexida na
+        thread do agendador, como as buscas e as páginas. Uma nova busca
+        cancela os avisos pendentes: ela já relê o banco depois deles.
         """
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
-        if filtro_nome:
-            cursor.execute("""
-                SELECT id, usuario, data_expiracao, admin, serial 
-                FROM usuarios 
-                WHERE usuario LIKE ?
-            """, (f"%{filtro_nome}%",))
+        self.agendador.agendar(0, self.aplicar_alteracao, operacao, usuario_id, token=self.token_busca)
+
+    def aplicar_alteracao(self, operacao, usuario_id):
+        if operacao == "DELETE":
+            self.remover_linha(usuario_id)
         else:
-            cursor.execute("SELECT id, usuario, data_expiracao, admin, serial FROM usuarios")
-        usuarios_ = cursor.fetchall()
-        conn.close()
-        return usuarios_
+            self.atualizar_linha(usuario_id)
+
+
+def gerenciar_usuarios(page: ft.Page, usuario_logado):
+    """Função para exibir e gerenciar os usuários cadastrados no sistema."""
+    roteador_da_pagina(page).ir("/usuarios", usuario_logado)
+
+
+@rota("/usuarios")
+def criar_tela_usuarios(page: ft.Page, usuario_logado):
+    """
+    Monta a tela de usuários uma única vez.
+
+    Cada usuário tem a sua linha (chaveada pelo id): editar, excluir ou gerar
+    serial atualiza só a linha afetada, e recarregar a lista reaproveita as
+    linhas que não mudaram (ver ListaUsuarios).
+
+    A busca acontece enquanto se digita, depois de uma breve pausa; uma
+    busca ainda pendente é cancelada quando o texto muda.
+    """
+
+    # =========================================================================
+    #                          Funções de Banco e Lógica
+    # =========================================================================
+    banco = banco_do_processo()
 
     def salvar_usuario(usuario_id, usuario_, admin_):
         """Salva alterações de nome/admin de um usuário."""
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
-        cursor.execute(
+        banco.executar(
             "UPDATE usuarios SET usuario = ?, admin = ? WHERE id = ?",
             (usuario_, admin_, usuario_id)
         )
-        conn.commit()
-        conn.close()
 
     def atualizar_senha_usuario(usuario_id, nova_senha):
         """Atualiza apenas a senha do usuário especificado."""
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
-        cursor.execute(
+        banco.executar(
             "UPDATE usuarios SET senha = ? WHERE id = ?",
             (nova_senha, usuario_id)
         )
-        conn.commit()
-        conn.close()
 
     def deletar_usuario(usuario_id):
         """Exclui um usuário, com confirmação."""
         def confirmar_exclusao(e):
-            conn = sqlite3.connect(DATABASE_PATH)
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM usuarios WHERE id = ?", (usuario_id,))
-            conn.commit()
-            conn.close()
-
+            # A linha sai da lista pelo aviso do banco (ver ao_alterar_usuario)
+            banco.executar("DELETE FROM usuarios WHERE id = ?", (usuario_id,))
             fechar_dialogo(page)
             page.snack_bar = ft.SnackBar(
                 content=ft.Text(f"Usuário {usuario_id} deletado com sucesso!"), 
                 open=True
             )
             page.update()
-            gerenciar_usuarios(page, usuario_logado)
 
         # Diálogo de confirmação
         page.dialog = ft.AlertDialog(
@@ -95,7 +338,7 @@ def gerenciar_usuarios(page: ft.Page, usuario_logado):
             content=ft.Text(f"Tem certeza de que deseja excluir o usuário {usuario_id}?"),
             actions=[
                 ft.TextButton("Cancelar", on_click=lambda _: fechar_dialogo(page)),
-                ft.TextButton("Excluir", on_click=confirmar_exclusao, style=ft.ButtonStyle(bgcolor=ft.colors.RED_300))
+                ft.TextButton("Excluir", on_click=confirmar_exclusao, style=obter_estilo("botao_excluir"))
             ],
         )
         page.dialog.open = True
@@ -103,23 +346,23 @@ def gerenciar_usuarios(page: ft.Page, usuario_logado):
 
     def editar_usuario(e, usuario_id):
         """Abre o diálogo para editar dados de um usuário (nome/admin)."""
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
-        cursor.execute("SELECT usuario, admin FROM usuarios WHERE id = ?", (usuario_id,))
-        usuario_, admin_ = cursor.fetchone()
-        conn.close()
+        usuario_, admin_ = banco.consultar_um("SELECT usuario, admin FROM usuarios WHERE id = ?", (usuario_id,))
 
         usuario_input = ft.TextField(label="Usuário", value=usuario_)
         admin_checkbox = ft.Checkbox(label="Admin", value=bool(admin_))
 
         def salvar_alteracoes(e):
-            salvar_usuario(usuario_id, usuario_input.value, admin_checkbox.value)
+            try:
+                salvar_usuario(usuario_id, usuario_input.value, admin_checkbox.value)
+            except sqlite3.IntegrityError:
+                avisar_usuario_existente(usuario_input.value)
+                return
+            page.dialog.open = False
             page.snack_bar = ft.SnackBar(
                 content=ft.Text("Usuário atualizado com sucesso!"), 
                 open=True
             )
             page.update()
-            gerenciar_usuarios(page, usuario_logado)
 
         page.dialog = ft.AlertDialog(
             title=ft.Text(f"Editar Usuário {usuario_id}"),
@@ -182,14 +425,15 @@ def gerenciar_usuarios(page: ft.Page, usuario_logado):
                 return
 
             data_expiracao = (datetime.now() + timedelta(days=365)).strftime('%Y-%m-%d')
-            conn = sqlite3.connect(DATABASE_PATH)
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO usuarios (usuario, senha, admin, data_expiracao) 
-                VALUES (?, ?, ?, ?)
-            """, (usuario_input.value, senha_input.value, admin_checkbox.value, data_expiracao))
-            conn.commit()
-            conn.close()
+            try:
+                # A linha entra na lista pelo aviso do banco (ver ao_alterar_usuario)
+                banco.executar("""
+                    INSERT INTO usuarios (usuario, senha, admin, data_expiracao) 
+                    VALUES (?, ?, ?, ?)
+                """, (usuario_input.value, senha_input.value, admin_checkbox.value, data_expiracao))
+            except sqlite3.IntegrityError:
+                avisar_usuario_existente(usuario_input.value)
+                return
 
             fechar_dialogo(page)
             page.snack_bar = ft.SnackBar(
@@ -197,7 +441,6 @@ def gerenciar_usuarios(page: ft.Page, usuario_logado):
                 open=True
             )
             page.update()
-            gerenciar_usuarios(page, usuario_logado)
 
         page.dialog = ft.AlertDialog(
             title=ft.Text("Adicionar Novo Usuário"),
@@ -214,18 +457,13 @@ def gerenciar_usuarios(page: ft.Page, usuario_logado):
         page.dialog.open = True
         page.update()
 
-    def verificar_status_licenca(data_expiracao):
-        """Verifica se a licença está ativa ou expirada."""
-        if data_expiracao:
-            try:
-                validade = datetime.strptime(data_expiracao, '%Y-%m-%d')
-                if datetime.now() > validade:
-                    return "Expirado"
-                else:
-                    return "Ativo"
-            except ValueError:
-                return "Data Inválida"
-        return "Sem Licença"
+    def avisar_usuario_existente(nome):
+        """Avisa que o nome já está em uso (índice único em usuarios.usuario)."""
+        page.snack_bar = ft.SnackBar(
+            content=ft.Text(f"Já existe um usuário chamado '{nome}'."),
+            open=True
+        )
+        page.update()
 
     def gerar_e_ativar_serial(usuario_id, usuario_):
         """Gera e ativa um serial para o usuário e exibe o serial gerado e validade."""
@@ -234,14 +472,10 @@ def gerenciar_usuarios(page: ft.Page, usuario_logado):
             salvar_serial(serial)  # Salva o serial gerado (ex.: em arquivo)
 
             nova_data_expiracao = (datetime.now() + timedelta(days=365)).strftime('%Y-%m-%d')
-            conn = sqlite3.connect(DATABASE_PATH)
-            cursor = conn.cursor()
-            cursor.execute(
+            banco.executar(
                 "UPDATE usuarios SET data_expiracao = ?, serial = ? WHERE id = ?",
                 (nova_data_expiracao, serial, usuario_id)
             )
-            conn.commit()
-            conn.close()
 
             page.snack_bar = ft.SnackBar(
                 content=ft.Text(f"Serial gerado e ativado para {usuario_}!"), 
@@ -270,172 +504,159 @@ def gerenciar_usuarios(page: ft.Page, usuario_logado):
         page_.update()
 
     def voltar_menu(e):
-        """Volta para o menu principal passando o usuário logado."""
-        from menu_principal import mostrar_menu
-        mostrar_menu(page, usuario_logado)
+        """Volta para o menu principal (que fica em cache no roteador)."""
+        roteador_da_pagina(page).ir("/menu")
 
     # =========================================================================
     #                        Constrói a lista de usuários
     # =========================================================================
 
-    # Campo para filtrar usuários
+    # Campo para filtrar usuários (a busca acompanha a digitação)
     filtro_input = ft.TextField(
         hint_text="Filtrar por nome de usuário",
         width=300,
-        on_submit=lambda e: recarregar_lista_usuarios(filtro_input.value),
+        on_change=lambda e: lista.agendar_busca(filtro_input.value, ESPERA_BUSCA),
+        on_submit=lambda e: filtrar(),
     )
 
-    def recarregar_lista_usuarios(filtro=None):
-        """Recarrega a tela com base no filtro de pesquisa."""
-        gerenciar_usuarios_filtrado(page, usuario_logado, filtro)
-
-    def gerenciar_usuarios_filtrado(page_, usuario_, filtro):
-        # Recarrega o layout inteiro (tratando como "sub-função" para passar o filtro)
-        usuarios_ = carregar_usuarios(filtro_nome=filtro)
-
-        usuarios_containers = []
-        for u in usuarios_:
-            usuario_id = u[0]
-            nome_user = u[1]
-            data_exp = u[2]
-            is_admin = u[3]
-            serial_ = u[4]
-
-            status_licenca = verificar_status_licenca(data_exp)
-            admin_text = "Sim" if is_admin else "Não"
-            serial_texto = serial_ if serial_ else "Nenhum"
-
-            # Linha com as informações do usuário
-            info_text = ft.Text(
-                f"ID: {usuario_id} | Usuário: {nome_user} | Licença: {status_licenca} | Admin: {admin_text}",
-                tooltip=f"Serial: {serial_texto}",
-                size=16,
-                color=ft.colors.BLACK54
-            )
+    def filtrar():
+        lista.agendar_busca(filtro_input.value, 0)
 
-            # Botões de ação
-            editar_btn = ft.IconButton(
-                icon=ft.icons.EDIT,
-                tooltip="Editar Usuário",
-                icon_color=ft.colors.BLUE,
-                on_click=lambda e, uid=usuario_id: editar_usuario(e, uid)
-            )
-            mudar_senha_btn = ft.IconButton(
-                icon=ft.icons.LOCK,
-                tooltip="Modificar Senha",
-                icon_color=ft.colors.PURPLE,
-                on_click=lambda e, uid=usuario_id: modificar_senha(e, uid)
-            )
-            deletar_btn = ft.IconButton(
-                icon=ft.icons.DELETE,
-                tooltip="Deletar Usuário",
-                icon_color=ft.colors.RED,
-                on_click=lambda e, uid=usuario_id: deletar_usuario(uid)
-            )
-            gerar_serial_btn = ft.IconButton(
-                icon=ft.icons.KEY,
-                tooltip="Gerar Serial e Ativar",
-                icon_color=ft.colors.GREEN,
-                on_click=lambda e, uid=usuario_id, uname=nome_user: gerar_e_ativar_serial(uid, uname)
-            )
+    def criar_linha(u):
+        usuario_id = u[0]
 
-            row_acoes = ft.Row(
-                controls=[info_text, editar_btn, mudar_senha_btn, gerar_serial_btn, deletar_btn],
-                alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
-                wrap=True
-            )
+        # Linha com as informações do usuário (texto preenchido por preencher_linha)
+        info_text = ft.Text(
+            size=16,
+            color=ft.colors.BLACK54
+        )
 
-            # "Cartão" do usuário
-            usuario_card = ft.Container(
-                content=row_acoes,
-                padding=ft.Padding(10, 10, 10, 10),
-                margin=ft.margin.symmetric(vertical=5),
-                bgcolor=ft.colors.BLUE_GREY_50,
-                border_radius=10,
-            )
-            usuarios_containers.append(usuario_card)
+        # Botões de ação
+        editar_btn = ft.IconButton(
+            icon=ft.icons.EDIT,
+            tooltip="Editar Usuário",
+            icon_color=ft.colors.BLUE,
+            on_click=lambda e, uid=usuario_id: editar_usuario(e, uid)
+        )
+        mudar_senha_btn = ft.IconButton(
+            icon=ft.icons.LOCK,
+            tooltip="Modificar Senha",
+            icon_color=ft.colors.PURPLE,
+            on_click=lambda e, uid=usuario_id: modificar_senha(e, uid)
+        )
+        deletar_btn = ft.IconButton(
+            icon=ft.icons.DELETE,
+            tooltip="Deletar Usuário",
+            icon_color=ft.colors.RED,
+            on_click=lambda e, uid=usuario_id: deletar_usuario(uid)
+        )
+        gerar_serial_btn = ft.IconButton(
+            icon=ft.icons.KEY,
+            tooltip="Gerar Serial e Ativar",
+            icon_color=ft.colors.GREEN,
+            on_click=lambda e, uid=usuario_id: gerar_e_ativar_serial(uid, lista.linhas[uid].dados[1])
+        )
 
-        usuarios_lista = ft.Column(
-            controls=usuarios_containers,
-            spacing=5,
-            scroll=ft.ScrollMode.AUTO
+        row_acoes = ft.Row(
+            controls=[info_text, editar_btn, mudar_senha_btn, gerar_serial_btn, deletar_btn],
+            alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
+            wrap=True
         )
 
-        # Reconstrói layout principal
-        page_.clean()
-        page_.add(
-            ft.Container(
-                content=ft.Column(
+        # "Cartão" do usuário
+        usuario_card = ft.Container(
+            content=row_acoes,
+            padding=obter_estilo("cartao_usuario_padding"),
+            margin=obter_estilo("cartao_usuario_margem"),
+            bgcolor=ft.colors.BLUE_GREY_50,
+            border_radius=10,
+        )
+        linha = LinhaUsuario(usuario_card, info_text)
+        preencher_linha(linha, u)
+        return linha
+
+    # =========================================================================
+    #                        Monta a tela (uma única vez)
+    # =========================================================================
+
+    lista = ListaUsuarios(page, criar_linha)
+
+    layout = ft.Container(
+        content=ft.Column(
+            controls=[
+                ft.Text(
+                    "Gerenciamento de Usuários",
+                    size=24,
+                    weight="bold",
+                    color=ft.colors.BLUE_GREY_900
+                ),
+                ft.Row(
                     controls=[
-                        ft.Text(
-                            "Gerenciamento de Usuários",
-                            size=24,
-                            weight="bold",
-                            color=ft.colors.BLUE_GREY_900
+                        filtro_input,
+                        ft.ElevatedButton(
+                            "Filtrar",
+                            icon=ft.icons.SEARCH,
+                            on_click=lambda _: filtrar(),
+                            bgcolor=ft.colors.BLUE_GREY_700,
+                            color=ft.colors.WHITE
+                        )
+                    ],
+                    alignment=ft.MainAxisAlignment.CENTER,
+                    spacing=10
+                ),
+                ft.Divider(color=ft.colors.BLUE_GREY_300),
+                lista.lista,
+                ft.Divider(),
+                ft.Row(
+                    controls=[
+                        ft.ElevatedButton(
+                            "Adicionar Usuário",
+                            icon=ft.icons.PERSON_ADD,
+                            style=obter_estilo("botao_usuarios"),
+                            on_click=adicionar_usuario
                         ),
-                        ft.Row(
-                            controls=[
-                                filtro_input,
-                                ft.ElevatedButton(
-                                    "Filtrar",
-                                    icon=ft.icons.SEARCH,
-                                    on_click=lambda _: recarregar_lista_usuarios(filtro_input.value),
-                                    bgcolor=ft.colors.BLUE_GREY_700,
-                                    color=ft.colors.WHITE
-                                )
-                            ],
-                            alignment=ft.MainAxisAlignment.CENTER,
-                            spacing=10
+                        ft.ElevatedButton(
+                            "Voltar",
+                            icon=ft.icons.ARROW_BACK,
+                            style=obter_estilo("botao_usuarios"),
+                            on_click=voltar_menu
                         ),
-                        ft.Divider(color=ft.colors.BLUE_GREY_300),
-                        usuarios_lista,
-                        ft.Divider(),
-                        ft.Row(
-                            controls=[
-                                ft.ElevatedButton(
-                                    "Adicionar Usuário",
-                                    icon=ft.icons.PERSON_ADD,
-                                    bgcolor=ft.colors.BLUE_GREY_700,
-                                    color=ft.colors.WHITE,
-                                    style=ft.ButtonStyle(
-                                        shape=ft.RoundedRectangleBorder(radius=20),
-                                        padding=ft.padding.symmetric(horizontal=20, vertical=15)
-                                    ),
-                                    on_click=adicionar_usuario
-                                ),
-                                ft.ElevatedButton(
-                                    "Voltar",
-                                    icon=ft.icons.ARROW_BACK,
-                                    bgcolor=ft.colors.BLUE_GREY_700,
-                                    color=ft.colors.WHITE,
-                                    style=ft.ButtonStyle(
-                                        shape=ft.RoundedRectangleBorder(radius=20),
-                                        padding=ft.padding.symmetric(horizontal=20, vertical=15)
-                                    ),
-                                    on_click=voltar_menu
-                                ),
-                            ],
-                            alignment=ft.MainAxisAlignment.CENTER,
-                            spacing=20,
-                        )
                     ],
-                    alignment=ft.MainAxisAlignment.START,
-                    horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+                    alignment=ft.MainAxisAlignment.CENTER,
                     spacing=20,
-                ),
-                padding=30,
-                border_radius=20,
-                shadow=ft.BoxShadow(
-                    spread_radius=2,
-                    blur_radius=15,
-                    color=ft.colors.BLACK26,
-                    offset=ft.Offset(2, 2),
-                ),
-                bgcolor=ft.colors.WHITE,
-                width=900  # Ajuste conforme desejar
-            )
-        )
-        page_.update()
+                )
+            ],
+            alignment=ft.MainAxisAlignment.START,
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+            spacing=20,
+        ),
+        padding=30,
+        border_radius=20,
+        shadow=obter_estilo("sombra_usuarios"),
+        bgcolor=ft.colors.WHITE,
+        width=900  # Ajuste conforme desejar
+    )
 
-    # Carrega a lista inicialmente (sem filtro)
-    gerenciar_usuarios_filtrado(page, usuario_logado, filtro=None)
+    def ao_mostrar():
+        page.title = "Gerenciamento de Usuários"
+        lista.recarregar(lista.filtro)
+
+    tela = Tela(
+        page,
+        "usuarios",
+        view=ft.View(
+            "/usuarios",
+            controls=[layout],
+            vertical_alignment=ft.MainAxisAlignment.CENTER,
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+            bgcolor=ft.colors.WHITE
+        )
+    )
+    # Ao voltar à tela, só as linhas que mudaram são recriadas
+    tela.ao_montar(ao_mostrar)
+    # Fecha ao sair o diálogo que tiver ficado aberto
+    tela.dialogos()
+    # Com a tela à vista, o banco avisa de cada usuário alterado (ao voltar, ao_mostrar recarrega);
+    # fora de vista, buscas e páginas ainda pendentes não rodam
+    tela.recurso(lista.ligar, lista.desligar)
+    return tela
@@ -4,8 +4,7 @@ from cryptography.hazmat.primitives import serialization, hashes
 from cryptography.hazmat.backends import default_backend
 from datetime import datetime, timedelta
 import base64
-import sqlite3
-from config import DATABASE_PATH
+from banco import banco_do_processo
 
 def carregar_chave_publica():
     """Carrega a chave pública para verificação da assinatura."""
@@ -48,12 +47,9 @@ def validar_serial(serial, usuario_id):
 def obter_validade_serial(usuario):
     """Obtém a validade do serial do usuário a partir do banco de dados."""
     try:
-        conn = sqlite3.connect(DATABASE_PATH)
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT data_expiracao FROM usuarios WHERE usuario = ?", (usuario,))
-        resultado = cursor.fetchone()
-        conn.close()
+        resultado = banco_do_processo().consultar_um(
+            "SELECT data_expiracao FROM usuarios WHERE usuario = ?", (usuario,)
+        )
 
         if resultado:
             data_expiracao = resultado[0]
@@ -99,9 +95,7 @@ def ativar_licenca(page: ft.Page, usuario):
 
 def salvar_serial_bd(usuario, serial):
     """Salva o serial do usuário no banco de dados."""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    cursor.execute("UPDATE usuarios SET serial = ?, data_expiracao = ? WHERE usuario = ?",
-                   (serial, (datetime.now() + timedelta(days=365)).strftime('%Y-%m-%d'), usuario))
-    conn.commit()
-    conn.close()
+    banco_do_processo().executar(
+        "UPDATE usuarios SET serial = ?, data_expiracao = ? WHERE usuario = ?",
+        (serial, (datetime.now() + timedelta(days=365)).strftime('%Y-%m-%d'), usuario)
+    )